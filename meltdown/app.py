@@ -8,6 +8,7 @@ import shutil
 import signal
 import tempfile
 import platform
+import threading
 import urllib.parse
 import tkinter as tk
 import subprocess
@@ -15,7 +16,6 @@ from pathlib import Path
 from typing import Any
 
 # Libraries
-import psutil  # type: ignore
 from rich.console import Console  # type: ignore
 
 # Modules
@@ -45,7 +45,6 @@ class App:
         self.streaming = False
         self.loading = False
         self.loaded = False
-        self.checks_delay = 200
         self.autorun_delay = 250
         self.geometry_delay = 250
         self.check_geometry_after = ""
@@ -61,6 +60,8 @@ class App:
         self.file_frame_enabled = True
         self.input_frame_enabled = True
         self.running = True
+        self.focus_event = threading.Event()
+        self.focus_event.set()
 
     def clear_geometry_after(self) -> None:
         if self.check_geometry_after:
@@ -169,14 +170,19 @@ class App:
         self.exit_after = self.root.after(d, lambda: self.do_exit())
 
     def do_exit(self) -> None:
-        from .console import console
+        from .args import args
 
-        if console.session:
-            console.session.app.exit(
-                exception=KeyboardInterrupt, style="class:aborting"
-            )
-        else:
-            self.destroy()
+        if args.console:
+            from .console import console
+
+            if console.session:
+                console.session.app.exit(
+                    exception=KeyboardInterrupt, style="class:aborting"
+                )
+
+                return
+
+        self.destroy()
 
     def destroy(self) -> None:
         self.running = False
@@ -573,6 +579,7 @@ class App:
         what = str(event.widget)
 
         if what == ".":
+            self.focus_event.set()
             Dialog.focus_all()
             Menu.focus_all()
 
@@ -582,6 +589,7 @@ class App:
         what = str(event.widget)
 
         if what == ".":
+            self.focus_event.clear()
             keyboard.reset()
 
     def prepare(self) -> None:
@@ -762,10 +770,14 @@ class App:
     def show_memory(self) -> None:
         from .dialogs import Dialog
 
-        process = psutil.Process(os.getpid())
-        memory_in_bytes = process.memory_info().rss
-        memory_in_megabytes = int(memory_in_bytes / (1024 * 1024))
-        Dialog.show_message(f"Memory: {memory_in_megabytes} MB")
+        from .sampler import sampler
+
+        stats = sampler.sample_process()
+        memory_in_megabytes = int(stats["rss"] / (1024 * 1024))
+        lines = [f"Memory: {memory_in_megabytes} MB"]
+        lines.append(f"Threads: {stats['threads']}")
+        lines.append(f"Page Faults: {stats['minflt']} minor | {stats['majflt']} major")
+        Dialog.show_message("\n".join(lines))
 
     def show_started(self) -> None:
         from .dialogs import Dialog
@@ -823,12 +835,25 @@ class App:
         if exit:
             sys.exit(0)
 
-    def do_checks(self) -> None:
-        from .args import args
+    def start_checks(self) -> None:
+        from .events import events
+        from .widgets import widgets
+
+        events.subscribe("model", self.check_model)
+        events.subscribe("model", self.check_buttons)
+        events.subscribe("tab", self.check_buttons)
+        events.subscribe("session", self.check_buttons)
+        events.subscribe("stream_start", self.on_stream_start)
+        events.subscribe("stream_end", self.on_stream_end)
+
+        widgets.model.text_var.trace_add("write", lambda *a: events.publish("model"))
+
+        self.check_model()
+        self.check_buttons()
+
+    def check_model(self) -> None:
         from .model import model
-        from .commands import commands
         from .widgets import widgets
-        from .display import display
 
         if model.loaded_model:
             if not self.loaded:
@@ -844,11 +869,19 @@ class App:
             self.update()
             widgets.model.move_to_end()
 
-        if model.streaming:
-            if not self.streaming:
-                self.streaming = True
-                widgets.enable_stop_button()
-        elif self.streaming:
+    def on_stream_start(self) -> None:
+        from .widgets import widgets
+
+        if not self.streaming:
+            self.streaming = True
+            widgets.enable_stop_button()
+
+    def on_stream_end(self) -> None:
+        from .commands import commands
+        from .widgets import widgets
+        from .display import display
+
+        if self.streaming:
             self.streaming = False
             widgets.disable_stop_button()
             display.stream_ended()
@@ -856,38 +889,42 @@ class App:
             self.check_response_file()
             self.check_response_program()
 
-        if args.disable_buttons:
-            model_empty = widgets.model.get() == ""
-
-            if model.model_loading or (model_empty and (not model.loaded_model)):
-                if not self.loading:
-                    self.loading = True
-                    widgets.disable_load_button()
-                    widgets.disable_format_select()
-            elif self.loading:
-                self.loading = False
-                widgets.enable_load_button()
-                widgets.enable_format_select()
-
-            if display.num_tabs_open <= 1:
-                if self.close_enabled:
-                    self.close_enabled = False
-                    widgets.disable_close_button()
-            elif not self.close_enabled:
-                self.close_enabled = True
-                widgets.enable_close_button()
-
-            if (not display.is_modified()) or display.is_ignored():
-                if self.clear_enabled:
-                    self.clear_enabled = False
-                    widgets.disable_clear_button()
-            elif not self.clear_enabled:
-                self.clear_enabled = True
-                widgets.enable_clear_button()
+    def check_buttons(self) -> None:
+        from .args import args
+        from .model import model
+        from .widgets import widgets
+        from .display import display
+
+        if not args.disable_buttons:
+            return
 
-    def start_checks(self) -> None:
-        self.do_checks()
-        app.root.after(self.checks_delay, self.start_checks)
+        model_empty = widgets.model.get() == ""
+
+        if model.model_loading or (model_empty and (not model.loaded_model)):
+            if not self.loading:
+                self.loading = True
+                widgets.disable_load_button()
+                widgets.disable_format_select()
+        elif self.loading:
+            self.loading = False
+            widgets.enable_load_button()
+            widgets.enable_format_select()
+
+        if display.num_tabs_open <= 1:
+            if self.close_enabled:
+                self.close_enabled = False
+                widgets.disable_close_button()
+        elif not self.close_enabled:
+            self.close_enabled = True
+            widgets.enable_close_button()
+
+        if (not display.is_modified()) or display.is_ignored():
+            if self.clear_enabled:
+                self.clear_enabled = False
+                widgets.disable_clear_button()
+        elif not self.clear_enabled:
+            self.clear_enabled = True
+            widgets.enable_clear_button()
 
     def focused(self) -> tk.Widget | None:
         if app.exists():
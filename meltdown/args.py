@@ -29,6 +29,11 @@ class Args:
         self.system_delay = 2
         self.system_suspend = 1
         self.system_auto_hide = True
+        self.system_unfocused = False
+        self.system_sparkline = 10
+        self.resources = True
+        self.startup_profile = False
+        self.session_snapshot = True
         self.keyboard = True
         self.taps = True
         self.taps_command = ""
@@ -82,6 +87,11 @@ class Args:
         self.aliases: list[str] = []
         self.triggers: list[str] = []
         self.tasks: list[str] = []
+        self.sinks: list[str] = []
+        self.model_dirs: list[str] = []
+        self.task_jitter = 0
+        self.task_missed = "once"
+        self.task_skip = True
         self.max_tab_width = 0
         self.old_tabs_minutes = 30
         self.max_list_items = 10
@@ -112,6 +122,7 @@ class Args:
         self.input_memory_max_items = 1000
         self.listen = False
         self.listen_file = ""
+        self.listen_socket = ""
         self.sticky = False
         self.commandoc = ""
         self.argumentdoc = ""
@@ -271,6 +282,19 @@ class Args:
         self.use_both = False
         self.theme = ""
         self.auto_unload = 0
+        self.resident_models = 1
+        self.resident_memory = 80
+        self.draft_tokens = 10
+        self.bench_models = 3
+        self.bench_tokens = 128
+        self.bench_prompts = ""
+        self.auto_context = 8192
+        self.prompt_cache = False
+        self.prompt_cache_size = 4096
+        self.response_cache = False
+        self.response_cache_ttl = 1440
+        self.response_cache_size = 64
+        self.rate_limit_retries = 6
         self.tab_tooltip_length = 235
         self.uselinks: list[str] = []
         self.concat_logs = False
@@ -326,6 +350,8 @@ class Args:
             ("alias", "aliases"),
             ("trigger", "triggers"),
             ("task", "tasks"),
+            ("sink", "sinks"),
+            ("model_dir", "model_dirs"),
             ("custom_prompt", "custom_prompts"),
             ("uselink", "uselinks"),
             ("var", "variables"),
@@ -395,12 +421,15 @@ class Args:
             ("no_separate_uploads", "separate_uploads"),
             ("no_quote_used_words", "quote_used_words"),
             ("no_system_auto_hide", "system_auto_hide"),
+            ("no_resources", "resources"),
+            ("no_session_snapshot", "session_snapshot"),
             ("no_keep_empty_tab", "keep_empty_tab"),
             ("no_autoscroll_interrupt", "autoscroll_interrupt"),
             ("no_wrap_menus", "wrap_menus"),
             ("no_avatars_logs", "avatars_logs"),
             ("no_avatars_uploads", "avatars_uploads"),
             ("no_current_recent_item", "current_recent_item"),
+            ("no_task_skip", "task_skip"),
         ]
 
         for r_item in other_name:
@@ -450,6 +479,9 @@ class Args:
             "drag_threshold",
             "system_delay",
             "system_suspend",
+            "system_unfocused",
+            "system_sparkline",
+            "startup_profile",
             "quiet",
             "delay",
             "command_prefix",
@@ -466,6 +498,7 @@ class Args:
             "verbose",
             "listen",
             "listen_file",
+            "listen_socket",
             "sticky",
             "commandoc",
             "argumentdoc",
@@ -580,6 +613,19 @@ class Args:
             "header_2_effects",
             "header_3_effects",
             "auto_unload",
+            "resident_models",
+            "resident_memory",
+            "draft_tokens",
+            "bench_models",
+            "bench_tokens",
+            "bench_prompts",
+            "auto_context",
+            "prompt_cache",
+            "prompt_cache_size",
+            "response_cache",
+            "response_cache_ttl",
+            "response_cache_size",
+            "rate_limit_retries",
             "tab_tooltip_length",
             "ascii_logs",
             "concat_logs",
@@ -621,6 +667,8 @@ class Args:
             "extra_info_uploads",
             "tooltip_delay",
             "notify_duration",
+            "task_jitter",
+            "task_missed",
         ]
 
         for n_item in normals:
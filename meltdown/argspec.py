@@ -701,7 +701,7 @@ class ArgSpec:
         self.add_argument(
             "listen",
             action="store_true",
-            info="Listen for changes to the stdin file",
+            info="Listen for prompts and commands on a local socket",
         )
 
         self.add_argument(
@@ -746,6 +746,91 @@ class ArgSpec:
             info=f"Auto-unload the model after this number of minutes after last use. {self.zero}",
         )
 
+        self.add_argument(
+            "resident_models",
+            type=int,
+            info="Keep up to this number of local models loaded to switch between them instantly",
+        )
+
+        self.add_argument(
+            "resident_memory",
+            type=int,
+            info="Percentage of the available memory that resident models can use",
+        )
+
+        self.add_argument(
+            "draft_tokens",
+            type=int,
+            info="Number of tokens to draft on each step of speculative decoding",
+        )
+
+        self.add_argument(
+            "bench_models",
+            type=int,
+            info="Number of recent models to use in the bench command when none are given",
+        )
+
+        self.add_argument(
+            "bench_tokens",
+            type=int,
+            info="Max tokens to generate for each prompt of the bench command",
+        )
+
+        self.add_argument(
+            "bench_prompts",
+            type=str,
+            info="Path to a json list of prompts to use in the bench command instead of the bundled ones",
+        )
+
+        self.add_argument(
+            "model_dir",
+            type=str,
+            action="append",
+            info="Directory to scan for gguf models to show in the model library",
+        )
+
+        self.add_argument(
+            "auto_context",
+            type=int,
+            info="Max context to use when the context is set to 0, otherwise the model's own",
+        )
+
+        self.add_argument(
+            "prompt_cache",
+            action="store_true",
+            info="Save the state of local models to disk to resume long conversations faster",
+        )
+
+        self.add_argument(
+            "prompt_cache_size",
+            type=int,
+            info="Max size of the prompt cache in megabytes",
+        )
+
+        self.add_argument(
+            "response_cache",
+            action="store_true",
+            info="Reuse the responses to repeated prompts when the temperature is 0",
+        )
+
+        self.add_argument(
+            "response_cache_ttl",
+            type=int,
+            info="Minutes to keep cached responses. 0 to keep them until evicted",
+        )
+
+        self.add_argument(
+            "response_cache_size",
+            type=int,
+            info="Max size of the response cache in megabytes",
+        )
+
+        self.add_argument(
+            "rate_limit_retries",
+            type=int,
+            info="How many times to retry a remote prompt that hit a rate limit",
+        )
+
         self.add_argument(
             "border_size",
             type=int,
@@ -1029,7 +1114,14 @@ class ArgSpec:
             "task",
             type=str,
             action="append",
-            info='Define a task to run periodically. Format is "[seconds] [commands] [/now (optional)]',
+            info='Define a task to run periodically. Format is "[seconds] [commands] [/now (optional)]" or "[cron] [commands] [/now (optional)]"',
+        )
+
+        self.add_argument(
+            "sink",
+            type=str,
+            action="append",
+            info='Send the response to a file, fifo, or program while it streams. Format is "[file|fifo|program]:[target]"',
         )
 
         self.add_argument(
@@ -1135,6 +1227,36 @@ class ArgSpec:
             info="Delay in seconds for system monitor updates",
         )
 
+        self.add_argument(
+            "system_unfocused",
+            action="store_true",
+            info="Keep updating the system monitors when the window is not focused",
+        )
+
+        self.add_argument(
+            "system_sparkline",
+            type=int,
+            info=f"Number of recent samples to show as a sparkline next to each system monitor. {self.zero}",
+        )
+
+        self.add_argument(
+            "no_resources",
+            action="store_false",
+            info="Don't record the CPU, memory and network usage of each response",
+        )
+
+        self.add_argument(
+            "startup_profile",
+            action="store_true",
+            info="Print the time spent on each startup phase and the imported packages",
+        )
+
+        self.add_argument(
+            "no_session_snapshot",
+            action="store_false",
+            info="Don't keep a binary snapshot of the session file to load it faster",
+        )
+
         self.add_argument(
             "system_suspend",
             type=int,
@@ -1198,7 +1320,13 @@ class ArgSpec:
         self.add_argument(
             "listen_file",
             type=str,
-            info="Path to the file for the listener. By default it uses /tmp/mlt_[program].input",
+            info="Watch this file for prompts. It works with or without --listen",
+        )
+
+        self.add_argument(
+            "listen_socket",
+            type=str,
+            info="Path to the listener socket. By default it uses /tmp/mlt_[program]_[profile].sock",
         )
 
         self.add_argument(
@@ -1882,5 +2010,24 @@ class ArgSpec:
             info="How long notifications last",
         )
 
+        self.add_argument(
+            "task_jitter",
+            type=int,
+            info="Delay each task run by a random number of seconds up to this value",
+        )
+
+        self.add_argument(
+            "task_missed",
+            type=str,
+            choices=["once", "skip", "all"],
+            info="What to do with task runs that were missed, like when the computer was suspended",
+        )
+
+        self.add_argument(
+            "no_task_skip",
+            action="store_false",
+            info="Run tasks even if their previous run is still going",
+        )
+
 
 argspec = ArgSpec()
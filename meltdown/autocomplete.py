@@ -5,12 +5,11 @@ import tkinter as tk
 
 # Modules
 from .inputcontrol import inputcontrol
-from .commands import commands
 from .args import args
 from .utils import utils
 from .entrybox import EntryBox
 from .textbox import TextBox
-from .variables import variables
+from .completion import completion
 
 
 InputWidget = EntryBox | TextBox | None
@@ -92,8 +91,6 @@ class AutoComplete:
         self.pos = 0
 
     def get_matches(self, text: str) -> None:
-        from .inputcontrol import inputcontrol
-
         if not text:
             return
 
@@ -115,23 +112,7 @@ class AutoComplete:
             return
 
         self.word = word
-
-        if commands.is_command(word):
-            word = self.clean(word)
-
-            for key in commands.cmdkeys:
-                if key.startswith(word):
-                    self.matches.append(key)
-        elif variables.is_variable(word):
-            word = self.clean(word)
-
-            for key in variables.variables:
-                if key.startswith(word):
-                    self.matches.append(key)
-        else:
-            for w in inputcontrol.autocomplete:
-                if w.startswith(word):
-                    self.matches.append(w)
+        self.matches = completion.get_matches(word)
 
     def clean(self, text: str) -> str:
         if text.startswith(args.command_prefix):
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+# Standard
+import csv
+import json
+import hashlib
+import threading
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any
+
+# Modules
+from .app import app
+from .args import args
+from .config import config
+from .paths import paths
+from .utils import utils
+from .files import files
+from .worker import worker
+
+
+class Bench:
+    def __init__(self) -> None:
+        self.process: subprocess.Popen[str] | None = None
+        self.thread: threading.Thread | None = None
+        self.stopped = False
+        self.seed = 1
+        self.google_url = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+        self.columns = [
+            "date",
+            "model",
+            "hash",
+            "version",
+            "suite",
+            "prompts",
+            "errors",
+            "max_tokens",
+            "context",
+            "threads",
+            "gpu_layers",
+            "batch",
+            "load",
+            "ttft",
+            "tps",
+            "latency",
+            "rss",
+        ]
+
+    def bench(self, arg: str | None = None) -> None:
+        from .display import display
+
+        if arg == "stop":
+            self.stop()
+            return
+
+        if self.thread and self.thread.is_alive():
+            display.print("Bench is already running. Use 'bench stop' to stop it.")
+            return
+
+        try:
+            prompts = self.get_prompts()
+        except BaseException as e:
+            utils.error(e)
+            display.print("Error: Can't read the bench prompts.")
+            return
+
+        models = self.get_models(arg)
+        m = utils.singular_or_plural(len(models), "model", "models")
+        display.print(f"Bench: {len(prompts)} prompts on {len(models)} {m}...")
+        self.stopped = False
+        self.thread = threading.Thread(target=lambda: self.run(models, prompts))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def get_prompts(self) -> list[str]:
+        path = Path(args.bench_prompts) if args.bench_prompts else None
+
+        if not path:
+            path = Path(app.here, "bench.json")
+
+        prompts = files.load(path)
+        return [str(prompt) for prompt in prompts if prompt]
+
+    def get_models(self, arg: str | None) -> list[str]:
+        from .model import model
+
+        recent = files.get_list("models")
+
+        if not arg:
+            models = recent[: args.bench_models]
+            return models or [model.get_model()]
+
+        # Each name can be a full name or part of a recent one
+        names = [name.strip() for name in arg.split(";;")]
+        return [self.find_model(name, recent) for name in names if name]
+
+    def find_model(self, name: str, recent: list[str]) -> str:
+        if name in recent:
+            return name
+
+        for item in recent:
+            if name.lower() in item.lower():
+                return item
+
+        return name
+
+    def get_job(self, name: str, prompts: list[str]) -> dict[str, Any]:
+        from .model import model
+
+        job = {
+            "model": name,
+            "kind": "local",
+            "key": "",
+            "base_url": "",
+            "prompts": prompts,
+            "max_tokens": args.bench_tokens,
+            "seed": self.seed,
+            "context": model.get_context(name),
+            "threads": config.threads,
+            "gpu_layers": config.gpu_layers,
+            "batch": config.batch,
+        }
+
+        # Remote ones can be pointed to a local server with OPENAI_BASE_URL
+        if model.model_is_gpt(name):
+            model.read_openai_key()
+            job["kind"] = "remote"
+            job["key"] = model.openai_key
+        elif model.model_is_gemini(name):
+            model.read_google_key()
+            job["kind"] = "remote"
+            job["key"] = model.google_key
+            job["base_url"] = self.google_url
+
+        return job
+
+    def get_hash(self, text: str) -> str:
+        return hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+
+    def run(self, models: list[str], prompts: list[str]) -> None:
+        suite = self.get_hash(json.dumps(prompts))
+        rows = []
+
+        for name in models:
+            if self.stopped:
+                break
+
+            job = self.get_job(name, prompts)
+            path = Path(name)
+
+            if job["kind"] == "local":
+                if (not path.exists()) or (not path.is_file()):
+                    self.show(f"Bench: {name} not found.")
+                    continue
+
+                model_hash = files.get_hash(path)
+            else:
+                model_hash = ""
+
+            self.show(f"Bench: {path.name}")
+            row = self.run_model(job)
+
+            if not row:
+                continue
+
+            row["date"] = utils.date()
+            row["model"] = path.name
+            row["hash"] = model_hash
+            row["suite"] = suite
+            rows.append(row)
+
+        if not rows:
+            self.show("Bench: No results.")
+            return
+
+        self.show(self.get_table(rows))
+        self.save(rows)
+
+    def run_model(self, job: dict[str, Any]) -> dict[str, Any] | None:
+        results = []
+        meta: dict[str, Any] = {}
+
+        try:
+            process = worker.start("benchworker", job)
+            self.process = process
+            lines = list(worker.read(process))
+            process.wait()
+        except BaseException as e:
+            utils.error(e)
+            return None
+        finally:
+            self.process = None
+
+        for result in lines:
+            if "version" in result:
+                meta = result
+            elif (not meta) and ("error" in result):
+                self.show(f"Bench error: {result['error']}")
+            else:
+                results.append(result)
+
+        valid = [r for r in results if "error" not in r]
+
+        if not valid:
+            return None
+
+        # Medians so one slow prompt doesn't move the whole row
+        def median(key: str) -> float:
+            return round(float(statistics.median(r[key] for r in valid)), 4)
+
+        return {
+            "version": meta.get("version", ""),
+            "prompts": len(results),
+            "errors": len(results) - len(valid),
+            "max_tokens": job["max_tokens"],
+            "context": job["context"] if job["kind"] == "local" else "",
+            "threads": job["threads"] if job["kind"] == "local" else "",
+            "gpu_layers": job["gpu_layers"] if job["kind"] == "local" else "",
+            "batch": job["batch"] if job["kind"] == "local" else "",
+            "load": meta.get("load", 0),
+            "ttft": median("ttft"),
+            "tps": median("tps"),
+            "latency": median("latency"),
+            "rss": int(max(r.get("rss", 0) for r in results) / (1024 * 1024)),
+        }
+
+    def get_table(self, rows: list[dict[str, Any]]) -> str:
+        header = ["Model", "Load s", "TTFT ms", "Tok/s", "Latency s", "RSS MB"]
+        lines = [header]
+
+        lines.extend(
+            [
+                row["model"],
+                f"{row['load']:.2f}",
+                f"{row['ttft'] * 1000:.0f}",
+                f"{row['tps']:.1f}",
+                f"{row['latency']:.2f}",
+                str(row["rss"]),
+            ]
+            for row in rows
+        )
+
+        widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+        text = []
+
+        for line in lines:
+            cells = [cell.ljust(widths[i]) for i, cell in enumerate(line)]
+            text.append(" | ".join(cells).rstrip())
+
+        return "\n".join(text)
+
+    def save(self, rows: list[dict[str, Any]]) -> None:
+        # One file for all runs so they can be compared over time
+        path = Path(paths.logs, "bench.csv")
+
+        try:
+            paths.logs.mkdir(parents=True, exist_ok=True)
+            self.write(path, rows)
+        except BaseException as e:
+            utils.error(e)
+            self.show("Error: Can't save the bench results.")
+            return
+
+        if not args.quiet:
+            app.root.after(0, lambda: utils.saved_path(path))
+
+    def write(self, path: Path, rows: list[dict[str, Any]]) -> None:
+        new = not path.exists()
+
+        with path.open("a", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.columns)
+
+            if new:
+                writer.writeheader()
+
+            writer.writerows(rows)
+
+    def show(self, text: str) -> None:
+        from .display import display
+
+        # The runs happen on a thread, Tk is only used from the main one
+        app.root.after(0, lambda: display.print(text))
+
+    def stop(self) -> None:
+        self.stopped = True
+
+        if self.process:
+            self.process.kill()
+
+
+bench = Bench()
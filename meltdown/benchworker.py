@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+# Runs one model in a separate process so its memory can be measured
+# on its own. Only the stdlib and the model libraries are used
+# Reads the job as json from stdin and prints one json line per prompt
+
+# Standard
+import sys
+import json
+import time
+from typing import Any
+from collections.abc import Iterator
+
+
+def get_peak_rss() -> int:
+    try:
+        import resource
+    except ImportError:
+        return 0
+
+    # Kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def load_local(job: dict[str, Any]) -> tuple[Any, str]:
+    import llama_cpp  # type: ignore
+
+    model = llama_cpp.Llama(
+        model_path=job["model"],
+        n_ctx=job["context"],
+        n_threads=job["threads"],
+        n_gpu_layers=job["gpu_layers"],
+        n_batch=job["batch"],
+        seed=job["seed"],
+        verbose=False,
+    )
+
+    return model, f"llama_cpp {llama_cpp.__version__}"
+
+
+def load_remote(job: dict[str, Any]) -> tuple[Any, str]:
+    import openai  # type: ignore
+
+    # Without a base url the client uses OPENAI_BASE_URL if it's set
+    client = openai.OpenAI(api_key=job["key"], base_url=job["base_url"] or None)
+    return client, f"openai {openai.__version__}"
+
+
+def stream(model: Any, job: dict[str, Any], prompt: str) -> Iterator[Any]:
+    messages = [{"role": "user", "content": prompt}]
+
+    if job["kind"] == "local":
+        return model.create_chat_completion(  # type: ignore
+            messages=messages,
+            max_tokens=job["max_tokens"],
+            temperature=0.0,
+            seed=job["seed"],
+            stream=True,
+        )
+
+    return model.chat.completions.create(  # type: ignore
+        model=job["model"],
+        messages=messages,
+        max_completion_tokens=job["max_tokens"],
+        temperature=0.0,
+        stream=True,
+    )
+
+
+def get_text(chunk: Any) -> str:
+    if isinstance(chunk, dict):
+        delta = chunk["choices"][0].get("delta", {})
+        return delta.get("content") or ""
+
+    if not chunk.choices:
+        return ""
+
+    return chunk.choices[0].delta.content or ""
+
+
+def run(model: Any, job: dict[str, Any], prompt: str) -> dict[str, Any]:
+    start = time.perf_counter()
+    first = 0.0
+    tokens = 0
+
+    # Each streamed chunk is close to one token
+    for chunk in stream(model, job, prompt):
+        if not get_text(chunk):
+            continue
+
+        if not first:
+            first = time.perf_counter()
+
+        tokens += 1
+
+    end = time.perf_counter()
+    first = first or end
+    generating = max(end - first, 0.0001)
+
+    return {
+        "ttft": round(first - start, 4),
+        "tokens": tokens,
+        "tps": round(max(tokens - 1, 0) / generating, 2),
+        "latency": round(end - start, 4),
+    }
+
+
+def send(data: dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(data) + "\n")
+    sys.stdout.flush()
+
+
+def main() -> None:
+    job = json.loads(sys.stdin.read())
+    start = time.perf_counter()
+
+    try:
+        if job["kind"] == "local":
+            model, version = load_local(job)
+        else:
+            model, version = load_remote(job)
+    except BaseException as e:
+        send({"error": str(e)})
+        return
+
+    load = round(time.perf_counter() - start, 4)
+    send({"load": load, "version": version})
+
+    for prompt in job["prompts"]:
+        try:
+            result = run(model, job, prompt)
+        except BaseException as e:
+            result = {"error": str(e)}
+
+        result["rss"] = get_peak_rss()
+        send(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -44,7 +44,7 @@ class Page:
         self.tooltip = tooltip
         self.picked = False
         self.tab = self.make_tab_widget()
-        self.content = self.make_content_widget()
+        self.content: tk.Frame | None = None
         self.pin = pin
         self.id_ = f"page_{Page.notebox_id}"
         Page.notebox_id += 1
@@ -88,6 +88,14 @@ class Page:
         frame.columnconfigure(0, weight=1)
         return frame
 
+    def get_content(self) -> tk.Frame:
+        # The content frame is made when the page is first shown
+        if not self.content:
+            self.content = self.make_content_widget()
+            self.parent.add_content(self.content)
+
+        return self.content
+
     def update_tooltip(self) -> None:
         text = self.tooltip if self.tooltip else "Empty Tab"
         self.tab.tooltip_1.set_text(text)
@@ -339,6 +347,7 @@ class Book(tk.Frame):
         tooltip: str,
         position: str = "end",
         pin: bool = False,
+        defer: bool = False,
     ) -> Page:
         tooltip = self.clean_tooltip(tooltip)
         page = Page(self, name, mode=mode, tooltip=tooltip, pin=pin)
@@ -348,9 +357,10 @@ class Book(tk.Frame):
         else:
             self.pages.append(page)
 
-        self.current_page = page
-        self.add_tab(page)
-        self.add_content(page.content)
+        if (not defer) or (not self.current_page):
+            self.current_page = page
+
+        self.add_tab(page, defer=defer)
         self.check_max_tabs()
         self.check_num_tabs_change()
         page.update_tooltip()
@@ -466,9 +476,10 @@ class Book(tk.Frame):
     def hide_all_except(self, id_: str) -> None:
         for page in self.pages:
             if page.id_ != id_:
-                page.content.grid_remove()
+                if page.content:
+                    page.content.grid_remove()
             else:
-                page.content.grid()
+                page.get_content().grid()
 
     def get_page_by_id(self, id_: str) -> Page | None:
         for page in self.pages:
@@ -486,12 +497,18 @@ class Book(tk.Frame):
     def ids(self) -> list[str]:
         return [page.id_ for page in self.pages]
 
-    def add_tab(self, page: Page) -> None:
+    def add_tab(self, page: Page, defer: bool = False) -> None:
         self.bind_tab_click(page)
         self.bind_tab_mousewheel(page.tab.frame)
         self.bind_tab_right_click(page)
         self.bind_tab_middle_click(page)
         self.bind_tab_drag(page)
+
+        # Batches of tabs update the columns once at the end
+        if not defer:
+            self.update_pages()
+
+    def update_pages(self) -> None:
         self.update_tab_columns()
         self.check_hide_tabs()
 
@@ -589,7 +606,9 @@ class Book(tk.Frame):
         index = self.index(id_)
         was_current = self.current_page == self.pages[index]
         page.tab.frame.grid_forget()
-        page.content.grid_forget()
+
+        if page.content:
+            page.content.grid_forget()
         self.pages.pop(index)
 
         if not self.pages:
@@ -31,6 +31,10 @@ from .findmanager import findmanager
 from .formats import formats
 from .menumanager import menumanager
 from .variables import variables
+from .tasks import tasks
+from .tuner import tuner
+from .bench import bench
+from .promptcache import prompt_cache
 
 
 class DuplicateCommandError(Exception):
@@ -453,7 +457,43 @@ class CommandSpec:
 
         self.add_cmd("load", "Load the model", lambda a=None: model.load())
 
-        self.add_cmd("unload", "Unload the model", lambda a=None: model.unload(True))
+        self.add_cmd(
+            "unload",
+            "Unload the model",
+            lambda a=None: model.unload(True, release=True),
+        )
+
+        self.add_cmd(
+            "draft",
+            "Set the speculative decoding draft",
+            lambda a=None: model.set_draft(a),
+            extra="Use 'lookup', the path to a gguf model, or 'off'",
+            type=str,
+        )
+
+        self.add_cmd(
+            "tune",
+            "Find the fastest threads and batch sizes for the local model",
+            lambda a=None: tuner.tune(a),
+            extra="Use 'force' to run it again or 'stop' to stop it",
+            type=str,
+        )
+
+        self.add_cmd(
+            "bench",
+            "Compare the speed of models with a set of prompts",
+            lambda a=None: bench.bench(a),
+            extra="Model names separated by ;; or 'stop'. Uses the recent models by default",
+            type=str,
+        )
+
+        self.add_cmd(
+            "cache",
+            "Show the prompt and response caches",
+            lambda a=None: prompt_cache.command(a),
+            extra="Use 'clear' to delete them",
+            type=str,
+        )
 
         self.add_cmd(
             "context",
@@ -515,6 +555,12 @@ class CommandSpec:
             type=str,
         )
 
+        self.add_cmd(
+            "sessions",
+            "Switch to a saved session",
+            lambda a=None: session.show_switcher(),
+        )
+
         self.add_cmd(
             "saveconfig",
             "Save the current config",
@@ -1272,5 +1318,11 @@ class CommandSpec:
             type=str,
         )
 
+        self.add_cmd(
+            "tasks",
+            "Show the tasks and when they will run next",
+            lambda a=None: tasks.show(),
+        )
+
 
 command_spec = CommandSpec()
@@ -14,6 +14,8 @@ from .args import args
 from .paths import paths
 from .utils import utils
 from .files import files
+from .completion import completion
+from .ngrams import NgramIndex
 
 
 @dataclass
@@ -34,8 +36,11 @@ class Commands:
     def __init__(self) -> None:
         self.commands: dict[str, dict[str, Any]] = {}
         self.loop_delay = 25
+        self.loop_after = ""
         self.queues: list[Queue] = []
         self.aliases: dict[str, str] = {}
+        self.cmd_index = NgramIndex()
+        self.alias_index = NgramIndex()
 
     def setup(self) -> None:
         prefix = utils.escape_regex(args.command_prefix)
@@ -45,8 +50,9 @@ class Commands:
         self.make_commands()
         self.make_aliases()
         self.load_file()
-        self.start_loop()
         self.get_cmdkeys()
+        self.cmd_index.set_items(list(self.commands))
+        self.alias_index.set_items(list(self.aliases))
 
     def get_cmdkeys(self) -> None:
         self.cmdkeys = []
@@ -57,45 +63,55 @@ class Commands:
         for key in self.aliases:
             self.cmdkeys.append(key)
 
+        dates = {key: item["date"] for key, item in self.commands.items()}
+        completion.set_commands(self.cmdkeys, dates)
+
     def start_loop(self) -> None:
-        def loop() -> None:
-            to_remove = []
+        # The loop only runs while there are queued commands
+        if self.loop_after:
+            return
 
-            for queue in self.queues:
-                if queue.wait:
-                    queue.wait -= self.loop_delay
+        self.loop_after = app.root.after(self.loop_delay, lambda: self.loop())
 
-                    if queue.wait <= 0.0:
-                        queue.wait = 0.0
+    def loop(self) -> None:
+        self.loop_after = ""
+        to_remove = []
 
-                    continue
+        for queue in self.queues:
+            if queue.wait:
+                queue.wait -= self.loop_delay
 
-                if queue.items:
-                    item = queue.items.pop(0)
+                if queue.wait <= 0.0:
+                    queue.wait = 0.0
 
-                    if item.cmd == "sleep":
-                        if not item.argument:
-                            item.argument = "1"
+                continue
+
+            if queue.items:
+                item = queue.items.pop(0)
 
-                        if item.argument and queue.items:
-                            queue.wait = float(item.argument) * 1000.0
-                    elif self.aliases.get(item.cmd):
-                        self.exec(self.aliases[item.cmd], queue)
-                    elif not self.try_to_run(item.cmd, item.argument):
-                        similar = self.get_similar_alias(item.cmd)
+                if item.cmd == "sleep":
+                    if not item.argument:
+                        item.argument = "1"
 
-                        if similar:
-                            self.exec(self.aliases[similar], queue)
+                    if item.argument and queue.items:
+                        queue.wait = float(item.argument) * 1000.0
+                elif self.aliases.get(item.cmd):
+                    completion.use_command(item.cmd)
+                    self.exec(self.aliases[item.cmd], queue)
+                elif not self.try_to_run(item.cmd, item.argument):
+                    similar = self.get_similar_alias(item.cmd)
 
-                    if not queue.items:
-                        to_remove.append(queue)
+                    if similar:
+                        self.exec(self.aliases[similar], queue)
 
-            for rm_item in to_remove:
-                self.queues.remove(rm_item)
+                if not queue.items:
+                    to_remove.append(queue)
 
-            app.root.after(self.loop_delay, lambda: loop())
+        for rm_item in to_remove:
+            self.queues.remove(rm_item)
 
-        loop()
+        if self.queues:
+            self.start_loop()
 
     def make_commands(self) -> None:
         from .command_spec import CommandSpec
@@ -132,6 +148,8 @@ class Commands:
             return
 
         self.aliases[name] = value
+        self.alias_index.add(name)
+        self.get_cmdkeys()
         prefix = args.command_prefix
         display.print(f"Set Alias: `{prefix}{name}` is now `{value}`", do_format=True)
 
@@ -140,6 +158,8 @@ class Commands:
 
         if name in self.aliases:
             del self.aliases[name]
+            self.alias_index.remove(name)
+            self.get_cmdkeys()
             display.print(f"Unset Alias: {name}")
         else:
             display.print(f"Alias not found: {name}")
@@ -164,13 +184,16 @@ class Commands:
         return with_prefix and second_char.isalpha()
 
     def exec(self, text: str, queue: Queue | None = None) -> bool:
+        return self.enqueue(text, queue) is not None
+
+    def enqueue(self, text: str, queue: Queue | None = None) -> Queue | None:
         text = text.strip()
 
         if not text:
-            return False
+            return None
 
         if not self.is_command(text):
-            return False
+            return None
 
         cmds = re.split(self.cmd_pattern, text)
         items = []
@@ -189,7 +212,9 @@ class Commands:
                 queue = Queue(items)
                 self.queues.append(queue)
 
-        return True
+            self.start_loop()
+
+        return queue
 
     def run(
         self, cmd: str, argument: str | None = None, update_date: bool = False
@@ -223,6 +248,7 @@ class Commands:
 
         item = self.commands[cmd]
         item["action"](new_argument)
+        completion.use_command(cmd)
 
         if update_date:
             item["date"] = utils.now()
@@ -238,12 +264,11 @@ class Commands:
         files.save(paths.commands, cmds)
 
     def try_to_run(self, cmd: str, argument: str) -> bool:
-        for key in self.commands:
-            if cmd == key:
-                self.run(key, argument)
-                return True
+        if cmd in self.commands:
+            self.run(cmd, argument)
+            return True
 
-        most_similar = utils.most_similar(cmd, list(self.commands.keys()))
+        most_similar = self.cmd_index.most_similar(cmd)
 
         if most_similar:
             self.run(most_similar, argument)
@@ -252,7 +277,7 @@ class Commands:
         return False
 
     def get_similar_alias(self, cmd: str) -> str | None:
-        return utils.most_similar(cmd, list(self.aliases.keys()))
+        return self.alias_index.most_similar(cmd)
 
     def help(self) -> None:
         from .model import model
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+# Standard
+import bisect
+import tkinter as tk
+from typing import Any
+
+# Modules
+from .app import app
+from .args import args
+from .paths import paths
+from .utils import utils
+from .files import files
+
+
+class WordIndex:
+    def __init__(self) -> None:
+        # Sorted keys for prefix lookups, scores are [uses, last use]
+        self.keys: list[str] = []
+        self.scores: dict[str, list[float]] = {}
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.scores
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, word: str, uses: float = 1, last: float | None = None) -> bool:
+        date = utils.now() if last is None else last
+        score = self.scores.get(word)
+
+        if score:
+            score[0] += uses
+            score[1] = max(score[1], date)
+            return False
+
+        bisect.insort(self.keys, word)
+        self.scores[word] = [uses, date]
+        return True
+
+    def remove(self, word: str) -> None:
+        if word not in self.scores:
+            return
+
+        del self.scores[word]
+        index = bisect.bisect_left(self.keys, word)
+        del self.keys[index]
+
+    def clear(self) -> None:
+        self.keys = []
+        self.scores = {}
+
+    def prefixed(self, prefix: str) -> list[str]:
+        index = bisect.bisect_left(self.keys, prefix)
+        words = []
+
+        while index < len(self.keys):
+            word = self.keys[index]
+
+            if not word.startswith(prefix):
+                break
+
+            words.append(word)
+            index += 1
+
+        return words
+
+    def matches(self, prefix: str) -> list[str]:
+        words = self.prefixed(prefix)
+
+        # Most used first, then most recent, then alphabetical
+        words.sort(key=lambda w: (-self.scores[w][0], -self.scores[w][1], w))
+        return words
+
+    def trim(self, max_items: int) -> None:
+        if len(self.keys) <= max_items:
+            return
+
+        # Forget the words that were used least recently
+        oldest = sorted(self.scores, key=lambda w: self.scores[w][1])
+
+        for word in oldest[: len(self.keys) - max_items]:
+            self.remove(word)
+
+    def to_list(self) -> list[list[Any]]:
+        items = sorted(self.scores.items(), key=lambda item: item[1][1])
+        return [[word, score[0], score[1]] for word, score in items]
+
+    def from_list(self, items: list[Any]) -> None:
+        self.clear()
+
+        for i, item in enumerate(items):
+            # Older files are plain lists of words, oldest first
+            if isinstance(item, str):
+                self.add(item, 1, i)
+            elif isinstance(item, list) and (len(item) == 3):
+                self.add(str(item[0]), float(item[1]), float(item[2]))
+
+
+class Completion:
+    def __init__(self) -> None:
+        self.words = WordIndex()
+        self.commands = WordIndex()
+        self.variables = WordIndex()
+        self.save_after = ""
+        self.save_delay = 2000
+
+    def load_words(self) -> None:
+        path = paths.autocomplete
+
+        if not (path.exists() and path.is_file()):
+            return
+
+        try:
+            self.words.from_list(files.load(path))
+        except BaseException as e:
+            utils.error(e)
+            self.words.clear()
+
+    def add_word(self, word: str) -> bool:
+        added = self.words.add(word)
+        self.words.trim(args.input_memory_max_items)
+        self.save()
+        return added
+
+    def save(self) -> None:
+        if self.save_after:
+            return
+
+        self.save_after = app.root.after(self.save_delay, lambda: self.do_save())
+
+    def do_save(self) -> None:
+        self.save_after = ""
+        files.save(paths.autocomplete, self.words.to_list())
+
+    def flush(self) -> None:
+        if not self.save_after:
+            return
+
+        try:
+            app.root.after_cancel(self.save_after)
+        except tk.TclError:
+            pass
+
+        self.do_save()
+
+    def set_commands(self, keys: list[str], dates: dict[str, float]) -> None:
+        self.commands.clear()
+
+        for key in keys:
+            self.commands.add(key, 0, dates.get(key, 0.0))
+
+    def use_command(self, key: str) -> None:
+        if key in self.commands:
+            self.commands.add(key)
+
+    def get_matches(self, word: str) -> list[str]:
+        from .commands import commands
+
+        # Commands and variables are returned without their prefix
+        if commands.is_command(word):
+            return self.commands.matches(word[len(args.command_prefix) :])
+
+        if word.startswith(args.variable_prefix):
+            return self.variables.matches(word[len(args.variable_prefix) :])
+
+        return self.words.matches(word)
+
+
+completion = Completion()
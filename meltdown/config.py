@@ -64,6 +64,9 @@ class Config:
         self.default_mode = "text"
         self.default_theme = "dark"
         self.default_logits = "normal"
+        self.default_draft = ""
+        self.default_batch = 512
+        self.default_ubatch = 0
 
         self.model = self.default_model
         self.name_user = self.default_name_user
@@ -91,6 +94,9 @@ class Config:
         self.mode = self.default_mode
         self.theme = self.default_theme
         self.logits = self.default_logits
+        self.draft = self.default_draft
+        self.batch = self.default_batch
+        self.ubatch = self.default_ubatch
 
         self.locals = [
             "theme",
@@ -109,6 +115,7 @@ class Config:
             "avatar_user",
             "avatar_ai",
             "file",
+            "draft",
         ]
 
         self.model_keys = [
@@ -120,17 +127,23 @@ class Config:
             "format",
             "mode",
             "logits",
+            "draft",
+            "batch",
+            "ubatch",
         ]
 
         self.path_keys = [
             "model",
             "file",
+            "draft",
         ]
 
         self.modes = ["text", "image"]
 
         self.validations: dict[str, Callable[..., Any]] = {
             "history": lambda x: max(0, x),
+            "batch": lambda x: max(1, x),
+            "ubatch": lambda x: max(0, x),
             "name_user": lambda x: self.get_default("name_user") if not x else x,
             "name_ai": lambda x: self.get_default("name_ai") if not x else x,
         }
@@ -18,10 +18,11 @@ from .app import app
 from .commands import commands
 from .inputcontrol import inputcontrol
 from .utils import utils
+from .variables import variables
+from .completion import completion
 
 
 completer: Completer
-words: list[str] = []
 
 
 class SlashCompleter(Completer):  # type: ignore
@@ -33,24 +34,21 @@ class SlashCompleter(Completer):  # type: ignore
         if not text:
             return
 
-        if text.startswith(args.command_prefix):
-            for word in words:
-                if word.startswith(text):
-                    yield Completion(word, start_position=-len(text))
+        if commands.is_command(text):
+            prefix = args.command_prefix
+        elif variables.is_variable(text):
+            prefix = args.variable_prefix
         else:
-            for word in words:
-                if word.startswith(text):
-                    yield Completion(word, start_position=-len(text))
+            prefix = ""
+
+        for word in completion.get_matches(text):
+            yield Completion(prefix + word, start_position=-len(text))
 
 
 class Console:
     def __init__(self) -> None:
         self.session: PromptSession[Any] | None = None
 
-    def add_word(self, word: str) -> None:
-        if word not in words:
-            words.append(word)
-
     def start(self) -> None:
         if not args.console:
             return
@@ -73,9 +71,6 @@ class Console:
 
         history = InMemoryHistory()
 
-        words.extend([f"/{key}" for key in commands.cmdkeys])
-        words.extend(inputcontrol.autocomplete)
-
         completer = SlashCompleter()
 
         self.session = PromptSession(
@@ -10,12 +10,6 @@ from .tips import tips
 from .utils import utils
 from .widgetutils import widgetutils
 
-# Try Import
-llama_cpp = utils.try_import("llama_cpp")
-
-if llama_cpp:
-    Formats = llama_cpp.llama_chat_format.LlamaChatCompletionHandlerRegistry
-
 
 if TYPE_CHECKING:
     from .widgets import Widgets
@@ -92,15 +86,31 @@ class Details:
         self.make_label(widgets, data, "gpu_layers", "GPU")
         self.make_entry(widgets, data, "gpu_layers")
 
+    def add_batch(self, widgets: Widgets, data: FrameData) -> None:
+        self.make_label(widgets, data, "batch", "Batch")
+        self.make_entry(widgets, data, "batch")
+        self.make_label(widgets, data, "ubatch", "UBatch")
+        self.make_entry(widgets, data, "ubatch")
+
     def add_format(self, widgets: Widgets, data: FrameData) -> None:
         self.make_label(widgets, data, "format", "Format", padx=(0, app.theme.padx))
-        values = ["auto"]
+        self.make_combobox(widgets, data, "format", ["auto"], width=13)
+
+        # The formats come from llama_cpp which is only imported when opened
+        widgets.format.configure(postcommand=lambda: self.fill_formats(widgets))
 
-        if llama_cpp:
-            fmts = sorted(Formats._chat_handlers)
-            values.extend(fmts)
+    def fill_formats(self, widgets: Widgets) -> None:
+        if len(widgets.format["values"]) > 1:
+            return
 
-        self.make_combobox(widgets, data, "format", values, width=13)
+        llama_cpp = utils.try_import("llama_cpp")
+
+        if not llama_cpp:
+            return
+
+        registry = llama_cpp.llama_chat_format.LlamaChatCompletionHandlerRegistry
+        values = ["auto", *sorted(registry._chat_handlers)]
+        widgets.format.configure(values=values)
 
     def add_temperature(self, widgets: Widgets, data: FrameData) -> None:
         self.make_label(widgets, data, "temperature", "Temp")
@@ -138,6 +148,10 @@ class Details:
         self.make_label(widgets, data, "mlock", "M-Lock")
         self.make_combobox(widgets, data, "mlock", ["yes", "no"], width=7)
 
+    def add_draft(self, widgets: Widgets, data: FrameData) -> None:
+        self.make_label(widgets, data, "draft", "Draft")
+        self.make_entry(widgets, data, "draft", width=self.width_1)
+
     def add_items(self) -> None:
         from .framedata import FrameData
         from .widgets import widgets
@@ -151,6 +165,7 @@ class Details:
         self.add_temperature(widgets, data)
         self.add_threads(widgets, data)
         self.add_gpu_layers(widgets, data)
+        self.add_batch(widgets, data)
 
         # Details 2 Items
         data = FrameData(widgets.scroller_details_2)
@@ -163,6 +178,7 @@ class Details:
         self.add_stop(widgets, data)
         self.add_mlock(widgets, data)
         self.add_logits(widgets, data)
+        self.add_draft(widgets, data)
 
 
 details = Details()
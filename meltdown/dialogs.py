@@ -5,7 +5,6 @@ import tkinter as tk
 from tkinter import ttk
 from typing import Any
 from collections.abc import Callable
-from PIL import Image, ImageTk  # type: ignore
 from pathlib import Path
 
 # Modules
@@ -102,6 +101,8 @@ class Dialog:
         # ------
 
         if image:
+            from PIL import Image, ImageTk  # type: ignore
+
             img_file = Image.open(image)
             width, height = img_file.size
             new_width = image_width
@@ -18,6 +18,7 @@ from .args import args
 from .utils import utils
 from .autoscroll import autoscroll
 from .itemops import itemops
+from .events import events
 
 if TYPE_CHECKING:
     from .session import Conversation
@@ -54,7 +55,10 @@ class Tab:
         if self.created:
             return
 
-        pcontent = self.page.content
+        pcontent = self.page.get_content()
+        pcontent.grid_rowconfigure(0, weight=0)
+        pcontent.grid_rowconfigure(1, weight=1)
+        pcontent.grid_rowconfigure(2, weight=0)
         find = Find(pcontent, self.tab_id)
         output_frame = tk.Frame(pcontent)
         output_frame.grid(row=1, column=0, sticky="nsew")
@@ -184,6 +188,7 @@ class Display:
         save: bool = True,
         no_intro: bool = False,
         position: str = "end",
+        defer: bool = False,
     ) -> str:
         from .session import session
 
@@ -211,7 +216,8 @@ class Display:
         tooltip = ""
 
         if convo and convo.items:
-            tooltip = convo.items[0].ai
+            # Only the start of the answer ends up in the tooltip
+            tooltip = convo.items[0].ai[: args.tab_tooltip_length * 2]
 
         if convo:
             pin = convo.pin
@@ -224,6 +230,7 @@ class Display:
             tooltip=tooltip,
             position=position,
             pin=pin,
+            defer=defer,
         )
 
         tab_id = page.id_
@@ -241,10 +248,6 @@ class Display:
         if select_tab:
             self.select_tab(tab_id)
 
-        page.content.grid_rowconfigure(0, weight=0)
-        page.content.grid_rowconfigure(1, weight=1)
-        page.content.grid_rowconfigure(2, weight=0)
-
         self.tab_number += 1
 
         if save:
@@ -295,6 +298,7 @@ class Display:
         tab.get_output().reset_drag()
         inputcontrol.focus()
         self.check_scroll_buttons()
+        events.publish("tab")
 
     def show_intro(self, tab_id: str) -> None:
         if not args.show_intro:
@@ -591,7 +595,7 @@ class Display:
 
     def reset_tab(self, tab: Tab) -> None:
         tab.get_output().reset()
-        tab.modified = False
+        self.set_modified(tab, False)
         tab.num_user_prompts = 0
         self.show_header(tab.tab_id)
         self.show_intro(tab.tab_id)
@@ -629,7 +633,7 @@ class Display:
         tab.get_output().print(text)
 
         if modified:
-            tab.modified = True
+            self.set_modified(tab, True)
 
         if do_format:
             self.format_text(tab_id, mode="last")
@@ -647,7 +651,7 @@ class Display:
             return
 
         tab.get_output().insert_text(text)
-        tab.modified = True
+        self.set_modified(tab, True)
 
     def get_tab_name(self, tab_id: str | None = None) -> str:
         if not tab_id:
@@ -902,7 +906,7 @@ class Display:
         if who == "ai":
             tab.num_user_prompts += 1
 
-        tab.modified = True
+        self.set_modified(tab, True)
 
     def auto_name_tab(self, tab_id: str, text: str) -> None:
         tab = self.get_tab(tab_id)
@@ -1068,6 +1072,14 @@ class Display:
 
     def on_num_tabs_change(self, num: int) -> None:
         self.num_tabs_open = num
+        events.publish("tab")
+
+    def set_modified(self, tab: Tab, value: bool) -> None:
+        if tab.modified == value:
+            return
+
+        tab.modified = value
+        events.publish("tab")
 
     def is_modified(self, tab_id: str | None = None) -> bool:
         if not tab_id:
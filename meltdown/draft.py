@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+# Standard
+from pathlib import Path
+from typing import Any
+
+# Modules
+from .args import args
+from .utils import utils
+
+
+class DraftNotFoundError(FileNotFoundError):
+    def __init__(self, path: str) -> None:
+        super().__init__(f"Draft model not found: {path}")
+
+
+class GgufDraft:
+    # Greedy drafts from a small model that shares the vocabulary
+    def __init__(self, llama_cpp: Any, path: str, n_ctx: int) -> None:
+        self.model = llama_cpp.Llama(
+            model_path=path,
+            n_ctx=n_ctx,
+            verbose=args.verbose,
+        )
+
+    def __call__(self, input_ids: Any) -> Any:
+        import numpy as np  # type: ignore
+
+        tokens = []
+
+        # generate reuses the cached prefix of the previous call
+        for token in self.model.generate(input_ids.tolist(), top_k=1, temp=0.0):
+            tokens.append(token)
+
+            if len(tokens) >= args.draft_tokens:
+                break
+
+        return np.array(tokens, dtype=np.intc)
+
+    def close(self) -> None:
+        close = getattr(self.model, "close", None)
+
+        if close:
+            close()
+
+
+# Passed to Llama as the draft model, one per loaded model
+class Draft:
+    @staticmethod
+    def make(llama_cpp: Any, value: str, n_ctx: int) -> Draft | None:
+        value = value.strip()
+
+        if not value:
+            return None
+
+        if value == "lookup":
+            speculative = llama_cpp.llama_speculative
+            lookup = speculative.LlamaPromptLookupDecoding
+            return Draft(lookup(num_pred_tokens=args.draft_tokens))
+
+        path = Path(value)
+
+        if (not path.exists()) or (not path.is_file()):
+            raise DraftNotFoundError(value)
+
+        return Draft(GgufDraft(llama_cpp, str(path), n_ctx))
+
+    @staticmethod
+    def describe(stats: list[int]) -> str:
+        drafted, accepted = stats
+        rate = int(100 * accepted / max(drafted, 1))
+        return f"Draft: {accepted}/{drafted} tokens accepted ({rate}%)"
+
+    def __init__(self, model: Any) -> None:
+        self.model = model
+        self.drafted = 0
+        self.accepted = 0
+        self.last_length = 0
+        self.last_drafted = 0
+
+    def __call__(self, input_ids: Any) -> Any:
+        # llama.cpp doesn't report acceptance, so infer it from how far
+        # the input advanced since the last draft: the accepted tokens
+        # plus the one the main model sampled itself
+        length = len(input_ids)
+
+        if self.last_length and (length > self.last_length):
+            advanced = length - self.last_length - 1
+            self.accepted += min(max(advanced, 0), self.last_drafted)
+
+        tokens = self.model(input_ids)
+        self.last_length = length
+        self.last_drafted = len(tokens)
+        self.drafted += len(tokens)
+        return tokens
+
+    def reset(self) -> None:
+        self.drafted = 0
+        self.accepted = 0
+        self.last_length = 0
+        self.last_drafted = 0
+
+    def get_stats(self) -> list[int] | None:
+        if not self.drafted:
+            return None
+
+        return [self.drafted, self.accepted]
+
+    def close(self) -> None:
+        close = getattr(self.model, "close", None)
+        self.model = None
+
+        if close:
+            try:
+                close()
+            except BaseException as e:
+                utils.error(e)
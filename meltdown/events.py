@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+# Standard
+import tkinter as tk
+import threading
+from collections.abc import Callable
+
+# Modules
+from .app import app
+from .utils import utils
+
+
+Subscriber = Callable[[], None]
+
+
+class Events:
+    def __init__(self) -> None:
+        self.subscribers: dict[str, list[Subscriber]] = {}
+        self.main_thread = threading.main_thread()
+
+    def subscribe(self, name: str, func: Subscriber) -> None:
+        if name not in self.subscribers:
+            self.subscribers[name] = []
+
+        self.subscribers[name].append(func)
+
+    def unsubscribe(self, name: str, func: Subscriber) -> None:
+        funcs = self.subscribers.get(name)
+
+        if funcs and (func in funcs):
+            funcs.remove(func)
+
+    def publish(self, name: str) -> None:
+        if name not in self.subscribers:
+            return
+
+        if not app.exists():
+            return
+
+        # Subscribers touch widgets so they always run on the main thread
+        if threading.current_thread() is self.main_thread:
+            self.emit(name)
+            return
+
+        try:
+            app.root.after(0, lambda: self.emit(name))
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def emit(self, name: str) -> None:
+        for func in list(self.subscribers.get(name, [])):
+            try:
+                func()
+            except BaseException as e:
+                utils.error(e)
+
+
+events = Events()
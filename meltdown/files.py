@@ -2,6 +2,7 @@ from __future__ import annotations
 
 # Standard
 import json
+import hashlib
 from typing import Any
 from pathlib import Path
 
@@ -23,6 +24,7 @@ class Files:
         self.inputs_loaded = False
         self.systems_loaded = False
         self.files_loaded = False
+        self.hash_sample = 1024 * 1024
 
     def save(self, path: Path, dictionary: Any) -> None:
         with path.open("w", encoding="utf-8") as file:
@@ -133,6 +135,20 @@ class Files:
         with path.open("w", encoding="utf-8") as file:
             file.write(text)
 
+    def get_hash(self, path: Path) -> str:
+        # Hashing a whole model takes long, so use the size and the
+        # first and last megabyte, which hold the header and tensors
+        size = path.stat().st_size
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(size).encode())
+
+        with path.open("rb") as file:
+            digest.update(file.read(self.hash_sample))
+            file.seek(max(size - self.hash_sample, 0))
+            digest.update(file.read(self.hash_sample))
+
+        return digest.hexdigest()
+
     def clean_path(self, path: str) -> str:
         return path.replace("file://", "", 1)
 
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+# Standard
+import io
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO
+
+
+# Reads the metadata of gguf files without loading the tensors
+# https://github.com/ggerganov/ggml/blob/master/docs/gguf.md
+
+# Scalar value types by id
+scalars = {
+    0: struct.Struct("<B"),
+    1: struct.Struct("<b"),
+    2: struct.Struct("<H"),
+    3: struct.Struct("<h"),
+    4: struct.Struct("<I"),
+    5: struct.Struct("<i"),
+    6: struct.Struct("<f"),
+    7: struct.Struct("<?"),
+    10: struct.Struct("<Q"),
+    11: struct.Struct("<q"),
+    12: struct.Struct("<d"),
+}
+
+string_type = 8
+array_type = 9
+u32 = struct.Struct("<I")
+u64 = struct.Struct("<Q")
+
+# From llama_ftype in llama.h
+file_types = {
+    0: "F32",
+    1: "F16",
+    2: "Q4_0",
+    3: "Q4_1",
+    7: "Q8_0",
+    8: "Q5_0",
+    9: "Q5_1",
+    10: "Q2_K",
+    11: "Q3_K_S",
+    12: "Q3_K_M",
+    13: "Q3_K_L",
+    14: "Q4_K_S",
+    15: "Q4_K_M",
+    16: "Q5_K_S",
+    17: "Q5_K_M",
+    18: "Q6_K",
+    19: "IQ2_XXS",
+    20: "IQ2_XS",
+    21: "Q2_K_S",
+    22: "IQ3_XS",
+    23: "IQ3_XXS",
+    24: "IQ1_S",
+    25: "IQ4_NL",
+    26: "IQ3_S",
+    27: "IQ3_M",
+    28: "IQ2_S",
+    29: "IQ2_M",
+    30: "IQ4_XS",
+    31: "IQ1_M",
+    32: "BF16",
+    36: "TQ1_0",
+    37: "TQ2_0",
+}
+
+# Markers that identify the common chat templates
+templates = [
+    ("<|start_header_id|>", "llama-3"),
+    ("<|im_start|>", "chatml"),
+    ("<start_of_turn>", "gemma"),
+    ("<|user|>", "zephyr"),
+    ("[INST]", "mistral"),
+    ("### Instruction", "alpaca"),
+]
+
+
+# Messages of the read errors
+reasons = {
+    "end": "Unexpected end of file",
+    "magic": "Not a gguf file",
+    "version": "Unsupported gguf version",
+    "type": "Unknown value type",
+}
+
+
+class GgufError(Exception):
+    def __init__(self, reason: str, value: Any = None) -> None:
+        message = reasons[reason]
+
+        if value is not None:
+            message += f": {value}"
+
+        super().__init__(message)
+
+
+class Reader:
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.chunk = 256 * 1024
+
+    def read(self, size: int) -> bytes:
+        data = self.file.read(size)
+
+        if len(data) != size:
+            raise GgufError("end")
+
+        return data
+
+    def unpack(self, fmt: struct.Struct) -> Any:
+        return fmt.unpack(self.read(fmt.size))[0]
+
+    def string(self) -> str:
+        size = self.unpack(u64)
+        return self.read(size).decode("utf-8", errors="replace")
+
+    def skip_string(self) -> None:
+        size = self.unpack(u64)
+        self.file.seek(size, io.SEEK_CUR)
+
+    def skip_strings(self, count: int) -> None:
+        # Walk the lengths in memory, a seek per string is much slower
+        buf = b""
+        pos = 0
+
+        for _ in range(count):
+            if pos + 8 > len(buf):
+                buf = buf[pos:] + self.file.read(self.chunk)
+                pos = 0
+
+                if len(buf) < 8:
+                    raise GgufError("end")
+
+            size = u64.unpack_from(buf, pos)[0]
+            pos += 8 + size
+
+            if pos > len(buf):
+                self.file.seek(pos - len(buf), io.SEEK_CUR)
+                buf = b""
+                pos = 0
+
+        # Go back to the end of the last string
+        self.file.seek(pos - len(buf), io.SEEK_CUR)
+
+    def value(self, vtype: int, keep: bool) -> Any:
+        if vtype in scalars:
+            return self.unpack(scalars[vtype])
+
+        if vtype == string_type:
+            if keep:
+                return self.string()
+
+            self.skip_string()
+            return None
+
+        if vtype == array_type:
+            itype = self.unpack(u32)
+            count = self.unpack(u64)
+
+            # Arrays are vocabularies and such, skip over them
+            if itype in scalars:
+                self.file.seek(scalars[itype].size * count, io.SEEK_CUR)
+            elif itype == string_type:
+                self.skip_strings(count)
+            else:
+                for _ in range(count):
+                    self.value(itype, False)
+
+            return None
+
+        raise GgufError("type", vtype)
+
+
+class Gguf:
+    def get_template_name(self, template: str) -> str:
+        for marker, name in templates:
+            if marker in template:
+                return name
+
+        return "custom" if template else ""
+
+    def read_header(self, path: Path) -> dict[str, Any]:
+        with path.open("rb", buffering=1024 * 1024) as file:
+            reader = Reader(file)
+
+            if reader.read(4) != b"GGUF":
+                raise GgufError("magic")
+
+            version = reader.unpack(u32)
+
+            if version < 2:
+                raise GgufError("version", version)
+
+            num_tensors = reader.unpack(u64)
+            num_values = reader.unpack(u64)
+            values: dict[str, Any] = {}
+
+            for _ in range(num_values):
+                key = reader.string()
+                vtype = reader.unpack(u32)
+                values[key] = reader.value(vtype, True)
+
+            # The tensor infos come next, count the parameters from their shapes
+            params = 0
+
+            for _ in range(num_tensors):
+                reader.skip_string()
+                dims = reader.unpack(u32)
+                count = 1
+
+                for _ in range(dims):
+                    count *= reader.unpack(u64)
+
+                reader.read(4 + 8)
+                params += count
+
+        arch = values.get("general.architecture") or ""
+        template = values.get("tokenizer.chat_template") or ""
+
+        return {
+            "arch": arch,
+            "name": values.get("general.name") or "",
+            "params": params,
+            "quant": file_types.get(values.get("general.file_type", -1), ""),
+            "context": values.get(f"{arch}.context_length") or 0,
+            "template": self.get_template_name(template),
+        }
+
+
+gguf = Gguf()
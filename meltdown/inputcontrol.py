@@ -10,7 +10,6 @@ from .commands import commands
 from .config import config
 from .entrybox import EntryBox
 from .args import args
-from .paths import paths
 from .dialogs import Dialog
 from .tips import tips
 from .utils import utils
@@ -18,13 +17,13 @@ from .files import files
 from .menus import Menu
 from .widgetutils import widgetutils
 from .variables import variables
+from .completion import completion
 
 
 class InputControl:
     def __init__(self) -> None:
         self.history_index = -1
         self.input: EntryBox
-        self.autocomplete: list[str] = []
         self.last_delete_press = 0.0
         self.triggers: dict[str, str] = {}
 
@@ -279,17 +278,7 @@ class InputControl:
             display.toggle_scroll()
 
     def setup(self) -> None:
-        path = paths.autocomplete
-
-        if path.exists() and path.is_file():
-            try:
-                self.autocomplete = files.load(path)
-            except BaseException as e:
-                utils.error(e)
-                self.autocomplete = []
-        else:
-            self.autocomplete = []
-
+        completion.load_words()
         self.check()
 
     def check(self) -> None:
@@ -316,15 +305,10 @@ class InputControl:
         self.submit(tab_id=tab_id, text=text, file=file)
 
     def add_words(self, text: str) -> None:
-        from .console import console
-
         if not args.input_memory:
             return
 
-        words = text.split()
-        added = False
-
-        for word in words:
+        for word in text.split():
             clean_word = utils.clean_text(word)
             len_words = len(clean_word)
 
@@ -337,16 +321,7 @@ class InputControl:
             if commands.is_command(clean_word):
                 continue
 
-            if clean_word not in self.autocomplete:
-                self.autocomplete.append(clean_word)
-                console.add_word(clean_word)
-                added = True
-
-            n = args.input_memory_max_items
-            self.autocomplete = self.autocomplete[-n:]
-
-        if added:
-            files.save(paths.autocomplete, self.autocomplete)
+            completion.add_word(clean_word)
 
     def write(
         self, maxed: bool = False, text: str | None = None, add_line: bool = False
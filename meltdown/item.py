@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+# Standard
+import sys
+from typing import Any
+
+
+# seed, history, max_tokens, temperature, top_k, top_p
+Params = tuple[
+    int | None, int | None, int | None, float | None, int | None, float | None
+]
+
+
+class Interned:
+    def __init__(self) -> None:
+        # Most items of a session repeat the same few parameter sets
+        self.params: dict[Params, Params] = {}
+
+    def get_params(self, params: Params) -> Params:
+        return self.params.setdefault(params, params)
+
+    def get_string(self, text: str) -> str:
+        return sys.intern(text) if text else text
+
+
+interned = Interned()
+
+
+class Item:
+    __slots__ = (
+        "ai",
+        "date",
+        "duration",
+        "file",
+        "model",
+        "params",
+        "resources",
+        "user",
+    )
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> Item:
+        return Item(
+            model=data.get("model", ""),
+            user=data.get("user", ""),
+            ai=data.get("ai", ""),
+            file=data.get("file", ""),
+            date=data.get("date", None),
+            duration=data.get("duration", None),
+            seed=data.get("seed", None),
+            history=data.get("history", None),
+            max_tokens=data.get("max_tokens", None),
+            temperature=data.get("temperature", None),
+            top_k=data.get("top_k", None),
+            top_p=data.get("top_p", None),
+            resources=data.get("resources", None),
+        )
+
+    def __init__(
+        self,
+        model: str,
+        user: str,
+        ai: str,
+        file: str,
+        date: float | None,
+        duration: float | None,
+        seed: int | None,
+        history: int | None,
+        max_tokens: int | None,
+        temperature: float | None,
+        top_k: int | None,
+        top_p: float | None,
+        resources: dict[str, Any] | None = None,
+    ) -> None:
+        self.date = date
+        self.duration = duration
+        self.user = user
+        self.ai = ai
+        self.file = interned.get_string(file)
+        self.model = interned.get_string(model)
+        self.resources = resources
+
+        self.params = interned.get_params(
+            (seed, history, max_tokens, temperature, top_k, top_p)
+        )
+
+    @property
+    def seed(self) -> int | None:
+        return self.params[0]
+
+    @property
+    def history(self) -> int | None:
+        return self.params[1]
+
+    @property
+    def max_tokens(self) -> int | None:
+        return self.params[2]
+
+    @property
+    def temperature(self) -> float | None:
+        return self.params[3]
+
+    @property
+    def top_k(self) -> int | None:
+        return self.params[4]
+
+    @property
+    def top_p(self) -> float | None:
+        return self.params[5]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "date": self.date,
+            "duration": self.duration,
+            "user": self.user,
+            "ai": self.ai,
+            "file": self.file,
+            "model": self.model,
+            "seed": self.seed,
+            "history": self.history,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "top_k": self.top_k,
+            "top_p": self.top_p,
+            "resources": self.resources,
+        }
@@ -9,10 +9,11 @@ from .args import args
 from .utils import utils
 from .dialogs import Dialog, Commands
 from .memory import memory
+from .resources import resources
 
 
 if TYPE_CHECKING:
-    from .session import Item
+    from .item import Item
 
 
 class ItemOps:
@@ -245,6 +246,9 @@ class ItemOps:
         if item.top_p is not None:
             text += f"\nTop P: {item.top_p}"
 
+        if item.resources:
+            text += f"\n\n{resources.describe(item.resources)}"
+
         Dialog.show_msgbox("Information", text)
 
     def last_item(self) -> Item | None:
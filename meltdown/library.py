@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+# Standard
+import threading
+from pathlib import Path
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+
+# Modules
+from .args import args
+from .paths import paths
+from .utils import utils
+from .files import files
+from .events import events
+from .gguf import gguf
+
+
+class ModelLibrary:
+    def __init__(self) -> None:
+        # Path -> header info, kept until the size or mtime changes
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.loaded = False
+        self.lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+        self.workers = 4
+
+    def setup(self) -> None:
+        if not args.model_dirs:
+            return
+
+        self.scan()
+
+    def load(self) -> None:
+        self.loaded = True
+        path = paths.model_library
+
+        if not (path.exists() and path.is_file()):
+            return
+
+        try:
+            self.entries = files.load(path)
+        except BaseException as e:
+            utils.error(e)
+            self.entries = {}
+
+    def save(self) -> None:
+        try:
+            with self.lock:
+                entries = dict(self.entries)
+
+            files.save(paths.model_library, entries)
+        except BaseException as e:
+            utils.error(e)
+
+    def get_dirs(self) -> list[Path]:
+        if args.model_dirs:
+            return [Path(d).expanduser() for d in args.model_dirs]
+
+        # Otherwise the directories of the recent models
+        dirs = []
+
+        for item in files.get_list("models"):
+            parent = Path(item).parent
+
+            if item.endswith(".gguf") and (parent not in dirs):
+                dirs.append(parent)
+
+        return dirs
+
+    def is_scanning(self) -> bool:
+        return bool(self.thread and self.thread.is_alive())
+
+    def scan(self) -> None:
+        if self.is_scanning():
+            return
+
+        self.thread = threading.Thread(target=lambda: self.do_scan())
+        self.thread.daemon = True
+        self.thread.start()
+
+    def do_scan(self) -> None:
+        if not self.loaded:
+            self.load()
+
+        found: list[Path] = []
+        scanned: list[Path] = []
+
+        for folder in self.get_dirs():
+            if not folder.is_dir():
+                continue
+
+            try:
+                found.extend(folder.rglob("*.gguf"))
+                scanned.append(folder)
+            except BaseException as e:
+                utils.error(e)
+
+        # Only the new or changed files are read, in parallel
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            entries = list(pool.map(lambda path: self.read(path), found))
+
+        scan = {
+            str(path): entry
+            for path, entry in zip(found, entries, strict=True)
+            if entry
+        }
+
+        with self.lock:
+            # Models opened from other paths keep their entries
+            for name in list(self.entries):
+                if name in scan:
+                    continue
+
+                if any(Path(name).is_relative_to(d) for d in scanned):
+                    del self.entries[name]
+
+            self.entries.update(scan)
+
+        self.save()
+        events.publish("library")
+
+    def read(self, path: Path) -> dict[str, Any] | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(str(path))
+
+        if entry:
+            if (entry["size"] == stat.st_size) and (entry["mtime"] == stat.st_mtime_ns):
+                return entry
+
+        try:
+            entry = gguf.read_header(path)
+        except BaseException as e:
+            # Broken files are remembered too, until they change
+            entry = {"error": str(e)}
+
+        entry["size"] = stat.st_size
+        entry["mtime"] = stat.st_mtime_ns
+        return entry
+
+    def get_info(self, model: str) -> dict[str, Any] | None:
+        if not model.endswith(".gguf"):
+            return None
+
+        if not self.loaded:
+            self.load()
+
+        path = Path(model)
+        entry = self.read(path)
+
+        if entry:
+            with self.lock:
+                changed = self.entries.get(str(path)) is not entry
+                self.entries[str(path)] = entry
+
+            if changed:
+                self.save()
+
+        if (not entry) or ("error" in entry):
+            return None
+
+        return entry
+
+    def get_entries(self) -> list[tuple[str, dict[str, Any]]]:
+        with self.lock:
+            items = [item for item in self.entries.items() if "error" not in item[1]]
+
+        return sorted(items, key=lambda item: Path(item[0]).name.lower())
+
+    def get_params(self, params: int) -> str:
+        if params >= 1_000_000_000:
+            return f"{params / 1_000_000_000:.1f}B"
+
+        if params >= 1_000_000:
+            return f"{params / 1_000_000:.0f}M"
+
+        return str(params) if params else ""
+
+    def describe(self, entry: dict[str, Any]) -> str:
+        context = entry.get("context", 0)
+
+        parts = [
+            entry.get("arch", ""),
+            self.get_params(entry.get("params", 0)),
+            entry.get("quant", ""),
+            f"{context // 1024}k" if context >= 1024 else "",
+            entry.get("template", ""),
+        ]
+
+        return " ".join(part for part in parts if part)
+
+
+library = ModelLibrary()
@@ -1,13 +1,14 @@
+from __future__ import annotations
+
 # Standard
-import time
+import json
+import queue
+import socketserver
 import threading
 import tempfile
 from typing import Any
 from pathlib import Path
-
-# Libraries
-from watchdog.observers import Observer  # type: ignore
-from watchdog.events import FileSystemEventHandler  # type: ignore
+from collections.abc import Callable
 
 # Modules
 from .args import args
@@ -15,41 +16,269 @@ from .app import app
 from .utils import utils
 from .files import files
 from .inputcontrol import inputcontrol
+from .ratelimit import rate_limiter
 
 
-class FileChangeHandler(FileSystemEventHandler):  # type: ignore
-    def __init__(self, path: Path) -> None:
-        self.path = path
+Reply = dict[str, Any]
+
+
+class ListenerHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        listener.handle_client(self)
 
-    def on_modified(self, event: Any) -> None:
-        if event.src_path == str(self.path):
-            try:
-                text = files.read(self.path).strip()
 
-                if text:
-                    files.write(self.path, "")
-                    inputcontrol.submit(text=text)
-            except Exception as e:
-                utils.msg(f"Listener error: {e!s}")
+class ListenerServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
 
 
 class Listener:
+    def __init__(self) -> None:
+        self.server: ListenerServer | None = None
+        self.path: Path | None = None
+        self.turn = threading.Lock()
+        self.main_timeout = 5.0
+        self.token_timeout = 0.5
+        self.idle_checks = 4
+
     def start(self) -> None:
-        if not args.listen:
-            return
+        # The file works on its own, the socket needs --listen
+        if args.listen_file:
+            self.start_thread(self.watch_file)
 
-        thread = threading.Thread(target=lambda: self.do_start())
+        if args.listen:
+            self.start_thread(self.serve)
+
+    def start_thread(self, target: Callable[[], None]) -> None:
+        thread = threading.Thread(target=lambda: target())
         thread.daemon = True
         thread.start()
 
-    def do_start(self) -> None:
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+    def get_path(self) -> Path:
+        if args.listen_socket:
+            return Path(args.listen_socket)
+
         program = app.manifest["program"]
+        file_name = f"mlt_{program}_{args.profile}.sock"
+        return Path(tempfile.gettempdir(), file_name)
 
-        if args.listen_file:
-            path = Path(args.listen_file)
+    def serve(self) -> None:
+        path = self.get_path()
+
+        if path.exists():
+            path.unlink()
+
+        try:
+            self.server = ListenerServer(str(path), ListenerHandler)
+        except BaseException as e:
+            utils.msg(f"Listener error: {e!s}")
+            return
+
+        self.path = path
+
+        if not args.quiet:
+            utils.msg(f"Listening: {path!s}")
+
+        self.server.serve_forever()
+
+    def handle_client(self, handler: ListenerHandler) -> None:
+        for line in handler.rfile:
+            request = self.parse(line)
+
+            if not request:
+                continue
+
+            try:
+                self.process(request, handler)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except BaseException as e:
+                utils.error(e)
+                self.reply(handler, {"error": str(e)})
+
+    def parse(self, line: bytes) -> Reply | None:
+        text = line.decode("utf-8").strip()
+
+        if not text:
+            return None
+
+        if text.startswith("{"):
+            try:
+                obj = json.loads(text)
+            except json.JSONDecodeError:
+                return {"text": text}
+
+            if isinstance(obj, dict):
+                return obj
+
+            return None
+
+        return {"text": text}
+
+    def reply(self, handler: ListenerHandler, obj: Reply) -> None:
+        data = json.dumps(obj, ensure_ascii=False) + "\n"
+        handler.wfile.write(data.encode("utf-8"))
+        handler.wfile.flush()
+
+    def on_main(self, func: Callable[[], Any]) -> Any:
+        result: list[Any] = []
+        event = threading.Event()
+
+        def action() -> None:
+            try:
+                result.append(func())
+            finally:
+                event.set()
+
+        app.root.after(0, lambda: action())
+
+        if not event.wait(self.main_timeout):
+            return None
+
+        return result[0] if result else None
+
+    def process(self, request: Reply, handler: ListenerHandler) -> None:
+        from .commands import commands
+
+        text = str(request.get("text", "")).strip()
+
+        if not text:
+            self.reply(handler, {"error": "Empty request"})
+            return
+
+        if args.commands and commands.is_command(text):
+            self.on_main(lambda: commands.exec(text))
+            self.reply(handler, {"done": True})
+            return
+
+        # Only one stream can run at a time, clients wait their turn
+        with self.turn:
+            self.stream(text, str(request.get("tab", "")), handler)
+
+    def stream(self, text: str, tab: str, handler: ListenerHandler) -> None:
+        from .model import model
+
+        tab_id = self.on_main(lambda: self.get_tab(tab))
+
+        if not tab_id:
+            self.reply(handler, {"error": "Tab not found"})
+            return
+
+        tokens: queue.Queue[tuple[str, bool]] = queue.Queue()
+        start = utils.now()
+
+        def hook(hook_tab: str, token: str, done: bool) -> None:
+            if hook_tab != tab_id:
+                return
+
+            # The submit stops the stream that was running in the tab,
+            # its last tokens and its end belong to an older prompt
+            if threading.current_thread() is not model.stream_thread:
+                return
+
+            if model.stream_date < start:
+                return
+
+            tokens.put((token, done))
+
+        model.add_stream_hook(hook)
+        response: list[str] = []
+        idle = 0
+
+        try:
+            self.on_main(lambda: inputcontrol.submit(tab_id=tab_id, text=text))
+
+            while True:
+                try:
+                    token, done = tokens.get(timeout=self.token_timeout)
+                except queue.Empty:
+                    busy = model.streaming or model.is_loading()
+                    busy = busy or rate_limiter.has_queued(tab_id)
+                    idle = 0 if busy else idle + 1
+
+                    # The prompt was consumed without producing a stream
+                    if idle >= self.idle_checks:
+                        break
+
+                    continue
+
+                idle = 0
+
+                if done:
+                    break
+
+                response.append(token)
+                self.reply(handler, {"token": token, "tab": tab_id})
+        finally:
+            model.remove_stream_hook(hook)
+
+        self.reply(
+            handler, {"done": True, "tab": tab_id, "response": "".join(response)}
+        )
+
+    def get_tab(self, what: str) -> str:
+        from .display import display
+
+        what = what.strip()
+
+        if not what:
+            tab_id = display.current_tab
+        elif what == "new":
+            tab_id = display.make_tab(select_tab=False)
+        elif what.isdigit():
+            ids = display.tab_ids()
+            index = int(what) - 1
+
+            if (index < 0) or (index >= len(ids)):
+                return ""
+
+            tab_id = ids[index]
         else:
-            file_name = f"mlt_{program}.input"
-            path = Path(tempfile.gettempdir(), file_name)
+            tab_id = ""
+
+            for id_ in display.tab_ids():
+                if display.get_tab_name(id_).lower() == what.lower():
+                    tab_id = id_
+                    break
+
+        tab = display.get_tab(tab_id)
+
+        if not tab:
+            return ""
+
+        if not tab.loaded:
+            display.load_tab(tab_id)
+
+        return tab_id
+
+    def watch_file(self) -> None:
+        from watchdog.observers import Observer  # type: ignore
+        from watchdog.events import FileSystemEventHandler  # type: ignore
+
+        class FileChangeHandler(FileSystemEventHandler):  # type: ignore
+            def __init__(self, path: Path) -> None:
+                self.path = path
+
+            def on_modified(self, event: Any) -> None:
+                if event.src_path == str(self.path):
+                    try:
+                        text = files.read(self.path).strip()
+
+                        if text:
+                            files.write(self.path, "")
+                            inputcontrol.submit(text=text)
+                    except Exception as e:
+                        utils.msg(f"Listener error: {e!s}")
+
+        path = Path(args.listen_file)
 
         if not args.quiet:
             utils.msg(f"Listening: {path!s}")
@@ -57,17 +286,12 @@ class Listener:
         handler = FileChangeHandler(path)
         observer = Observer()
         observer.schedule(handler, path.parent, recursive=False)
-
-        thread = threading.Thread(target=observer.start)
-        thread.daemon = True
-        thread.start()
+        observer.start()
 
         try:
-            while True:
-                time.sleep(1)
+            observer.join()
         finally:
             observer.stop()
-            observer.join()
 
 
 listener = Listener()
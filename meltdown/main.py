@@ -5,6 +5,7 @@ import tempfile
 from pathlib import Path
 
 # Modules
+from .startup import startup
 from .app import app
 from .config import config
 from .widgets import widgets
@@ -18,19 +19,24 @@ from .inputcontrol import inputcontrol
 from .utils import utils
 from .paths import paths
 from .system import system
-from .console import console
 from .listener import listener
 from .tasks import tasks
+from .sinks import sinks
+from .completion import completion
 from .memory import memory
 from .autoscroll import autoscroll
 from .variables import variables
+from .library import library
+from .promptcache import prompt_cache
 
 
 def main() -> None:
+    startup.phase("imports")
     now = utils.now()
     title = app.manifest["title"]
     program = app.manifest["program"]
     args.parse()
+    startup.phase("args.parse")
 
     if not paths.setup():
         return
@@ -54,23 +60,40 @@ def main() -> None:
             return
 
     memory.load()
+    startup.phase("memory.load")
     config.load()
+    startup.phase("config.load")
     app.prepare()
+    startup.phase("app.prepare")
     widgets.make()
+    startup.phase("widgets.make")
     autoscroll.setup()
     model.setup()
     display.make()
+    startup.phase("display.make")
     session.load()
+    startup.phase("session.load")
     widgets.setup()
     keyboard.setup()
+    startup.phase("widgets.setup")
     commands.setup()
     variables.setup()
+    startup.phase("commands.setup")
     inputcontrol.setup()
     app.setup(now)
+    startup.phase("app.setup")
     system.start()
-    console.start()
+
+    if args.console:
+        from .console import console
+
+        console.start()
+
     listener.start()
+    sinks.start()
     tasks.start_all()
+    library.setup()
+    startup.phase("services")
 
     # Create singleton
     fp.write(str(os.getpid()))
@@ -80,6 +103,8 @@ def main() -> None:
         msg, now = utils.check_time("Ready", now)
         utils.msg(msg)
 
+    app.root.after_idle(lambda: startup.report())
+
     try:
         app.run()
     except KeyboardInterrupt:
@@ -88,7 +113,10 @@ def main() -> None:
         utils.error(e)
 
     try:
-        model.unload()
+        listener.stop()
+        completion.flush()
+        model.unload(release=True)
+        prompt_cache.close()
     except KeyboardInterrupt:
         pass
     except BaseException as e:
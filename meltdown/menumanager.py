@@ -104,6 +104,8 @@ class ModelMenu:
         )
 
         self.menu.add("Browse", lambda e: modelcontrol.browse())
+        self.menu.add("Library", lambda e: self.show_library())
+        self.menu.add("Resident", lambda e: self.show_resident())
 
         self.menu.separator()
 
@@ -117,6 +119,67 @@ class ModelMenu:
             widget = MenuManager.get_model_button()
             self.menu.show(widget=widget)
 
+    def show_library(self) -> None:
+        from pathlib import Path
+        from .display import display
+        from .library import library
+
+        # The header info goes in the tooltip so the filter can match it
+        menu = Menu()
+        entries = library.get_entries()
+
+        for path, entry in entries:
+            info = library.describe(entry)
+
+            menu.add(
+                text=Path(path).name,
+                command=lambda e, path=path: modelcontrol.set(path),
+                tooltip=f"{info}\n{path}" if info else path,
+            )
+
+        # Pick up new or changed files for the next time
+        library.scan()
+
+        if not entries:
+            display.print("Scanning models...")
+            return
+
+        menu.show(widget=MenuManager.get_model_button())
+
+    def show_resident(self) -> None:
+        from pathlib import Path
+        from .model import model
+        from .residency import residency
+
+        # Models kept loaded, most recent first, click to switch to one
+        menu = Menu()
+
+        def use(path: str) -> None:
+            modelcontrol.set(path)
+            model.load()
+
+        def release(key: str, resident: Any) -> None:
+            if resident.model is model.model:
+                model.unload()
+
+            residency.remove(key)
+
+        for key, resident in residency.items():
+            gb = resident.size / 1024 / 1024 / 1024
+
+            menu.add(
+                text=f"{Path(resident.path).name} ({gb:.1f} GB)",
+                command=lambda e, path=resident.path: use(path),
+                alt_command=lambda e, key=key, res=resident: release(key, res),
+                underline=resident.model is model.model,
+                tooltip=key,
+            )
+
+        if not menu.items:
+            menu.add("No resident models", disabled=True)
+
+        menu.show(widget=MenuManager.get_model_button())
+
 
 class OpenAIMenu:
     def __init__(self, parent: MenuManager) -> None:
@@ -4,13 +4,8 @@ from __future__ import annotations
 import base64
 import threading
 from pathlib import Path
-from typing import Any
-from collections.abc import Generator
-
-# Libraries
-import requests  # type: ignore
-from openai import OpenAI, RateLimitError  # type: ignore
-from openai.types.chat.chat_completion import ChatCompletion  # type: ignore
+from typing import Any, TYPE_CHECKING
+from collections.abc import Generator, Callable
 
 # Modules
 from .app import app
@@ -20,19 +15,26 @@ from .display import display
 from .tips import tips
 from .utils import utils
 from .files import files
-from .session import Item
+from .item import Item
 from .variables import variables
-
-# Try Import
-llama_cpp = utils.try_import("llama_cpp")
-
-if llama_cpp:
-    Llama = llama_cpp.Llama
-    ChatCompletionChunk = llama_cpp.ChatCompletionChunk
-    Llava15ChatHandler = llama_cpp.llama_chat_format.Llava15ChatHandler
+from .events import events
+from .resources import resources
+from .residency import residency
+from .draft import Draft
+from .library import library
+from .promptcache import prompt_cache
+from .responsecache import response_cache
+from .remote import remote, RemoteStream, ClientGetter
+from .network import network
+from .ratelimit import rate_limiter
+
+if TYPE_CHECKING:
+    from openai.types.chat.chat_completion import ChatCompletion  # type: ignore
+    from llama_cpp import ChatCompletionChunk  # type: ignore
 
 
 PromptArg = dict[str, Any]
+StreamHook = Callable[[str, str, bool], None]
 
 
 class Model:
@@ -43,7 +45,7 @@ class Model:
         self.stream_thread = threading.Thread()
         self.streaming = False
         self.stream_loading = False
-        self.model: Llama | None = None  # type: ignore
+        self.model: Any = None
         self.model_loading = False
         self.loaded_model = ""
         self.loaded_format = ""
@@ -51,8 +53,11 @@ class Model:
         self.load_thread = threading.Thread()
         self.stream_date = 0.0
         self.openai_client = None
+        self.remote_client: ClientGetter | None = None
+        self.remote_stream: RemoteStream | None = None
         self.last_response = ""
         self.icon_text = ""
+        self.stream_hooks: list[StreamHook] = []
 
         kerr = "Use the model menu to set it."
         self.openai_key_error = f"Error: OpenAI API key not found. {kerr}"
@@ -77,7 +82,7 @@ class Model:
         self.update_icon()
         self.start_auto_unload()
 
-    def unload(self, announce: bool = False) -> None:
+    def unload(self, announce: bool = False, release: bool = False) -> None:
         if self.model_loading:
             return
 
@@ -87,6 +92,10 @@ class Model:
             msg = "Model unloaded"
             display.print(utils.emoji_text(msg, "unloaded"))
 
+        # Otherwise the local model stays resident to switch back to it
+        if release or (not residency.enabled()):
+            residency.clear()
+
         self.clear_model()
 
     def model_is_gpt(self, name: str) -> bool:
@@ -134,6 +143,9 @@ class Model:
             display.print("Error: Model not found. Check the path.", tab_id=tab_id)
             return
 
+        if self.load_resident(tab_id, prompt):
+            return
+
         def wrapper() -> None:
             if not self.load_local(self.get_model(), tab_id):
                 return
@@ -147,14 +159,95 @@ class Model:
         self.load_thread.daemon = True
         self.load_thread.start()
 
+    def get_resident_key(self, model: str) -> str:
+        # A model loaded with other settings can't be reused
+        values = [
+            model,
+            config.format,
+            config.context,
+            config.threads,
+            config.gpu_layers,
+            config.mlock,
+            config.logits,
+            config.mode == "image",
+            config.draft,
+            config.batch,
+            config.ubatch,
+        ]
+
+        return "|".join(str(value) for value in values)
+
+    def get_context(self, model: str) -> int:
+        # 0 means the model's own context, capped to keep memory in check
+        info = library.get_info(model)
+        trained = info["context"] if info else 0
+
+        if config.context <= 0:
+            return min(trained or config.default_context, args.auto_context)
+
+        if trained:
+            return min(config.context, trained)
+
+        return config.context
+
+    def load_resident(self, tab_id: str, prompt: PromptArg | None = None) -> bool:
+        model = self.get_model()
+        resident = residency.get(self.get_resident_key(model))
+
+        if not resident:
+            return False
+
+        self.unload()
+        now = utils.now()
+        self.model = resident.model
+        self.set_loaded(model, config.format, "local")
+        self.stream_date = now
+        self.after_load(now)
+
+        if prompt:
+            self.stream(prompt, tab_id)
+
+        return True
+
+    def set_draft(self, value: str | None = None) -> None:
+        if not value:
+            draft = self.get_draft()
+            stats = draft.get_stats() if draft else None
+            text = f"Draft: {config.draft or 'off'}"
+
+            # From the last response
+            if stats:
+                text += f"\n{Draft.describe(stats)}"
+
+            display.print(text)
+            return
+
+        if value in ("off", "none"):
+            value = ""
+
+        config.set("draft", files.clean_path(value), prints=True)
+
+    def get_draft(self) -> Draft | None:
+        draft = getattr(self.model, "draft_model", None)
+        return draft if isinstance(draft, Draft) else None
+
     def clear_model(self) -> None:
         self.model = None
-        self.loaded_model = ""
-        self.loaded_type = ""
-        self.model_loading = False
-        self.loaded_format = ""
         self.stream_date = 0.0
+        self.set_loaded("", "", "")
+
+    def set_loading(self, loading: bool) -> None:
+        # The buttons follow the "model" event, so every change publishes it
+        self.model_loading = loading
+        events.publish("model")
+
+    def set_loaded(self, model: str, fmt: str, kind: str) -> None:
+        self.model_loading = False
+        self.loaded_model = model
+        self.loaded_format = fmt
+        self.loaded_type = kind
         self.update_icon()
+        events.publish("model")
 
     def read_openai_key(self) -> None:
         from .paths import paths
@@ -184,11 +277,9 @@ class Model:
 
         try:
             now = utils.now()
-            self.openai_client = OpenAI(api_key=self.openai_key)
-            self.model_loading = False
-            self.loaded_model = self.get_model()
-            self.loaded_format = "openai"
-            self.loaded_type = "remote"
+            self.openai_client = network.get_client(self.openai_key)
+            self.remote_client = self.get_remote_client(self.openai_key)
+            self.set_loaded(self.get_model(), "openai", "remote")
             self.after_load(now, quiet=quiet)
 
             if prompt:
@@ -200,6 +291,10 @@ class Model:
 
         return True
 
+    def get_remote_client(self, key: str, base_url: str = "") -> ClientGetter:
+        # Streams make the client on the remote loop, where it's used
+        return lambda: network.get_async_client(key, base_url)
+
     def load_google(
         self, tab_id: str, prompt: PromptArg | None = None, quiet: bool = False
     ) -> bool:
@@ -212,16 +307,10 @@ class Model:
 
         try:
             now = utils.now()
-
-            self.openai_client = OpenAI(
-                api_key=self.google_key,
-                base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-            )
-
-            self.model_loading = False
-            self.loaded_model = self.get_model()
-            self.loaded_format = "google"
-            self.loaded_type = "remote"
+            base_url = "https://generativelanguage.googleapis.com/v1beta/openai/"
+            self.openai_client = network.get_client(self.google_key, base_url)
+            self.remote_client = self.get_remote_client(self.google_key, base_url)
+            self.set_loaded(self.get_model(), "google", "remote")
             self.after_load(now, quiet=quiet)
 
             if prompt:
@@ -236,79 +325,132 @@ class Model:
     def load_local(self, model: str, tab_id: str, quiet: bool = False) -> bool:
         from .app import app
 
+        llama_cpp = utils.try_import("llama_cpp")
+
         if not llama_cpp:
             self.no_llama_error()
             return False
 
-        self.model_loading = True
+        self.set_loading(True)
         now = utils.now()
         chat_format = config.format
+        key = self.get_resident_key(model)
+        chat_handler = None
 
-        try:
-            chat_handler = None
-
-            if config.logits == "all":
-                logits_all = True
-            else:
-                logits_all = False
-
-            if config.mode == "image":
-                mmproj = Path(Path(model).parent / "mmproj.gguf")
+        if config.mode == "image":
+            chat_handler = self.get_chat_handler(llama_cpp, model)
 
-                if not mmproj.exists():
-                    display.print(
-                        "Error: mmproj.gguf not found."
-                        " It must be in the same directory as the model.",
-                    )
+            if not chat_handler:
+                self.set_loading(False)
+                return False
 
-                    self.model_loading = False
-                    return False
+        fmt = config.format if (chat_format != "auto") else None
+        display.to_bottom(tab_id)
 
-                chat_handler = Llava15ChatHandler(clip_model_path=str(mmproj))
+        if args.model_feedback and (not args.quiet):
+            msg = f"Loading {Path(model).name}"
+            display.print(utils.emoji_text(msg, "loading"), tab_id=tab_id)
 
-            fmt = config.format if (chat_format != "auto") else None
-            name = Path(model).name
-            mlock = config.mlock == "yes"
-            display.to_bottom(tab_id)
-
-            if args.model_feedback and (not args.quiet):
-                msg = f"Loading {name}"
-                display.print(utils.emoji_text(msg, "loading"), tab_id=tab_id)
+        app.update()
+        self.lock.acquire()
+        residency.make_room(model)
+        context = self.get_context(model)
+        extra = self.get_load_options(llama_cpp, context)
 
-            app.update()
-            self.lock.acquire()
+        if extra is None:
+            self.load_failed()
+            return False
 
-            self.model = Llama(
+        try:
+            self.model = llama_cpp.Llama(
                 model_path=model,
-                n_ctx=config.context,
+                n_ctx=context,
                 n_threads=config.threads,
                 n_gpu_layers=config.gpu_layers,
-                use_mlock=mlock,
+                n_batch=config.batch,
+                use_mlock=config.mlock == "yes",
                 chat_format=fmt,
                 chat_handler=chat_handler,
-                logits_all=logits_all,
+                logits_all=config.logits == "all",
                 verbose=args.verbose,
+                **extra,
             )
         except BaseException as e:
             utils.error(e)
-            display.print("Error: Model failed to load.")
-            self.clear_model()
-            self.release_lock()
+            self.load_failed(extra.get("draft_model"))
             return False
 
-        self.model_loading = False
-        self.loaded_model = model
-        self.loaded_format = chat_format
-        self.loaded_type = "local"
+        self.set_prompt_cache(model, chat_format, context)
+        self.set_loaded(model, chat_format, "local")
+        residency.add(key, model, self.model)
         self.after_load(now, quiet=quiet)
         self.release_lock()
         return True
 
+    def get_chat_handler(self, llama_cpp: Any, model: str) -> Any:
+        mmproj = Path(Path(model).parent / "mmproj.gguf")
+
+        if not mmproj.exists():
+            display.print(
+                "Error: mmproj.gguf not found."
+                " It must be in the same directory as the model.",
+            )
+
+            return None
+
+        handlers = llama_cpp.llama_chat_format
+
+        try:
+            return handlers.Llava15ChatHandler(clip_model_path=str(mmproj))
+        except BaseException as e:
+            utils.error(e)
+            display.print("Error: Model failed to load.")
+            return None
+
+    def get_load_options(self, llama_cpp: Any, context: int) -> dict[str, Any] | None:
+        # Only passed when used
+        extra: dict[str, Any] = {}
+
+        if config.ubatch > 0:
+            extra["n_ubatch"] = config.ubatch
+
+        # Speculative decoding
+        try:
+            draft = Draft.make(llama_cpp, config.draft, context)
+        except BaseException as e:
+            utils.error(e)
+            return None
+
+        if draft:
+            extra["draft_model"] = draft
+
+        return extra
+
+    def set_prompt_cache(self, model: str, chat_format: str, context: int) -> None:
+        if not self.model:
+            return
+
+        try:
+            cache = prompt_cache.get_cache(self.model, model, chat_format, context)
+
+            if cache:
+                self.model.set_cache(cache)
+        except BaseException as e:
+            utils.error(e)
+
+    def load_failed(self, draft: Draft | None = None) -> None:
+        display.print("Error: Model failed to load.")
+
+        # The draft model was loaded on its own
+        if draft:
+            draft.close()
+
+        self.clear_model()
+        self.release_lock()
+
     def after_load(self, start_date: float, quiet: bool = False) -> None:
         from .system import system
 
-        self.update_icon()
-
         if args.model_feedback and (not args.quiet) and (not quiet):
             if self.loaded_type == "local":
                 text = utils.emoji_text("Model loaded", "local")
@@ -325,24 +467,37 @@ class Model:
         return self.model_loading or self.stream_loading
 
     def stop_stream(self) -> None:
+        # Queued prompts would start right after the stopped one
+        rate_limiter.clear()
+
         if self.stop_stream_thread.is_set():
             return
 
         if self.stream_thread and self.stream_thread.is_alive():
             self.stop_stream_thread.set()
+
+            # Remote streams end as soon as they're cancelled
+            if self.remote_stream:
+                self.remote_stream.cancel()
+
             self.stream_thread.join(timeout=3)
 
             if args.model_feedback and (not args.quiet):
                 display.print("< Interrupted >")
 
     def stream(self, prompt: PromptArg, tab_id: str | None = None) -> None:
+        if not tab_id:
+            tab_id = display.current_tab
+
+        # Wait for the turn instead of interrupting a rate limited prompt
+        if rate_limiter.should_queue(self.loaded_type):
+            rate_limiter.add(prompt, tab_id)
+            return
+
         if self.is_loading():
             utils.msg("(Stream) Slow down!")
             return
 
-        if not tab_id:
-            tab_id = display.current_tab
-
         tabconvo = display.get_tab_convo(tab_id)
 
         if not tabconvo:
@@ -368,9 +523,13 @@ class Model:
         def wrapper(prompt: dict[str, str], tab_id: str) -> None:
             self.stop_stream_thread.clear()
             self.streaming = True
-            app.do_checks()
+            events.publish("stream_start")
             self.do_stream(prompt, tab_id)
+            self.remote_stream = None
             self.streaming = False
+            events.publish("stream_end")
+            self.run_stream_hooks(tab_id, "", True)
+            rate_limiter.next()
 
         self.stop_stream()
         self.stream_thread = threading.Thread(target=lambda: wrapper(prompt, tab_id))
@@ -533,6 +692,16 @@ class Model:
         self.stream_loading = True
         self.lock.acquire()
 
+        remote = self.model_is_gpt(self.get_model()) or self.model_is_gemini(
+            self.get_model()
+        )
+
+        resources.start(remote)
+        draft = None if remote else self.get_draft()
+
+        if draft:
+            draft.reset()
+
         gen_config = {
             "messages": messages,
             "stream": args.stream,
@@ -553,24 +722,24 @@ class Model:
             gen_config["max_tokens"] = config.max_tokens
             del gen_config["model"]
 
-        if self.model_is_gpt(self.get_model()) or self.model_is_gemini(
-            self.get_model()
-        ):
-            try:
-                if not self.openai_client:
-                    self.stream_loading = False
-                    self.release_lock()
-                    return
+        cache_key = ""
+        cached = None
 
-                output = self.openai_client.chat.completions.create(
-                    **gen_config, timeout=10
-                )
-            except RateLimitError as e:
-                utils.error(e)
-                display.print("Error: Rate limit exceeded.")
+        if response_cache.cacheable(gen_config):
+            fmt = self.loaded_format
+            cache_key = response_cache.get_key(self.loaded_model, fmt, gen_config)
+            cached = response_cache.get(cache_key)
+
+        if cached is not None:
+            output = response_cache.get_output(cached)
+        elif remote:
+            if not self.remote_client:
                 self.stream_loading = False
                 self.release_lock()
                 return
+
+            try:
+                output = self.start_remote(gen_config, tab_id)
             except BaseException as e:
                 utils.error(e)
 
@@ -584,6 +753,11 @@ class Model:
                 self.stream_loading = False
                 self.release_lock()
                 return
+
+            if output is None:
+                self.stream_loading = False
+                self.release_lock()
+                return
         else:
             if not self.model:
                 self.stream_loading = False
@@ -620,11 +794,25 @@ class Model:
 
         res = ans.strip()
         now_2 = utils.now()
+        profile = resources.stop()
+        draft_stats = draft.get_stats() if draft else None
+        stopped = self.stop_stream_thread.is_set()
+
+        if draft_stats:
+            profile = profile or {}
+            profile["draft"] = draft_stats
+
+        if cached is not None:
+            profile = profile or {}
+            profile["cached"] = True
+        elif cache_key and res and (not stopped):
+            response_cache.put(cache_key, res)
 
         if res:
             duration = now_2 - now
             convo_item.ai = res
             convo_item.duration = duration
+            convo_item.resources = profile
             tabconvo.convo.update()
             self.last_response = res
 
@@ -632,9 +820,49 @@ class Model:
                 word = utils.singular_or_plural(duration, "second", "seconds")
                 display.print(f"Duration: {duration:.2f} {word}", tab_id=tab_id)
 
+                if draft_stats:
+                    display.print(Draft.describe(draft_stats), tab_id=tab_id)
+
+                if cached is not None:
+                    display.print("Cached response", tab_id=tab_id)
+
         self.stream_date = now_2
         self.release_lock()
 
+    def start_remote(self, gen_config: dict[str, Any], tab_id: str) -> Any:
+        from openai import RateLimitError  # type: ignore
+
+        get_client = self.remote_client
+
+        if not get_client:
+            return None
+
+        provider = self.loaded_format
+        cost = rate_limiter.get_cost(gen_config)
+        attempt = 0
+
+        def on_headers(headers: Any) -> None:
+            rate_limiter.update(provider, headers)
+
+        while True:
+            if not rate_limiter.wait(provider, cost, tab_id, self.stop_stream_thread):
+                return None
+
+            try:
+                # Waits for the response to start, the chunks come after
+                self.remote_stream = remote.stream(get_client, gen_config, on_headers)
+
+                return self.remote_stream.wait()
+            except RateLimitError as e:
+                utils.error(e)
+                attempt += 1
+
+                if attempt > args.rate_limit_retries:
+                    display.print("Error: Rate limit exceeded.", tab_id=tab_id)
+                    return None
+
+                rate_limiter.backoff(provider, attempt, e)
+
     def process_stream(
         self,
         output: Generator[ChatCompletionChunk, None, None],  # type: ignore
@@ -652,7 +880,9 @@ class Model:
             if not len(buffer):
                 return
 
-            display.insert("".join(buffer), tab_id=tab_id)
+            text = "".join(buffer)
+            display.insert(text, tab_id=tab_id)
+            self.run_stream_hooks(tab_id, text, False)
             buffer.clear()
 
         try:
@@ -708,15 +938,19 @@ class Model:
             response = output.choices[0].message.content.strip()
 
             if response:
-                display.remove_last_ai(tab_id)
-                display.prompt("ai", tab_id=tab_id)
-                display.insert(response, tab_id=tab_id)
+                self.show_instant(response, tab_id)
                 return str(response)
         except BaseException as e:
             utils.error(e)
 
         return ""
 
+    def show_instant(self, response: str, tab_id: str) -> None:
+        display.remove_last_ai(tab_id)
+        display.prompt("ai", tab_id=tab_id)
+        display.insert(response, tab_id=tab_id)
+        self.run_stream_hooks(tab_id, response, False)
+
     def generate_image(self, prompt: str, tab_id: str | None = None) -> None:
         if not prompt.strip():
             return
@@ -730,9 +964,10 @@ class Model:
         def wrapper(prompt: str, tab_id: str) -> None:
             self.stop_stream_thread.clear()
             self.streaming = True
-            app.do_checks()
+            events.publish("stream_start")
             self.do_generate_image(prompt, tab_id)
             self.streaming = False
+            events.publish("stream_end")
 
         self.stop_stream()
         self.stream_thread = threading.Thread(target=lambda: wrapper(prompt, tab_id))
@@ -801,7 +1036,7 @@ class Model:
             return
 
         if self.loaded_model:
-            self.unload(True)
+            self.unload(True, release=True)
         else:
             self.load()
 
@@ -911,6 +1146,8 @@ class Model:
             return None
 
     def release_lock(self) -> None:
+        resources.stop()
+
         if self.lock.locked():
             self.lock.release()
 
@@ -919,7 +1156,8 @@ class Model:
 
         if utils.is_url(path):
             try:
-                response = requests.get(path, timeout=5)
+                session = network.get_session()
+                response = session.get(path, timeout=network.get_timeout())
 
                 if response.status_code == 200:
                     text = str(response.text)
@@ -998,7 +1236,7 @@ class Model:
                 minutes = seconds / 60
 
                 if minutes >= args.auto_unload:
-                    self.unload()
+                    self.unload(release=True)
 
             utils.sleep(10)
 
@@ -1016,6 +1254,21 @@ class Model:
 
         return False
 
+    def add_stream_hook(self, hook: StreamHook) -> None:
+        if hook not in self.stream_hooks:
+            self.stream_hooks.append(hook)
+
+    def remove_stream_hook(self, hook: StreamHook) -> None:
+        if hook in self.stream_hooks:
+            self.stream_hooks.remove(hook)
+
+    def run_stream_hooks(self, tab_id: str, text: str, done: bool) -> None:
+        for hook in list(self.stream_hooks):
+            try:
+                hook(tab_id, text, done)
+            except BaseException as e:
+                utils.error(e)
+
     def get_model(self) -> str:
         return variables.replace_variables(config.model)
 
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+# Standard
+import asyncio
+import threading
+import http.cookiejar
+from typing import Any
+
+# Modules
+from .utils import utils
+
+
+# One connection pool for each http library, shared by every remote feature
+# so repeated requests reuse the open connections instead of new handshakes
+
+
+class Network:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.connect_timeout = 5.0
+        self.read_timeout = 60.0
+        self.max_connections = 20
+        self.keepalive = 10
+        self.keepalive_expiry = 60.0
+        self.adapter: Any = None
+        self.session: Any = None
+        self.http_client: Any = None
+        self.async_http_clients: dict[asyncio.AbstractEventLoop, Any] = {}
+        self.clients: dict[tuple[str, str], Any] = {}
+        self.async_clients: dict[tuple[str, str, asyncio.AbstractEventLoop], Any] = {}
+
+    def get_timeout(self) -> tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    def get_httpx_options(self) -> dict[str, Any]:
+        import httpx  # type: ignore
+
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+        # Http/2 needs the h2 package
+        http2 = bool(utils.try_import("h2"))
+        return {"timeout": timeout, "limits": limits, "http2": http2}
+
+    def get_adapter(self) -> Any:
+        from requests.adapters import HTTPAdapter  # type: ignore
+
+        with self.lock:
+            if not self.adapter:
+                self.adapter = HTTPAdapter(
+                    pool_connections=self.keepalive,
+                    pool_maxsize=self.max_connections,
+                )
+
+            return self.adapter
+
+    def mount(self, session: Any) -> None:
+        # Sessions with their own headers or cookies can still share the pool
+        adapter = self.get_adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def get_session(self) -> Any:
+        import requests  # type: ignore
+
+        if self.session:
+            return self.session
+
+        session = requests.Session()
+        self.mount(session)
+
+        # Many unrelated hosts share the session, none of them get cookies
+        session.cookies.set_policy(
+            http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+        )
+
+        with self.lock:
+            if not self.session:
+                self.session = session
+
+            return self.session
+
+    def get_client(self, key: str, base_url: str = "") -> Any:
+        import httpx  # type: ignore
+        from openai import OpenAI  # type: ignore
+
+        with self.lock:
+            if not self.http_client:
+                self.http_client = httpx.Client(**self.get_httpx_options())
+
+            name = (key, base_url)
+
+            if name not in self.clients:
+                self.clients[name] = OpenAI(
+                    api_key=key,
+                    base_url=base_url or None,
+                    http_client=self.http_client,
+                )
+
+            return self.clients[name]
+
+    def get_async_client(self, key: str, base_url: str = "") -> Any:
+        import httpx  # type: ignore
+        from openai import AsyncOpenAI  # type: ignore
+
+        # The pool belongs to the loop it runs on, so it's called from there
+        loop = asyncio.get_running_loop()
+
+        with self.lock:
+            self.forget_loops()
+
+            if loop not in self.async_http_clients:
+                options = self.get_httpx_options()
+                self.async_http_clients[loop] = httpx.AsyncClient(**options)
+
+            name = (key, base_url, loop)
+
+            if name not in self.async_clients:
+                self.async_clients[name] = AsyncOpenAI(
+                    api_key=key,
+                    base_url=base_url or None,
+                    http_client=self.async_http_clients[loop],
+                )
+
+            return self.async_clients[name]
+
+    def forget_loops(self) -> None:
+        # Clients of closed loops can't be used anymore
+        for loop in list(self.async_http_clients):
+            if not loop.is_closed():
+                continue
+
+            del self.async_http_clients[loop]
+
+            for name in list(self.async_clients):
+                if name[2] is loop:
+                    del self.async_clients[name]
+
+
+network = Network()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+# Modules
+from .utils import utils
+
+
+class NgramIndex:
+    def __init__(self, size: int = 2) -> None:
+        self.size = size
+        self.items: dict[str, int] = {}
+        self.grams: dict[str, set[str]] = {}
+        self.counter = 0
+
+        # Below this ratio two names might match without sharing a padded
+        # bigram ("ab" and "ba"), so the index can't be used to filter
+        self.safe_threshold = 2 / 3
+
+    def get_grams(self, text: str) -> set[str]:
+        padded = f"^{text}$"
+        size = self.size
+        return {padded[i : i + size] for i in range(len(padded) - size + 1)}
+
+    def add(self, item: str) -> None:
+        if item in self.items:
+            return
+
+        # Keep the insertion order so ties resolve like a linear scan
+        self.items[item] = self.counter
+        self.counter += 1
+
+        for gram in self.get_grams(item):
+            if gram not in self.grams:
+                self.grams[gram] = set()
+
+            self.grams[gram].add(item)
+
+    def remove(self, item: str) -> None:
+        if item not in self.items:
+            return
+
+        del self.items[item]
+
+        for gram in self.get_grams(item):
+            items = self.grams.get(gram)
+
+            if not items:
+                continue
+
+            items.discard(item)
+
+            if not items:
+                del self.grams[gram]
+
+    def set_items(self, items: list[str]) -> None:
+        self.items = {}
+        self.grams = {}
+        self.counter = 0
+
+        for item in items:
+            self.add(item)
+
+    def candidates(self, text: str) -> list[str]:
+        from .config import config
+
+        if config.similar_threshold < self.safe_threshold:
+            return list(self.items)
+
+        found: set[str] = set()
+
+        for gram in self.get_grams(text):
+            found.update(self.grams.get(gram, ()))
+
+        # Skip names whose length alone keeps the ratio under the threshold
+        length = len(text)
+        threshold = config.similar_threshold
+        items = []
+
+        for item in found:
+            most = 2 * min(length, len(item)) / (length + len(item))
+
+            if most >= threshold:
+                items.append(item)
+
+        items.sort(key=lambda item: self.items[item])
+        return items
+
+    def most_similar(self, text: str) -> str | None:
+        return utils.most_similar(text, self.candidates(text))
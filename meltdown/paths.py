@@ -28,6 +28,12 @@ class Paths:
         self.google_key: Path
         self.errors: Path
         self.nouns: Path
+        self.startup: Path
+        self.session_index: Path
+        self.tune: Path
+        self.model_library: Path
+        self.prompt_cache: Path
+        self.response_cache: Path
 
     def error(self, what: str) -> None:
         utils.msg(f"Error: Can't find or create the '{what}' directory.")
@@ -75,6 +81,12 @@ class Paths:
         self.models = Path(self.data_dir, "models.json")
         self.systems = Path(self.data_dir, "systems.json")
         self.memory = Path(self.data_dir, "memory.json")
+        self.startup = Path(self.data_dir, "startup.json")
+        self.session_index = Path(self.data_dir, "session_index.json")
+        self.tune = Path(self.data_dir, "tune.json")
+        self.model_library = Path(self.data_dir, "model_library.json")
+        self.prompt_cache = Path(self.data_dir, "prompt_cache")
+        self.response_cache = Path(self.data_dir, "response_cache")
 
         if args.logs_dir:
             self.logs = Path(args.logs_dir)
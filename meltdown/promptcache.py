@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+# Standard
+import time
+import array
+import pickle
+import hashlib
+import weakref
+import threading
+from pathlib import Path
+from typing import Any
+from collections.abc import Sequence
+
+# Modules
+from .args import args
+from .paths import paths
+from .utils import utils
+from .files import files
+
+
+# Saves the llama.cpp state after each response so the evaluation of a long
+# prompt can be picked up again after a restart, instead of starting over
+# States are matched by blocks of tokens, each block hash chains the previous ones
+
+
+class LlamaCache:
+    # Passed to Llama.set_cache, one for each loaded model
+    def __init__(self, llama: Any, key: str) -> None:
+        self.llama = weakref.ref(llama)
+        self.key = key
+
+    @property
+    def cache_size(self) -> int:
+        return prompt_cache.get_size()
+
+    def get_loaded(self, tokens: Sequence[int]) -> int:
+        # Tokens of the prompt that are already in the context
+        llama = self.llama()
+
+        if not llama:
+            return 0
+
+        loaded = llama.input_ids[: llama.n_tokens].tolist()
+        size = prompt_cache.block_size
+        num = 0
+
+        while (num + size <= len(loaded)) and (num + size <= len(tokens)):
+            if loaded[num : num + size] != list(tokens[num : num + size]):
+                break
+
+            num += size
+
+        return num
+
+    def __contains__(self, tokens: Sequence[int]) -> bool:
+        return bool(prompt_cache.find(self.key, tokens)[0])
+
+    def __getitem__(self, tokens: Sequence[int]) -> Any:
+        name, matched = prompt_cache.find(self.key, tokens)
+
+        # Reading it would be slower than what's already evaluated
+        if (not name) or (matched <= self.get_loaded(tokens)):
+            prompt_cache.misses += 1
+            raise KeyError(name)
+
+        state = prompt_cache.read(name)
+
+        if state is None:
+            prompt_cache.misses += 1
+            raise KeyError(name)
+
+        prompt_cache.hits += 1
+        return state
+
+    def __setitem__(self, tokens: Sequence[int], state: Any) -> None:
+        prompt_cache.write(self.key, tokens, state)
+
+
+class PromptCache:
+    def __init__(self) -> None:
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.loaded = False
+        self.lock = threading.Lock()
+        self.pending: dict[str, tuple[list[str], int, Any]] = {}
+        self.wake = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.writing = False
+        self.block_size = 64
+        self.min_tokens = 256
+        self.hits = 0
+        self.misses = 0
+
+    def get_index(self) -> Path:
+        return Path(paths.prompt_cache, "index.json")
+
+    def load(self) -> None:
+        self.loaded = True
+        path = self.get_index()
+
+        if not (path.exists() and path.is_file()):
+            return
+
+        try:
+            self.entries = files.load(path)
+        except BaseException as e:
+            utils.error(e)
+            self.entries = {}
+
+        # Drop the entries whose files are gone
+        for name in list(self.entries):
+            if not Path(paths.prompt_cache, name).exists():
+                del self.entries[name]
+
+    def save(self) -> None:
+        try:
+            paths.prompt_cache.mkdir(parents=True, exist_ok=True)
+            files.save(self.get_index(), self.entries)
+        except BaseException as e:
+            utils.error(e)
+
+    def get_cache(self, llama: Any, model: str, fmt: str, context: int) -> Any:
+        if not args.prompt_cache:
+            return None
+
+        try:
+            model_hash = files.get_hash(Path(model))
+        except BaseException as e:
+            utils.error(e)
+            return None
+
+        with self.lock:
+            if not self.loaded:
+                self.load()
+
+        return LlamaCache(llama, f"{model_hash}|{fmt}|{context}")
+
+    def get_blocks(self, tokens: Sequence[int]) -> list[str]:
+        blocks = []
+        digest = hashlib.blake2b(digest_size=8)
+
+        for i in range(0, len(tokens) - self.block_size + 1, self.block_size):
+            block = array.array("i", tokens[i : i + self.block_size])
+            digest.update(block.tobytes())
+            blocks.append(digest.copy().hexdigest())
+
+        return blocks
+
+    def get_size(self) -> int:
+        with self.lock:
+            return sum(entry["size"] for entry in self.entries.values())
+
+    def find(self, key: str, tokens: Sequence[int]) -> tuple[str, int]:
+        # The entry that shares the most blocks with the tokens
+        blocks = self.get_blocks(tokens)
+        name = ""
+        best = 0
+
+        with self.lock:
+            for entry_name, entry in self.entries.items():
+                if entry["key"] != key:
+                    continue
+
+                matched = 0
+
+                for a, b in zip(entry["blocks"], blocks, strict=False):
+                    if a != b:
+                        break
+
+                    matched += 1
+
+                if matched > best:
+                    name = entry_name
+                    best = matched
+
+        return name, best * self.block_size
+
+    def read(self, name: str) -> Any:
+        path = Path(paths.prompt_cache, name)
+
+        try:
+            with path.open("rb") as file:
+                state = pickle.load(file)
+        except BaseException as e:
+            utils.error(e)
+            self.remove(name)
+            return None
+
+        with self.lock:
+            if name in self.entries:
+                self.entries[name]["used"] = time.time()
+
+        return state
+
+    def write(self, key: str, tokens: Sequence[int], state: Any) -> None:
+        if len(tokens) < self.min_tokens:
+            return
+
+        blocks = self.get_blocks(tokens)
+
+        # Only the latest state of each model waits to be written
+        with self.lock:
+            self.pending[key] = (blocks, len(tokens), state)
+            self.writing = True
+
+        if not (self.thread and self.thread.is_alive()):
+            self.thread = threading.Thread(target=lambda: self.run())
+            self.thread.daemon = True
+            self.thread.start()
+
+        self.wake.set()
+
+    def run(self) -> None:
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+
+            while True:
+                with self.lock:
+                    if not self.pending:
+                        self.writing = False
+                        break
+
+                    key = next(iter(self.pending))
+                    blocks, num_tokens, state = self.pending.pop(key)
+                    self.writing = True
+
+                self.do_write(key, blocks, num_tokens, state)
+
+    def do_write(
+        self, key: str, blocks: list[str], num_tokens: int, state: Any
+    ) -> None:
+        digest = hashlib.blake2b(f"{key}|{blocks[-1]}".encode(), digest_size=16)
+        name = f"{digest.hexdigest()}.state"
+        directory = paths.prompt_cache
+        path = Path(directory, name)
+        temp = path.with_suffix(".tmp")
+
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+
+            with temp.open("wb") as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            temp.replace(path)
+            size = path.stat().st_size
+        except BaseException as e:
+            utils.error(e)
+            temp.unlink(missing_ok=True)
+            return
+
+        removed = []
+
+        with self.lock:
+            # A state that continues an older one makes it useless
+            for old_name, entry in list(self.entries.items()):
+                if old_name == name or entry["key"] != key:
+                    continue
+
+                if blocks[: len(entry["blocks"])] == entry["blocks"]:
+                    removed.append(old_name)
+                    del self.entries[old_name]
+
+            self.entries[name] = {
+                "key": key,
+                "tokens": num_tokens,
+                "blocks": blocks,
+                "size": size,
+                "used": time.time(),
+            }
+
+            removed.extend(self.evict())
+
+        for old_name in removed:
+            Path(directory, old_name).unlink(missing_ok=True)
+
+        self.save()
+
+    def evict(self) -> list[str]:
+        # Least recently used first, until it fits
+        limit = args.prompt_cache_size * 1024 * 1024
+        total = sum(entry["size"] for entry in self.entries.values())
+        removed = []
+
+        for name, entry in sorted(self.entries.items(), key=lambda e: e[1]["used"]):
+            if total <= limit:
+                break
+
+            total -= entry["size"]
+            removed.append(name)
+            del self.entries[name]
+
+        return removed
+
+    def remove(self, name: str) -> None:
+        with self.lock:
+            self.entries.pop(name, None)
+
+        Path(paths.prompt_cache, name).unlink(missing_ok=True)
+        self.save()
+
+    def clear(self) -> None:
+        with self.lock:
+            if not self.loaded:
+                self.load()
+
+            names = list(self.entries)
+            self.entries = {}
+            self.pending = {}
+
+        for name in names:
+            Path(paths.prompt_cache, name).unlink(missing_ok=True)
+
+        self.save()
+
+    def close(self) -> None:
+        # Wait for the last state to be written
+        while self.thread and self.thread.is_alive():
+            with self.lock:
+                if (not self.pending) and (not self.writing):
+                    break
+
+            time.sleep(0.1)
+
+    def get_lines(self) -> list[str]:
+        with self.lock:
+            if not self.loaded:
+                self.load()
+
+            num = len(self.entries)
+            tokens = sum(entry["tokens"] for entry in self.entries.values())
+
+        size = self.get_size() / 1024 / 1024
+        limit = args.prompt_cache_size
+        s = utils.singular_or_plural(num, "state", "states")
+
+        lines = [
+            f"Prompt cache: {num} {s}, {tokens} tokens, {size:.0f} of {limit} MB",
+            f"Hits: {self.hits} | Misses: {self.misses}",
+            str(paths.prompt_cache),
+        ]
+
+        if not args.prompt_cache:
+            lines.append("It's disabled, use --prompt-cache to enable it")
+
+        return lines
+
+    def command(self, arg: str | None = None) -> None:
+        from .display import display
+        from .responsecache import response_cache
+
+        # The response cache is shown and cleared along with this one
+        if arg == "clear":
+            self.clear()
+            response_cache.clear()
+            display.print("Caches cleared.")
+            return
+
+        lines = [*self.get_lines(), "", *response_cache.get_lines()]
+        display.print("\n".join(lines))
+
+
+prompt_cache = PromptCache()
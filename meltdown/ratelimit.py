@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+# Standard
+import re
+import time
+import random
+import threading
+from collections import deque
+from typing import Any
+
+# Modules
+from .utils import utils
+
+
+# Keeps remote prompts within the rate limits of each provider
+# The budgets come from the x-ratelimit headers of the responses
+# While a prompt waits for its budget, the next prompts are queued
+
+
+class Bucket:
+    def __init__(self) -> None:
+        self.limit = 0.0
+        self.level = 0.0
+        self.rate = 0.0
+        self.date = 0.0
+
+    def refill(self, now: float) -> None:
+        if self.date:
+            self.level = min(self.limit, self.level + (now - self.date) * self.rate)
+
+        self.date = now
+
+    def update(self, limit: float, remaining: float, reset: float, now: float) -> None:
+        # The bucket is full again when the reset time is over
+        self.limit = limit
+        self.level = remaining
+        self.date = now
+
+        if reset > 0:
+            self.rate = max(limit - remaining, 1) / reset
+        else:
+            self.rate = limit / 60
+
+    def get_wait(self, cost: float, now: float) -> float:
+        # Unknown until the first response tells the limits
+        if (not self.limit) or (not self.rate):
+            return 0.0
+
+        self.refill(now)
+        cost = min(cost, self.limit)
+
+        if self.level >= cost:
+            return 0.0
+
+        return (cost - self.level) / self.rate
+
+    def take(self, cost: float, now: float) -> None:
+        if not self.limit:
+            return
+
+        self.refill(now)
+        self.level -= cost
+
+
+class Budget:
+    def __init__(self) -> None:
+        self.requests = Bucket()
+        self.tokens = Bucket()
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    def __init__(self) -> None:
+        self.budgets: dict[str, Budget] = {}
+        self.queue: deque[tuple[dict[str, Any], str]] = deque()
+        self.lock = threading.Lock()
+        self.waiting = False
+        self.dispatching = False
+        self.base_delay = 1.0
+        self.max_delay = 60.0
+        self.check_delay = 50
+
+    def get_budget(self, provider: str) -> Budget:
+        with self.lock:
+            if provider not in self.budgets:
+                self.budgets[provider] = Budget()
+
+            return self.budgets[provider]
+
+    def get_seconds(self, text: str) -> float:
+        # Like 1s, 6m0s, 20ms, or a plain number of seconds
+        units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+        seconds = 0.0
+
+        for num, unit in re.findall(r"([\d.]+)(ms|s|m|h)", text):
+            seconds += float(num) * units[unit]
+
+        if not seconds:
+            try:
+                seconds = float(text)
+            except ValueError:
+                pass
+
+        return seconds
+
+    def update(self, provider: str, headers: Any) -> None:
+        budget = self.get_budget(provider)
+        now = time.monotonic()
+
+        for name, bucket in (("requests", budget.requests), ("tokens", budget.tokens)):
+            limit = headers.get(f"x-ratelimit-limit-{name}")
+            remaining = headers.get(f"x-ratelimit-remaining-{name}")
+            reset = headers.get(f"x-ratelimit-reset-{name}", "")
+
+            if (limit is None) or (remaining is None):
+                continue
+
+            try:
+                seconds = self.get_seconds(reset)
+
+                with self.lock:
+                    bucket.update(float(limit), float(remaining), seconds, now)
+            except ValueError:
+                continue
+
+    def get_cost(self, gen_config: dict[str, Any]) -> int:
+        # About 4 characters per token, the max tokens count against the limit too
+        chars = 0
+
+        for message in gen_config.get("messages", []):
+            content = message.get("content", "")
+
+            if isinstance(content, str):
+                chars += len(content)
+            else:
+                chars += sum(len(str(item.get("text", ""))) for item in content)
+
+        max_tokens = gen_config.get("max_completion_tokens", 0)
+        return int(chars / 4) + int(max_tokens)
+
+    def get_wait(self, provider: str, cost: int) -> float:
+        budget = self.get_budget(provider)
+        now = time.monotonic()
+
+        with self.lock:
+            return max(
+                budget.blocked_until - now,
+                budget.requests.get_wait(1, now),
+                budget.tokens.get_wait(cost, now),
+            )
+
+    def wait(
+        self, provider: str, cost: int, tab_id: str, stop: threading.Event
+    ) -> bool:
+        # Returns False if the stream was stopped while waiting
+        from .display import display
+
+        wait = self.get_wait(provider, cost)
+
+        if wait > 0:
+            with self.lock:
+                self.waiting = True
+                queued = len(self.queue)
+
+            msg = f"Rate limit: Waiting {wait:.0f}s"
+
+            if queued:
+                msg += f" ({queued} queued)"
+
+            if wait >= 1:
+                display.print(msg, tab_id=tab_id)
+
+            while wait > 0:
+                if stop.wait(min(wait, 1.0)):
+                    self.set_waiting(False)
+                    return False
+
+                wait = self.get_wait(provider, cost)
+
+            self.set_waiting(False)
+
+        budget = self.get_budget(provider)
+        now = time.monotonic()
+
+        with self.lock:
+            budget.requests.take(1, now)
+            budget.tokens.take(cost, now)
+
+        return True
+
+    def backoff(self, provider: str, attempt: int, error: Any) -> None:
+        # Exponential with jitter, or what the server asks for if it's longer
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(delay / 2, delay)
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", {}) or {}
+
+        if headers.get("retry-after-ms"):
+            delay = max(delay, self.get_seconds(headers["retry-after-ms"]) / 1000)
+        elif headers.get("retry-after"):
+            delay = max(delay, self.get_seconds(headers["retry-after"]))
+
+        budget = self.get_budget(provider)
+
+        with self.lock:
+            budget.blocked_until = time.monotonic() + delay
+
+    def set_waiting(self, waiting: bool) -> None:
+        with self.lock:
+            self.waiting = waiting
+
+    def should_queue(self, loaded_type: str) -> bool:
+        if loaded_type != "remote":
+            return False
+
+        with self.lock:
+            if self.dispatching:
+                return False
+
+            return self.waiting or bool(self.queue)
+
+    def add(self, prompt: dict[str, Any], tab_id: str) -> None:
+        from .display import display
+
+        with self.lock:
+            self.queue.append((prompt, tab_id))
+            position = len(self.queue)
+
+        display.print(f"Queued: {position}", tab_id=tab_id)
+
+    def has_queued(self, tab_id: str) -> bool:
+        with self.lock:
+            return any(item[1] == tab_id for item in self.queue)
+
+    def next(self) -> None:
+        from .app import app
+
+        with self.lock:
+            if not self.queue:
+                return
+
+        app.root.after(self.check_delay, lambda: self.dispatch())
+
+    def dispatch(self) -> None:
+        from .app import app
+        from .model import model
+
+        # The last stream is still ending, check again later
+        if model.stream_thread.is_alive():
+            app.root.after(self.check_delay, lambda: self.dispatch())
+            return
+
+        with self.lock:
+            if not self.queue:
+                return
+
+            prompt, tab_id = self.queue.popleft()
+            self.dispatching = True
+
+        try:
+            model.stream(prompt, tab_id)
+        except BaseException as e:
+            utils.error(e)
+        finally:
+            with self.lock:
+                self.dispatching = False
+
+    def clear(self) -> None:
+        with self.lock:
+            # Dispatching a prompt can unload or stop, that's not a cancel
+            if self.dispatching:
+                return
+
+            self.queue.clear()
+
+
+rate_limiter = RateLimiter()
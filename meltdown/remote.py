@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+# Standard
+import queue
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any
+from collections.abc import Iterator, Callable
+
+
+# Remote streams run as tasks on one asyncio loop in its own thread
+# The stream threads read their chunks from a queue, so cancelling a task
+# closes the http response and wakes up the reader right away
+
+
+class Done:
+    pass
+
+
+HeadersAction = Callable[[Any], None]
+ClientGetter = Callable[[], Any]
+
+
+class RemoteStream:
+    def __init__(self, on_headers: HeadersAction | None = None) -> None:
+        self.queue: queue.Queue[Any] = queue.Queue()
+        self.future: concurrent.futures.Future[Any] | None = None
+        self.cancelled = False
+        self.on_headers = on_headers
+
+    async def run(self, get_client: ClientGetter, gen_config: dict[str, Any]) -> None:
+        response = None
+
+        try:
+            # The client is made on the loop that uses it
+            response = await self.request(get_client(), gen_config)
+
+            if not gen_config.get("stream"):
+                self.queue.put(response)
+                return
+
+            # The stream itself marks the start, then the chunks follow
+            self.queue.put(self)
+
+            async for chunk in response:
+                self.queue.put(chunk)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            self.queue.put(e)
+        finally:
+            if response is not None and hasattr(response, "close"):
+                await response.close()
+
+            self.queue.put(Done())
+
+    async def request(self, client: Any, gen_config: dict[str, Any]) -> Any:
+        # The raw response gives the headers too, like the rate limits
+        completions = client.chat.completions.with_raw_response
+        raw = await completions.create(**gen_config)
+
+        if self.on_headers:
+            self.on_headers(raw.headers)
+
+        return await raw.parse()
+
+    def wait(self) -> Any:
+        # The completion, this stream, or None if it was cancelled first
+        item = self.queue.get()
+
+        if isinstance(item, Done):
+            return None
+
+        if isinstance(item, BaseException):
+            raise item
+
+        return item
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self.queue.get()
+
+            if isinstance(item, Done):
+                return
+
+            if isinstance(item, BaseException):
+                raise item
+
+            yield item
+
+    def cancel(self) -> None:
+        if self.cancelled:
+            return
+
+        self.cancelled = True
+
+        if self.future:
+            self.future.cancel()
+
+        # Don't wait for the loop to wake up the reader
+        self.queue.put(Done())
+
+
+class Remote:
+    def __init__(self) -> None:
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+        self.streams: set[RemoteStream] = set()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.loop and self.thread and self.thread.is_alive():
+                return self.loop
+
+            loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=lambda: loop.run_forever())
+            self.thread.daemon = True
+            self.thread.start()
+            self.loop = loop
+            return loop
+
+    def stream(
+        self,
+        get_client: ClientGetter,
+        gen_config: dict[str, Any],
+        on_headers: HeadersAction | None = None,
+    ) -> RemoteStream:
+        # Many streams can share the loop, each one is a task
+        loop = self.start()
+        stream = RemoteStream(on_headers)
+        coro = stream.run(get_client, gen_config)
+        stream.future = asyncio.run_coroutine_threadsafe(coro, loop)
+
+        with self.lock:
+            self.streams.add(stream)
+
+        stream.future.add_done_callback(lambda f: self.forget(stream))
+        return stream
+
+    def forget(self, stream: RemoteStream) -> None:
+        with self.lock:
+            self.streams.discard(stream)
+
+    def cancel_all(self) -> None:
+        with self.lock:
+            streams = list(self.streams)
+
+        for stream in streams:
+            stream.cancel()
+
+
+remote = Remote()
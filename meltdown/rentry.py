@@ -1,23 +1,22 @@
 from __future__ import annotations
 
 # Standard
+import queue
 import threading
 import urllib.parse
 from pathlib import Path
 from http import HTTPStatus
-from typing import Callable
-
-# Libraries
-import requests  # type: ignore
+from typing import Callable, TYPE_CHECKING
 
 # Modules
 from .config import config
+from .utils import utils
 
-
-Action = Callable[[str, str, str], None]
+if TYPE_CHECKING:
+    import requests  # type: ignore
 
 
-class Rentry:
+class RentryJob:
     def __init__(
         self,
         text: str,
@@ -29,7 +28,26 @@ class Rentry:
         self.password = password
         self.tab_id = tab_id
         self.after_upload = after_upload
+        self.status = "queued"
+        self.url = ""
+        self.error = ""
+        self.tries = 0
+
+
+Action = Callable[[RentryJob], None]
+
+
+class Rentry:
+    def __init__(self) -> None:
         self.timeout = 10
+        self.max_tries = 3
+        self.retry_delay = 1.0
+        self.token = ""
+        self.session: requests.Session | None = None
+        self.jobs: queue.Queue[RentryJob] = queue.Queue()
+        self.lock = threading.Lock()
+        self.working = False
+        self.busy = False
 
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/117.0",
@@ -40,36 +58,140 @@ class Rentry:
             "Sec-Fetch-User": "?1",
         }
 
-        thread = threading.Thread(target=lambda: self.post())
+    def upload(
+        self, text: str, password: str, tab_id: str, after_upload: Action
+    ) -> RentryJob:
+        job = RentryJob(
+            text=text,
+            password=password,
+            tab_id=tab_id,
+            after_upload=after_upload,
+        )
+
+        self.jobs.put(job)
+        self.start()
+        return job
+
+    def pending(self) -> int:
+        num = self.jobs.qsize()
+
+        if self.busy:
+            num += 1
+
+        return num
+
+    def start(self) -> None:
+        with self.lock:
+            if self.working:
+                return
+
+            self.working = True
+
+        thread = threading.Thread(target=lambda: self.work())
         thread.daemon = True
         thread.start()
 
-    def get_cookie(self, cookie_name: str) -> str:
-        return str(self.session.cookies.get(cookie_name, default=""))
-
-    def get_token(self) -> str:
-        return self.get_cookie("csrftoken")
-
-    def post(self) -> None:
-        self.session = requests.session()
-        self.session.get(config.rentry_site)
-
-        res = self.session.post(
-            config.rentry_site,
-            headers=self.headers,
-            timeout=self.timeout,
-            data={
-                "csrfmiddlewaretoken": self.get_token(),
-                "text": (self.text if len(self.text) > 0 else "."),
-                "edit_code": self.password,
-            },
-            allow_redirects=False,
-        )
+    def work(self) -> None:
+        while True:
+            try:
+                job = self.jobs.get(timeout=self.timeout)
+            except queue.Empty:
+                with self.lock:
+                    if self.jobs.empty():
+                        self.working = False
+                        return
+
+                continue
+
+            self.busy = True
+
+            try:
+                self.post(job)
+            except BaseException as e:
+                utils.error(e)
+                self.report(job, "failed", error=str(e))
+
+            self.busy = False
+            self.jobs.task_done()
+
+    def get_session(self) -> requests.Session:
+        import requests  # type: ignore
+        from .network import network
+
+        # Its own headers and cookies, but the shared connection pool
+        if not self.session:
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            network.mount(self.session)
+
+        return self.session
+
+    def get_token(self, refresh: bool = False) -> str:
+        if self.token and (not refresh):
+            return self.token
+
+        session = self.get_session()
+        session.get(config.rentry_site, timeout=self.timeout)
+        self.token = str(session.cookies.get("csrftoken", default=""))
+        return self.token
+
+    def post(self, job: RentryJob) -> None:
+        import requests  # type: ignore
+
+        session = self.get_session()
+        refresh = False
+        error = ""
+
+        while job.tries < self.max_tries:
+            job.tries += 1
+            self.report(job, "uploading")
+
+            try:
+                res = session.post(
+                    config.rentry_site,
+                    timeout=self.timeout,
+                    data={
+                        "csrfmiddlewaretoken": self.get_token(refresh),
+                        "text": (job.text if len(job.text) > 0 else "."),
+                        "edit_code": job.password,
+                    },
+                    allow_redirects=False,
+                )
+            except requests.RequestException as e:
+                utils.error(e)
+                error = "Connection error"
+                utils.sleep(self.retry_delay * job.tries)
+                continue
+
+            refresh = False
+
+            if res.status_code == HTTPStatus.FOUND:
+                url = urllib.parse.urlparse(res.headers["Location"])
+                name = Path(url.path).name
+                job.url = f"{config.rentry_site}/{name}"
+                self.report(job, "done")
+                return
+
+            if res.status_code == HTTPStatus.FORBIDDEN:
+                # The CSRF token expired, get a new one and try again
+                self.token = ""
+                refresh = True
+                error = "Invalid token"
+                continue
+
+            error = f"Status {res.status_code}"
+            utils.sleep(self.retry_delay * job.tries)
+
+        self.report(job, "failed", error=error)
+
+    def report(self, job: RentryJob, status: str, error: str = "") -> None:
+        job.status = status
+        job.error = error
+
+        try:
+            job.after_upload(job)
+        except BaseException as e:
+            utils.error(e)
 
-        if res.status_code != HTTPStatus.FOUND:
-            return
 
-        url = urllib.parse.urlparse(res.headers["Location"])
-        url = Path(url.path).name
-        full_url = f"{config.rentry_site}/{url}"
-        self.after_upload(full_url, self.password, self.tab_id)
+rentry = Rentry()
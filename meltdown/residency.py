@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+# Standard
+import threading
+from pathlib import Path
+from typing import Any
+from collections import OrderedDict
+
+# Modules
+from .args import args
+from .utils import utils
+
+
+class Resident:
+    def __init__(self, path: str, model: Any, size: int) -> None:
+        self.path = path
+        self.model = model
+        self.size = size
+        self.date = utils.now()
+
+
+class Residency:
+    def __init__(self) -> None:
+        # Least recently used first
+        self.residents: OrderedDict[str, Resident] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        return args.resident_models > 1
+
+    def get(self, key: str) -> Resident | None:
+        with self.lock:
+            resident = self.residents.get(key)
+
+            if resident:
+                resident.date = utils.now()
+                self.residents.move_to_end(key)
+
+            return resident
+
+    def add(self, key: str, path: str, model: Any) -> None:
+        if not self.enabled():
+            return
+
+        with self.lock:
+            self.residents[key] = Resident(path, model, self.get_size(path))
+            self.residents.move_to_end(key)
+
+    def get_size(self, path: str) -> int:
+        try:
+            return Path(path).stat().st_size
+        except OSError:
+            return 0
+
+    def total(self) -> int:
+        return sum(resident.size for resident in self.residents.values())
+
+    def get_budget(self) -> int:
+        from .sampler import sampler
+
+        psutil = sampler.psutil()
+
+        if not psutil:
+            return 0
+
+        # The resident models could be freed, so they count as available
+        available = psutil.virtual_memory().available + self.total()
+        return int(available * args.resident_memory / 100)
+
+    def make_room(self, path: str) -> None:
+        size = self.get_size(path)
+        budget = self.get_budget() if self.enabled() else 0
+
+        with self.lock:
+            while self.residents:
+                count = len(self.residents)
+                total = self.total()
+
+                if count < args.resident_models:
+                    if (not budget) or (total + size <= budget):
+                        break
+
+                _, resident = self.residents.popitem(last=False)
+                self.close(resident)
+
+    def remove(self, key: str) -> None:
+        with self.lock:
+            resident = self.residents.pop(key, None)
+
+        if resident:
+            self.close(resident)
+
+    def clear(self) -> None:
+        with self.lock:
+            residents = list(self.residents.values())
+            self.residents.clear()
+
+        for resident in residents:
+            self.close(resident)
+
+    def close(self, resident: Resident) -> None:
+        draft = getattr(resident.model, "draft_model", None)
+        close = getattr(resident.model, "close", None)
+        resident.model = None
+
+        # Llama doesn't close the draft model it was given
+        if draft and hasattr(draft, "close"):
+            draft.close()
+
+        if close:
+            try:
+                close()
+            except BaseException as e:
+                utils.error(e)
+
+    def items(self) -> list[tuple[str, Resident]]:
+        with self.lock:
+            return list(reversed(self.residents.items()))
+
+
+residency = Residency()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+# Standard
+import threading
+from typing import Any
+
+# Modules
+from .args import args
+from .utils import utils
+from .sampler import sampler
+from .draft import Draft
+
+
+Profile = dict[str, Any]
+
+
+class Resources:
+    def __init__(self) -> None:
+        self.interval = 0.25
+        self.max_points = 60
+        self.thread: threading.Thread | None = None
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.points: list[list[float]] = []
+        self.step = 1
+        self.remote = False
+
+    def start(self, remote: bool) -> None:
+        if not args.resources:
+            return
+
+        self.stop()
+        self.remote = remote
+        self.step = 1
+        self.points = []
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=lambda: self.work())
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self) -> Profile | None:
+        if not self.thread:
+            return None
+
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        return self.get_profile()
+
+    def read(self) -> tuple[float, float, float, float]:
+        stats = sampler.sample_process(record=False)
+        received = float(sampler.net_received()) if self.remote else 0.0
+        return sampler.cpu_time(), float(stats["rss"]), float(stats["majflt"]), received
+
+    def work(self) -> None:
+        try:
+            last = self.read()
+        except BaseException as e:
+            utils.error(e)
+            return
+
+        last_date = utils.now()
+        skipped = 0
+
+        while not self.stop_event.wait(self.interval):
+            skipped += 1
+
+            # Long streams sample less often instead of growing the profile
+            if skipped < self.step:
+                continue
+
+            skipped = 0
+
+            try:
+                current = self.read()
+            except BaseException as e:
+                utils.error(e)
+                return
+
+            now = utils.now()
+            elapsed = max(now - last_date, 0.001)
+            cpu = 100.0 * (current[0] - last[0]) / elapsed
+
+            self.add(
+                [
+                    cpu,
+                    current[1],
+                    max(current[2] - last[2], 0.0),
+                    max(current[3] - last[3], 0.0),
+                ]
+            )
+
+            last = current
+            last_date = now
+
+    def add(self, point: list[float]) -> None:
+        with self.lock:
+            self.points.append(point)
+
+            if len(self.points) < self.max_points:
+                return
+
+            # Merge pairs: average the rates, keep the last rss, sum the counters
+            merged = []
+
+            for i in range(0, len(self.points) - 1, 2):
+                a, b = self.points[i], self.points[i + 1]
+                merged.append([(a[0] + b[0]) / 2, b[1], a[2] + b[2], a[3] + b[3]])
+
+            if len(self.points) % 2:
+                merged.append(self.points[-1])
+
+            self.points = merged
+            self.step *= 2
+
+    def get_profile(self) -> Profile | None:
+        with self.lock:
+            points = list(self.points)
+
+        if not points:
+            return None
+
+        profile: Profile = {
+            "interval": round(self.interval * self.step, 2),
+            "cpu": [int(p[0]) for p in points],
+            "rss": [int(p[1] / (1024 * 1024)) for p in points],
+            "majflt": [int(p[2]) for p in points],
+        }
+
+        if self.remote:
+            profile["net"] = [int(p[3] / 1024) for p in points]
+
+        return profile
+
+    def describe(self, profile: Profile) -> str:
+        lines = []
+
+        if profile.get("cached"):
+            lines.append("Cached response")
+
+        if "interval" in profile:
+            lines.append(f"Resources (every {profile['interval']}s)")
+
+        def line(name: str, key: str, unit: str, relative: bool = False) -> None:
+            values = profile.get(key)
+
+            if not values:
+                return
+
+            low = min(values)
+            high = max(values)
+
+            # Memory barely moves so it is charted against its own range
+            if relative:
+                chart = sampler.chart([float(v) for v in values], high, low - 1)
+            else:
+                chart = sampler.chart([float(v) for v in values], max(high, 1))
+
+            lines.append(f"{name}: {chart} {low}-{high} {unit}")
+
+        line("CPU", "cpu", "%")
+        line("RSS", "rss", "MB", True)
+        line("Faults", "majflt", "major")
+        line("Net", "net", "KB")
+
+        if profile.get("draft"):
+            lines.append(Draft.describe(profile["draft"]))
+
+        return "\n".join(lines)
+
+
+resources = Resources()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+# Standard
+import os
+import re
+import json
+import hashlib
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from collections.abc import Iterator
+
+# Modules
+from .args import args
+from .paths import paths
+from .utils import utils
+
+
+# Responses to prompts that always get the same answer, one file each
+# The file mtime is the last use, the date inside is when it was made
+
+
+class ResponseCache:
+    def __init__(self) -> None:
+        self.entries: dict[str, list[float]] = {}
+        self.loaded = False
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> None:
+        self.loaded = True
+        self.entries = {}
+
+        if not paths.response_cache.is_dir():
+            return
+
+        for path in paths.response_cache.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+
+            self.entries[path.name] = [stat.st_size, stat.st_mtime]
+
+    def check(self) -> None:
+        if not self.loaded:
+            self.load()
+
+    def cacheable(self, gen_config: dict[str, Any]) -> bool:
+        if not args.response_cache:
+            return False
+
+        temperature = gen_config.get("temperature")
+
+        # Unset means the default of the backend, which isn't 0
+        if temperature is None:
+            return False
+
+        # Other temperatures are meant to give different answers
+        return bool(temperature <= 0)
+
+    def get_key(self, model: str, fmt: str, gen_config: dict[str, Any]) -> str:
+        values = {key: value for key, value in gen_config.items() if key != "stream"}
+        values["model"] = model
+        values["format"] = fmt
+        text = json.dumps(values, sort_keys=True, separators=(",", ":"))
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        name = f"{key}.json"
+        path = Path(paths.response_cache, name)
+
+        with self.lock:
+            self.check()
+
+            if name not in self.entries:
+                self.misses += 1
+                return None
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except BaseException as e:
+            utils.error(e)
+            data = None
+
+        ttl = args.response_cache_ttl * 60
+
+        if (not data) or (ttl and (utils.now() - data["date"] > ttl)):
+            self.remove(name)
+
+            with self.lock:
+                self.misses += 1
+
+            return None
+
+        # Mark it as used for the eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        with self.lock:
+            if name in self.entries:
+                self.entries[name][1] = utils.now()
+
+            self.hits += 1
+
+        return str(data["text"])
+
+    def put(self, key: str, text: str) -> None:
+        name = f"{key}.json"
+        path = Path(paths.response_cache, name)
+        temp = path.with_suffix(".tmp")
+
+        try:
+            paths.response_cache.mkdir(parents=True, exist_ok=True)
+            data = {"date": utils.now(), "text": text}
+            temp.write_text(json.dumps(data), encoding="utf-8")
+            temp.replace(path)
+            size = path.stat().st_size
+        except BaseException as e:
+            utils.error(e)
+            return
+
+        with self.lock:
+            self.check()
+            self.entries[name] = [size, utils.now()]
+            removed = self.evict()
+
+        for old_name in removed:
+            Path(paths.response_cache, old_name).unlink(missing_ok=True)
+
+    def evict(self) -> list[str]:
+        # Least recently used first, until it fits
+        limit = args.response_cache_size * 1024 * 1024
+        total = sum(entry[0] for entry in self.entries.values())
+        removed = []
+
+        for name, entry in sorted(self.entries.items(), key=lambda e: e[1][1]):
+            if total <= limit:
+                break
+
+            total -= entry[0]
+            removed.append(name)
+            del self.entries[name]
+
+        return removed
+
+    def remove(self, name: str) -> None:
+        with self.lock:
+            self.entries.pop(name, None)
+
+        Path(paths.response_cache, name).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.check()
+            names = list(self.entries)
+            self.entries = {}
+
+        for name in names:
+            Path(paths.response_cache, name).unlink(missing_ok=True)
+
+    def get_chunks(self, text: str) -> Iterator[Any]:
+        # Shaped like the streamed chunks so they go through the same path
+        for token in re.findall(r"\s+|\S+", text):
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def get_output(self, text: str) -> Any:
+        if args.stream:
+            return self.get_chunks(text)
+
+        message = SimpleNamespace(content=text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def get_lines(self) -> list[str]:
+        with self.lock:
+            self.check()
+            num = len(self.entries)
+            size = sum(entry[0] for entry in self.entries.values()) / 1024 / 1024
+
+        limit = args.response_cache_size
+        s = utils.singular_or_plural(num, "response", "responses")
+
+        lines = [
+            f"Response cache: {num} {s}, {size:.1f} of {limit} MB",
+            f"Hits: {self.hits} | Misses: {self.misses}",
+            str(paths.response_cache),
+        ]
+
+        if not args.response_cache:
+            lines.append("It's disabled, use --response-cache to enable it")
+
+        return lines
+
+
+response_cache = ResponseCache()
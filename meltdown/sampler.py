@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+# Standard
+import os
+import array
+from typing import Any
+from pathlib import Path
+
+# Modules
+from .utils import utils
+
+
+class Ring:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.data = array.array("f", [0.0] * size)
+        self.index = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def last(self) -> float | None:
+        if not self.count:
+            return None
+
+        return self.data[(self.index - 1) % self.size]
+
+    def values(self, num: int = 0) -> list[float]:
+        count = self.count if num <= 0 else min(num, self.count)
+        start = self.index - count
+        return [self.data[i % self.size] for i in range(start, self.index)]
+
+    def clear(self) -> None:
+        self.index = 0
+        self.count = 0
+
+
+class Sampler:
+    def __init__(self, size: int = 120) -> None:
+        self.size = size
+        self.proc = Path("/proc")
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self.cpu_last: tuple[int, int] | None = None
+        self.temp_path: Path | None = None
+        self.gpu_dir: Path | None = None
+        self.gpu_temp_path: Path | None = None
+        self.discovered = False
+        self.rings: dict[str, Ring] = {}
+        self.blocks = "▁▂▃▄▅▆▇█"
+
+        for name in [
+            "cpu",
+            "ram",
+            "temp",
+            "gpu",
+            "gpu_ram",
+            "gpu_temp",
+            "rss",
+            "threads",
+            "minflt",
+            "majflt",
+        ]:
+            self.rings[name] = Ring(size)
+
+    def sparkline(self, name: str, num: int, high: float = 100.0) -> str:
+        return self.chart(self.rings[name].values(num), high)
+
+    def chart(self, values: list[float], high: float = 100.0, low: float = 0.0) -> str:
+        if (not values) or (high <= low):
+            return ""
+
+        top = len(self.blocks) - 1
+        chars = []
+
+        for value in values:
+            level = (min(max(value, low), high) - low) / (high - low)
+            chars.append(self.blocks[round(level * top)])
+
+        return "".join(chars)
+
+    def psutil(self) -> Any:
+        # Only needed when /proc is not available
+        return utils.try_import("psutil")
+
+    def ring(self, name: str) -> Ring:
+        return self.rings[name]
+
+    def add(self, name: str, value: float | None) -> float | None:
+        if value is not None:
+            self.rings[name].add(value)
+
+        return value
+
+    def clear(self) -> None:
+        for ring in self.rings.values():
+            ring.clear()
+
+        self.cpu_last = None
+
+    def read(self, path: Path) -> str:
+        with path.open("r", encoding="utf-8") as file:
+            return file.read()
+
+    def read_int(self, path: Path) -> int | None:
+        try:
+            return int(self.read(path).strip())
+        except (OSError, ValueError):
+            return None
+
+    def discover(self) -> None:
+        # Look for the sensor files once instead of on every sample
+        self.discovered = True
+        hwmon = Path("/sys/class/hwmon")
+
+        if hwmon.is_dir():
+            for mon in sorted(hwmon.iterdir()):
+                try:
+                    name = self.read(Path(mon, "name")).strip()
+                except OSError:
+                    continue
+
+                if name == "k10temp":
+                    self.temp_path = self.find_temp(mon, "Tctl")
+                elif name == "amdgpu":
+                    self.gpu_temp_path = self.find_temp(mon, "junction")
+
+        drm = Path("/sys/class/drm")
+
+        if drm.is_dir():
+            for card in sorted(drm.glob("card[0-9]")):
+                device = Path(card, "device")
+
+                if Path(device, "gpu_busy_percent").is_file():
+                    self.gpu_dir = device
+                    break
+
+    def find_temp(self, mon: Path, label: str) -> Path | None:
+        for path in sorted(mon.glob("temp*_label")):
+            try:
+                if self.read(path).strip() == label:
+                    return Path(mon, path.name.replace("_label", "_input"))
+            except OSError:
+                continue
+
+        return None
+
+    def sample_cpu(self) -> float | None:
+        # Percentage since the previous sample, this never blocks
+        try:
+            line = self.read(Path(self.proc, "stat")).split("\n", 1)[0]
+        except OSError:
+            return self.add("cpu", self.psutil().cpu_percent(interval=None))
+
+        values = [int(v) for v in line.split()[1:]]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        total = sum(values)
+        last = self.cpu_last
+        self.cpu_last = (idle, total)
+
+        if not last:
+            return None
+
+        d_total = total - last[1]
+
+        if d_total <= 0:
+            return self.rings["cpu"].last()
+
+        d_idle = idle - last[0]
+        return self.add("cpu", 100.0 * (d_total - d_idle) / d_total)
+
+    def sample_ram(self) -> float | None:
+        info: dict[str, int] = {}
+
+        try:
+            for line in self.read(Path(self.proc, "meminfo")).splitlines():
+                key, _, value = line.partition(":")
+                info[key] = int(value.split()[0])
+        except (OSError, ValueError, IndexError):
+            return self.add("ram", self.psutil().virtual_memory().percent)
+
+        total = info.get("MemTotal", 0)
+        available = info.get("MemAvailable", 0)
+
+        if not total:
+            return None
+
+        return self.add("ram", 100.0 * (total - available) / total)
+
+    def sample_temp(self) -> float | None:
+        if not self.discovered:
+            self.discover()
+
+        if not self.temp_path:
+            return None
+
+        value = self.read_int(self.temp_path)
+
+        if value is None:
+            return None
+
+        return self.add("temp", value / 1000)
+
+    def sample_gpu(self) -> tuple[float | None, float | None, float | None]:
+        if not self.discovered:
+            self.discover()
+
+        if not self.gpu_dir:
+            return None, None, None
+
+        use = self.read_int(Path(self.gpu_dir, "gpu_busy_percent"))
+        used = self.read_int(Path(self.gpu_dir, "mem_info_vram_used"))
+        total = self.read_int(Path(self.gpu_dir, "mem_info_vram_total"))
+        ram = None
+        temp = None
+
+        if (used is not None) and total:
+            ram = 100.0 * used / total
+
+        if self.gpu_temp_path:
+            value = self.read_int(self.gpu_temp_path)
+
+            if value is not None:
+                temp = value / 1000
+
+        return (
+            self.add("gpu", use),
+            self.add("gpu_ram", ram),
+            self.add("gpu_temp", temp),
+        )
+
+    def has_gpu(self) -> bool:
+        if not self.discovered:
+            self.discover()
+
+        return self.gpu_dir is not None
+
+    def sample_process(
+        self, pid: int | None = None, record: bool = True
+    ) -> dict[str, int]:
+        pid = pid or os.getpid()
+
+        try:
+            text = self.read(Path(self.proc, str(pid), "stat"))
+            # The name can contain spaces so split after it
+            fields = text[text.rindex(")") + 2 :].split()
+
+            stats = {
+                "minflt": int(fields[7]),
+                "majflt": int(fields[9]),
+                "threads": int(fields[17]),
+                "rss": int(fields[21]) * self.page_size,
+            }
+        except (OSError, ValueError, IndexError):
+            proc = self.psutil().Process(pid)
+
+            stats = {
+                "minflt": 0,
+                "majflt": 0,
+                "threads": proc.num_threads(),
+                "rss": proc.memory_info().rss,
+            }
+
+        if record and (pid == os.getpid()):
+            for key, value in stats.items():
+                self.add(key, value)
+
+        return stats
+
+    def cpu_time(self, pid: int | None = None) -> float:
+        # User plus system seconds used by the process
+        pid = pid or os.getpid()
+
+        try:
+            text = self.read(Path(self.proc, str(pid), "stat"))
+            fields = text[text.rindex(")") + 2 :].split()
+            return (int(fields[11]) + int(fields[12])) / self.clock_ticks
+        except (OSError, ValueError, IndexError):
+            times = self.psutil().Process(pid).cpu_times()
+            return float(times.user + times.system)
+
+    def net_received(self) -> int:
+        # Bytes received by all the interfaces except loopback
+        try:
+            lines = self.read(Path(self.proc, "net", "dev")).splitlines()[2:]
+        except OSError:
+            return int(self.psutil().net_io_counters().bytes_recv)
+
+        total = 0
+
+        for line in lines:
+            name, _, data = line.partition(":")
+
+            if name.strip() == "lo":
+                continue
+
+            try:
+                total += int(data.split()[0])
+            except (ValueError, IndexError):
+                continue
+
+        return total
+
+
+sampler = Sampler()
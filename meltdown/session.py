@@ -19,69 +19,10 @@ from .files import files
 from .close import close
 from .tests import tests
 from .memory import memory
-
-
-class Item:
-    @staticmethod
-    def from_dict(data: dict[str, Any]) -> Item:
-        return Item(
-            model=data.get("model", ""),
-            user=data.get("user", ""),
-            ai=data.get("ai", ""),
-            file=data.get("file", ""),
-            date=data.get("date", None),
-            duration=data.get("duration", None),
-            seed=data.get("seed", None),
-            history=data.get("history", None),
-            max_tokens=data.get("max_tokens", None),
-            temperature=data.get("temperature", None),
-            top_k=data.get("top_k", None),
-            top_p=data.get("top_p", None),
-        )
-
-    def __init__(
-        self,
-        model: str,
-        user: str,
-        ai: str,
-        file: str,
-        date: float | None,
-        duration: float | None,
-        seed: int | None,
-        history: int | None,
-        max_tokens: int | None,
-        temperature: float | None,
-        top_k: int | None,
-        top_p: float | None,
-    ) -> None:
-        self.date = date
-        self.duration = duration
-        self.user = user
-        self.ai = ai
-        self.file = file
-        self.model = model
-        self.seed = seed
-        self.history = history
-        self.max_tokens = max_tokens
-        self.temperature = temperature
-        self.top_k = top_k
-        self.top_p = top_p
-
-    def to_dict(self) -> dict[str, Any]:
-        return {
-            "date": self.date,
-            "duration": self.duration,
-            "user": self.user,
-            "ai": self.ai,
-            "file": self.file,
-            "model": self.model,
-            "seed": self.seed,
-            "history": self.history,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-            "top_k": self.top_k,
-            "top_p": self.top_p,
-        }
+from .events import events
+from .snapshot import snapshot
+from .item import Item
+from .sessionindex import session_index
 
 
 class Conversation:
@@ -182,6 +123,8 @@ class Session:
     def __init__(self) -> None:
         self.conversations: OrderedDict[str, Conversation] = OrderedDict()
         self.save_after = ""
+        self.restore_after = ""
+        self.restore_batch = 20
 
     def add(
         self, name: str, conv_id: str | None = None, position: str = "end"
@@ -205,6 +148,7 @@ class Session:
         if conversation_id in self.conversations:
             del self.conversations[conversation_id]
             self.save()
+            events.publish("session")
 
     def get_conversation(self, conversation_id: str) -> Conversation | None:
         return self.conversations.get(conversation_id)
@@ -235,7 +179,39 @@ class Session:
         if not paths.session.exists():
             paths.session.parent.mkdir(parents=True, exist_ok=True)
 
-        files.write(paths.session, self.to_json())
+        sessions_list = self.get_list()
+        text = json.dumps(sessions_list, indent=4)
+        files.write(paths.session, text)
+        self.save_snapshot(paths.session, text.encode("utf-8"), sessions_list)
+
+    def save_snapshot(
+        self, path: Path, data: bytes, sessions_list: list[dict[str, Any]]
+    ) -> None:
+        if not args.session_snapshot:
+            return
+
+        try:
+            snapshot.save(path, data, sessions_list)
+        except BaseException as e:
+            utils.error(e)
+
+    def read_items(self, path: Path) -> list[dict[str, Any]]:
+        # The snapshot only applies to the main session, the json is the source
+        use_snapshot = args.session_snapshot and (path == paths.session)
+        data = path.read_bytes()
+
+        if use_snapshot:
+            snapped = snapshot.load(path, data)
+
+            if snapped is not None:
+                return snapped
+
+        items: list[dict[str, Any]] = json.loads(data)
+
+        if use_snapshot:
+            self.save_snapshot(path, data, items)
+
+        return items
 
     def load_arg(self) -> None:
         try:
@@ -280,14 +256,16 @@ class Session:
             self.reset()
 
     def reset(self) -> None:
+        self.cancel_restore()
         self.conversations = OrderedDict()
         close.close_all(force=True)
 
     def load_items(self, path: Path) -> None:
+        self.cancel_restore()
         close.close_all(force=True, make_empty=False)
 
         try:
-            items = files.load(path)
+            items = self.read_items(path)
         except BaseException:
             if not args.quiet:
                 utils.msg("Creating empty session.json")
@@ -303,6 +281,8 @@ class Session:
         if not items:
             return
 
+        convos = []
+
         for i, item in enumerate(items):
             if args.max_tabs > 0:
                 if i >= args.max_tabs:
@@ -321,13 +301,43 @@ class Session:
                 convo.items.append(item_obj)
 
             self.conversations[convo.id] = convo
+            convos.append(convo)
+
+        # The last tab gets selected so it's made first
+        # The rest are added before it in batches when idle
+        last = convos.pop()
 
-            tab_id = display.make_tab(
-                convo.name, convo.id, select_tab=False, save=False
+        if not display.make_tab(last.name, last.id, select_tab=False, save=False):
+            return
+
+        self.restore_tabs(convos)
+
+    def restore_tabs(self, convos: list[Conversation]) -> None:
+        batch = convos[-self.restore_batch :]
+        del convos[-self.restore_batch :]
+
+        for convo in reversed(batch):
+            display.make_tab(
+                convo.name,
+                convo.id,
+                select_tab=False,
+                save=False,
+                position="start",
+                defer=True,
             )
 
-            if not tab_id:
-                break
+        display.book.update_pages()
+
+        if convos:
+            self.restore_after = app.root.after_idle(lambda: self.restore_tabs(convos))
+        else:
+            self.restore_after = ""
+            events.publish("session")
+
+    def cancel_restore(self) -> None:
+        if self.restore_after:
+            app.root.after_cancel(self.restore_after)
+            self.restore_after = ""
 
     def save_state(self, name: str | None = None) -> None:
         if name == "last":
@@ -350,9 +360,13 @@ class Session:
             return
 
         path = Path(file_path)
-        files.write(path, self.to_json())
+        sessions_list = self.get_list()
+        files.write(path, json.dumps(sessions_list, indent=4))
         memory.set_value("last_session", path.stem)
 
+        if path.parent == paths.sessions:
+            session_index.add(path, sessions_list)
+
         if not args.quiet:
             utils.saved_path(path)
 
@@ -377,6 +391,9 @@ class Session:
 
             path = Path(file_path)
 
+        self.load_path(path)
+
+    def load_path(self, path: Path) -> None:
         if (not path.exists()) or (not path.is_file()):
             if not args.quiet:
                 display.print("Session file not found.")
@@ -409,10 +426,15 @@ class Session:
 
             new_items[conversation.id] = conversation
 
+        # Tabs still being restored don't exist yet, keep their conversations
+        for conversation in self.conversations.values():
+            if conversation.id not in new_items:
+                new_items[conversation.id] = conversation
+
         self.conversations = new_items
         self.save()
 
-    def to_json(self) -> str:
+    def get_list(self) -> list[dict[str, Any]]:
         def check(conversation: Conversation) -> bool:
             if conversation.id == "ignore":
                 return False
@@ -423,22 +445,58 @@ class Session:
 
             return True
 
-        sessions_list = [
+        return [
             conversation.to_dict()
             for conversation in self.conversations.values()
             if check(conversation)
         ]
 
-        return json.dumps(sessions_list, indent=4)
+    def to_json(self) -> str:
+        return json.dumps(self.get_list(), indent=4)
 
     def menu(self) -> None:
         cmds = Commands()
         cmds.add("Open", lambda a: self.open_directory())
         cmds.add("Load", lambda a: self.load_state())
+        cmds.add("Switch", lambda a: self.show_switcher())
         cmds.add("Save", lambda a: self.save_state())
 
         Dialog.show_dialog("Session Menu", commands=cmds)
 
+    def show_switcher(self) -> None:
+        from .menus import Menu
+        from .widgets import widgets
+
+        # Only the index is read here, the chosen file is parsed on click
+        menu = Menu()
+
+        for name, entry in session_index.get_entries():
+            path = Path(paths.sessions, name)
+            text = f"{Path(name).stem} ({entry['num_tabs']} tabs)"
+
+            lines = [
+                utils.to_date(entry["modified"]),
+                f"{entry['num_items']} items - {entry['size'] // 1024} KB",
+                ", ".join(entry["tabs"]),
+            ]
+
+            if entry["first"]:
+                lines.append(entry["first"])
+
+            menu.add(
+                text=text,
+                command=lambda e, path=path: self.load_path(path),
+                tooltip="\n".join(lines),
+            )
+
+        if not menu.items:
+            if not args.quiet:
+                display.print("No saved sessions.")
+
+            return
+
+        menu.show(widget=widgets.main_menu_button)
+
     def save_last(self) -> None:
         if not memory.last_session:
             return
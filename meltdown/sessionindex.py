@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+# Standard
+from typing import Any
+from pathlib import Path
+
+# Modules
+from .paths import paths
+from .utils import utils
+from .files import files
+
+
+class SessionIndex:
+    def __init__(self) -> None:
+        # File name -> metadata, kept until the file size or mtime changes
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.loaded = False
+        self.max_tabs = 10
+        self.max_prompt = 80
+
+    def load(self) -> None:
+        self.loaded = True
+        path = paths.session_index
+
+        if not (path.exists() and path.is_file()):
+            return
+
+        try:
+            self.entries = files.load(path)
+        except BaseException as e:
+            utils.error(e)
+            self.entries = {}
+
+    def save(self) -> None:
+        try:
+            files.save(paths.session_index, self.entries)
+        except BaseException as e:
+            utils.error(e)
+
+    def summarize(self, path: Path, sessions: list[dict[str, Any]]) -> dict[str, Any]:
+        stat = path.stat()
+        tabs = []
+        num_items = 0
+        modified = 0.0
+        first = ""
+
+        for convo in sessions:
+            items = convo.get("items", [])
+            tabs.append(convo.get("name", ""))
+            num_items += len(items)
+            modified = max(modified, convo.get("last_modified", 0.0) or 0.0)
+
+            if (not first) and items:
+                first = items[0].get("user", "")
+
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "tabs": tabs[: self.max_tabs],
+            "num_tabs": len(tabs),
+            "num_items": num_items,
+            "modified": modified or stat.st_mtime,
+            "first": first.strip()[: self.max_prompt],
+        }
+
+    def add(self, path: Path, sessions: list[dict[str, Any]]) -> None:
+        # Called after saving, so the next refresh doesn't parse the file
+        if not self.loaded:
+            self.load()
+
+        try:
+            self.entries[path.name] = self.summarize(path, sessions)
+            self.save()
+        except BaseException as e:
+            utils.error(e)
+
+    def refresh(self) -> None:
+        if not self.loaded:
+            self.load()
+
+        if not paths.sessions.exists():
+            return
+
+        entries = {}
+        changed = False
+
+        for path in paths.sessions.glob("*.json"):
+            if not path.is_file():
+                continue
+
+            stat = path.stat()
+            entry = self.entries.get(path.name)
+
+            if entry:
+                if (entry["size"] == stat.st_size) and (
+                    entry["mtime"] == stat.st_mtime_ns
+                ):
+                    entries[path.name] = entry
+                    continue
+
+            try:
+                entries[path.name] = self.summarize(path, files.load(path))
+            except BaseException as e:
+                # Remember broken files too, until they change
+                utils.error(e)
+
+                entries[path.name] = {
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime_ns,
+                    "broken": True,
+                }
+
+            changed = True
+
+        if set(entries) != set(self.entries):
+            changed = True
+
+        self.entries = entries
+
+        if changed:
+            self.save()
+
+    def get_entries(self) -> list[tuple[str, dict[str, Any]]]:
+        self.refresh()
+        items = [item for item in self.entries.items() if not item[1].get("broken")]
+        return sorted(items, key=lambda item: item[1]["mtime"], reverse=True)
+
+
+session_index = SessionIndex()
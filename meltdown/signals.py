@@ -12,9 +12,6 @@ from .files import files
 from .display import display
 from .formats import formats
 
-# Libraries
-import requests  # type: ignore
-
 
 class Signals:
     def __init__(self) -> None:
@@ -94,13 +91,18 @@ class Signals:
         data[content_key] = content
         res: Any = None
 
+        import requests  # type: ignore
+        from .network import network
+
+        session = network.get_session()
+
         try:
             if method_lower == "get":
-                res = requests.get(url, params=data, timeout=self.timeout)
+                res = session.get(url, params=data, timeout=self.timeout)
             elif method_lower == "post":
-                res = requests.post(url, data=data, timeout=self.timeout)
+                res = session.post(url, data=data, timeout=self.timeout)
             elif method_lower == "put":
-                res = requests.put(url, data=data, timeout=self.timeout)
+                res = session.put(url, data=data, timeout=self.timeout)
         except requests.exceptions.RequestException as e:
             utils.error(e)
             display.print("Signal error.")
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+# Standard
+import os
+import errno
+import stat
+import threading
+import subprocess
+from pathlib import Path
+from typing import IO
+
+# Modules
+from .args import args
+from .utils import utils
+
+
+class NotFifoError(Exception):
+    def __init__(self, path: Path) -> None:
+        super().__init__(f"Not a fifo: {path}")
+
+
+class Sink:
+    def __init__(self, target: str, max_pending: int) -> None:
+        self.target = target
+        self.max_pending = max_pending
+        self.pending: list[str | None] = []
+        self.size = 0
+        self.dropped = 0
+        self.opened = False
+        self.disabled = False
+        self.skipping = False
+        self.cond = threading.Condition()
+
+        thread = threading.Thread(target=lambda: self.work())
+        thread.daemon = True
+        thread.start()
+
+    def put(self, text: str) -> None:
+        with self.cond:
+            if self.disabled:
+                return
+
+            # The consumer is too slow, drop instead of blocking the stream
+            if self.size + len(text) > self.max_pending:
+                self.dropped += len(text)
+                return
+
+            self.pending.append(text)
+            self.size += len(text)
+            self.cond.notify()
+
+    def end(self) -> None:
+        with self.cond:
+            self.pending.append(None)
+            self.cond.notify()
+
+    def work(self) -> None:
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+
+                items = self.pending
+                self.pending = []
+                self.size = 0
+
+            chunk: list[str] = []
+
+            for item in items:
+                if item is None:
+                    self.flush(chunk)
+                    self.finish()
+                else:
+                    chunk.append(item)
+
+            self.flush(chunk)
+
+    def flush(self, chunk: list[str]) -> None:
+        if not chunk:
+            return
+
+        text = "".join(chunk)
+        chunk.clear()
+
+        if self.disabled or self.skipping:
+            return
+
+        if not self.opened:
+            try:
+                self.opened = self.open()
+            except BaseException as e:
+                utils.error(e)
+                self.disable()
+                return
+
+            # Nobody reads it yet, try again on the next response
+            if not self.opened:
+                self.skipping = True
+                return
+
+        try:
+            self.write(text)
+        except BaseException as e:
+            utils.error(e)
+            self.finish()
+
+    def disable(self) -> None:
+        # Retrying on every chunk would only repeat the failure
+        with self.cond:
+            self.disabled = True
+            self.pending = []
+            self.size = 0
+
+        utils.msg(f"Sink: Can't open {self.target}, disabling it")
+
+    def finish(self) -> None:
+        if self.opened:
+            try:
+                self.close()
+            except BaseException as e:
+                utils.error(e)
+
+        self.opened = False
+        self.skipping = False
+
+        with self.cond:
+            dropped = self.dropped
+            self.dropped = 0
+
+        if dropped and (not args.quiet):
+            utils.msg(f"Sink: Dropped {dropped} chars for {self.target}")
+
+    def open(self) -> bool:
+        return False
+
+    def write(self, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FileSink(Sink):
+    def open(self) -> bool:
+        self.file = Path(self.target).expanduser().open("w", encoding="utf-8")
+        return True
+
+    def write(self, text: str) -> None:
+        self.file.write(text)
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class FifoSink(Sink):
+    def open(self) -> bool:
+        path = Path(self.target).expanduser()
+
+        if not path.exists():
+            os.mkfifo(path)
+        elif not stat.S_ISFIFO(path.stat().st_mode):
+            raise NotFifoError(path)
+
+        try:
+            self.fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as e:
+            # Nobody is reading the fifo, a reader can attach later
+            if e.errno == errno.ENXIO:
+                return False
+
+            raise
+
+        os.set_blocking(self.fd, True)
+        return True
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+
+        while data:
+            num = os.write(self.fd, data)
+            data = data[num:]
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ProgramSink(Sink):
+    wait_timeout = 5
+
+    def open(self) -> bool:
+        cmd = list(filter(None, self.target.split(" ")))
+
+        if not cmd:
+            return False
+
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+            text=True,
+        )
+
+        return True
+
+    def write(self, text: str) -> None:
+        stdin: IO[str] | None = self.proc.stdin
+
+        if stdin:
+            stdin.write(text)
+            stdin.flush()
+
+    def close(self) -> None:
+        if self.proc.stdin:
+            self.proc.stdin.close()
+
+        # The end of the input should end it, reap it either way
+        try:
+            self.proc.wait(timeout=self.wait_timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class Sinks:
+    def __init__(self) -> None:
+        self.items: list[Sink] = []
+        self.max_pending = 1024 * 1024
+
+        self.kinds: dict[str, type[Sink]] = {
+            "file": FileSink,
+            "fifo": FifoSink,
+            "program": ProgramSink,
+        }
+
+    def start(self) -> None:
+        from .model import model
+
+        for sink in args.sinks:
+            self.add(sink)
+
+        if self.items:
+            model.add_stream_hook(self.on_stream)
+
+    def add(self, spec: str) -> None:
+        kind, _, target = spec.partition(":")
+        kind = kind.strip().lower()
+        target = target.strip()
+        cls = self.kinds.get(kind)
+
+        if (not cls) or (not target):
+            utils.msg(f"Invalid sink: {spec}")
+            return
+
+        self.items.append(cls(target, self.max_pending))
+
+        if not args.quiet:
+            utils.msg(f"Sink: {kind} {target}")
+
+    def on_stream(self, tab_id: str, text: str, done: bool) -> None:
+        for sink in self.items:
+            if done:
+                sink.end()
+            else:
+                sink.put(text)
+
+
+sinks = Sinks()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+# Standard
+import zlib
+import struct
+import marshal
+from typing import Any
+from pathlib import Path
+
+
+class Snapshot:
+    def __init__(self) -> None:
+        self.version = 1
+
+        # Length of the marshaled header that goes before the body
+        self.prefix = struct.Struct("<I")
+
+    def get_path(self, path: Path) -> Path:
+        return path.with_suffix(".snapshot")
+
+    def get_header(self, path: Path, data: bytes) -> dict[str, Any]:
+        stat = path.stat()
+
+        return {
+            "version": self.version,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": zlib.crc32(data),
+        }
+
+    def save(self, path: Path, data: bytes, sessions: list[dict[str, Any]]) -> None:
+        header = marshal.dumps(self.get_header(path, data))
+        body = marshal.dumps(sessions)
+        snap = self.get_path(path)
+        temp = snap.with_suffix(".tmp")
+
+        with temp.open("wb") as file:
+            file.write(self.prefix.pack(len(header)))
+            file.write(header)
+            file.write(body)
+
+        temp.replace(snap)
+
+    def is_valid(self, header: dict[str, Any], path: Path, data: bytes) -> bool:
+        stat = path.stat()
+
+        # Cheap checks first, the hash catches edits that keep both
+        if header.get("version") != self.version:
+            return False
+
+        if header.get("size") != stat.st_size:
+            return False
+
+        if header.get("mtime") != stat.st_mtime_ns:
+            return False
+
+        return bool(header.get("hash") == zlib.crc32(data))
+
+    def load(self, path: Path, data: bytes) -> list[dict[str, Any]] | None:
+        snap = self.get_path(path)
+
+        if not snap.is_file():
+            return None
+
+        try:
+            with snap.open("rb") as file:
+                size = self.prefix.unpack(file.read(self.prefix.size))[0]
+                header = marshal.loads(file.read(size))
+
+                if not self.is_valid(header, path, data):
+                    return None
+
+                # Loading from bytes is much faster than marshal.load(file)
+                sessions = marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            return None
+
+        if not isinstance(sessions, list):
+            return None
+
+        return sessions
+
+
+snapshot = Snapshot()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+# Standard
+import sys
+import time
+from typing import Any
+
+
+# This is imported before the other modules to measure their import cost
+class Startup:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases: list[tuple[str, float]] = []
+        self.max_runs = 50
+        self.baseline = set(sys.modules)
+
+    def phase(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def get_packages(self) -> list[str]:
+        # Top level packages that were imported by the program so far
+        names = set()
+
+        for name in set(sys.modules) - self.baseline:
+            root = name.split(".")[0]
+
+            if (root != "meltdown") and (root not in sys.stdlib_module_names):
+                names.add(root)
+
+        return sorted(names)
+
+    def report(self) -> None:
+        from .args import args
+        from .utils import utils
+
+        self.phase("first paint")
+
+        if not args.startup_profile:
+            return
+
+        total = self.last - self.started
+        lines = ["Startup Profile"]
+
+        for name, seconds in self.phases:
+            lines.append(f"{name}: {seconds * 1000:.1f} ms")
+
+        lines.append(f"Total: {total * 1000:.1f} ms")
+
+        if utils.import_times:
+            lines.append("Lazy Imports:")
+
+            for name, seconds in utils.import_times.items():
+                lines.append(f"  {name}: {seconds * 1000:.1f} ms")
+
+        packages = self.get_packages()
+        lines.append(f"Packages: {', '.join(packages)}")
+        utils.msg("\n".join(lines))
+        self.save(total, packages)
+
+    def save(self, total: float, packages: list[str]) -> None:
+        from .paths import paths
+        from .utils import utils
+        from .files import files
+
+        # Keep the recent runs to track the startup time over releases
+        runs: list[dict[str, Any]] = []
+
+        try:
+            if paths.startup.exists():
+                runs = files.load(paths.startup)
+        except BaseException as e:
+            utils.error(e)
+
+        runs.append(
+            {
+                "date": utils.now(),
+                "total": round(total, 4),
+                "phases": {name: round(sec, 4) for name, sec in self.phases},
+                "packages": packages,
+            }
+        )
+
+        try:
+            files.save(paths.startup, runs[-self.max_runs :])
+        except BaseException as e:
+            utils.error(e)
+
+
+startup = Startup()
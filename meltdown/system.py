@@ -7,9 +7,6 @@ import threading
 import tkinter as tk
 from pathlib import Path
 
-# Libraries
-import psutil  # type: ignore
-
 # Modules
 from .widgets import widgets
 from .args import args
@@ -20,6 +17,7 @@ from .tooltips import ToolTip
 from .tips import tips
 from .model import model
 from .widgetutils import widgetutils
+from .sampler import sampler
 
 
 class System:
@@ -31,38 +29,63 @@ class System:
         self.gpu_ram: int | None = None
         self.gpu_temp: int | None = None
         self.clean = True
+        self.monitors = ["cpu", "ram", "temp", "gpu", "gpu_ram", "gpu_temp"]
 
     def set_widget(self, widget: tk.StringVar, text: str) -> None:
         if app.exists():
             widget.set(text)
 
-    def get_psutil_info(self) -> None:
+    def get_stats(self) -> None:
         if args.system_cpu:
-            self.cpu = int(psutil.cpu_percent(interval=1))
-            self.set_widget(widgets.cpu, utils.padnum(self.cpu) + "%")
+            cpu = sampler.sample_cpu()
+
+            # The first sample only sets the baseline
+            if cpu is not None:
+                self.cpu = int(cpu)
+                self.set_widget(widgets.cpu, utils.padnum(self.cpu) + "%")
 
         if args.system_ram:
-            self.ram = int(psutil.virtual_memory().percent)
-            self.set_widget(widgets.ram, utils.padnum(self.ram) + "%")
+            ram = sampler.sample_ram()
 
-        if args.system_temp:
-            temps = psutil.sensors_temperatures()
-            ktemps = temps.get("k10temp")
+            if ram is not None:
+                self.ram = int(ram)
+                self.set_widget(widgets.ram, utils.padnum(self.ram) + "%")
 
-            if ktemps:
-                for ktemp in ktemps:
-                    # This one works with AMD Ryzen
-                    if ktemp.label == "Tctl":
-                        self.temp = int(ktemp.current)
-                        break
+        if args.system_temp:
+            temp = sampler.sample_temp()
 
-            if self.temp:
+            if temp is not None:
+                self.temp = int(temp)
                 self.set_widget(widgets.temp, utils.padnum(self.temp) + "°")
             else:
                 self.set_widget(widgets.temp, "N/A")
 
+        sampler.sample_process()
+
     def get_gpu_info(self) -> None:
-        # This works with AMD GPUs | rocm-smi must be installed
+        if not (args.system_gpu or args.system_gpu_ram or args.system_gpu_temp):
+            return
+
+        if not sampler.has_gpu():
+            self.get_rocm_info()
+            return
+
+        gpu_use, gpu_ram, gpu_temp = sampler.sample_gpu()
+
+        if args.system_gpu and (gpu_use is not None):
+            self.gpu_use = int(gpu_use)
+            self.set_widget(widgets.gpu, utils.padnum(self.gpu_use) + "%")
+
+        if args.system_gpu_ram and (gpu_ram is not None):
+            self.gpu_ram = int(gpu_ram)
+            self.set_widget(widgets.gpu_ram, utils.padnum(self.gpu_ram) + "%")
+
+        if args.system_gpu_temp and (gpu_temp is not None):
+            self.gpu_temp = int(gpu_temp)
+            self.set_widget(widgets.gpu_temp, utils.padnum(self.gpu_temp) + "°C")
+
+    def get_rocm_info(self) -> None:
+        # Fallback for AMD GPUs | rocm-smi must be installed
         if args.system_gpu or args.system_gpu_ram or args.system_gpu_temp:
             rocm_smi = "/opt/rocm/bin/rocm-smi"
 
@@ -118,14 +141,23 @@ class System:
                         )
 
     def get_info(self) -> None:
-        self.get_psutil_info()
+        self.get_stats()
         self.get_gpu_info()
 
+        if args.system_sparkline > 0:
+            self.set_sparklines()
+
         if args.system_colors:
             self.set_colors()
 
         self.clean = False
 
+    def set_sparklines(self) -> None:
+        for name in self.monitors:
+            if getattr(args, f"system_{name}"):
+                line = sampler.sparkline(name, args.system_sparkline)
+                self.set_widget(getattr(widgets, f"{name}_spark"), line)
+
     def set_colors(self) -> None:
         if self.cpu is not None:
             self.check_color("cpu", self.cpu)
@@ -161,6 +193,10 @@ class System:
         o_check = True
 
         while True:
+            if not args.system_unfocused:
+                # Sleep until the window gets focus again
+                app.focus_event.wait()
+
             if app.system_frame_enabled:
                 check = True
 
@@ -224,6 +260,11 @@ class System:
         self.check_color("gpu_ram", 0, True)
         self.check_color("gpu_temp", 0, True)
 
+        sampler.clear()
+
+        if args.system_sparkline > 0:
+            self.set_sparklines()
+
         self.clean = True
 
     def add_items(self) -> None:
@@ -257,6 +298,14 @@ class System:
             label.bind("<Button-1>", lambda e: app.open_task_manager(mode))
             monitor_text.bind("<Button-1>", lambda e: app.open_task_manager(mode))
 
+            if args.system_sparkline > 0:
+                setattr(widgets, f"{name}_spark", tk.StringVar())
+                spark = widgetutils.make_label(data, "", padx=(0, app.theme.padx))
+                spark.configure(textvariable=getattr(widgets, f"{name}_spark"))
+                spark.configure(cursor="hand2")
+                ToolTip(spark, tip)
+                spark.bind("<Button-1>", lambda e: app.open_task_manager(mode))
+
         if args.system_cpu:
             make_monitor("cpu", "CPU", "normal")
 
@@ -1,87 +1,364 @@
+from __future__ import annotations
+
 # Standard
 import re
-import threading
+import heapq
+import random
+from datetime import datetime, timedelta
 
 # Modules
+from .app import app
 from .args import args
-from .commands import commands
+from .commands import commands, Queue
 from .utils import utils
 
 
+class CronError(ValueError):
+    def __init__(self, value: str) -> None:
+        super().__init__(f"Invalid cron: {value}")
+
+
+class Cron:
+    pattern = r"^[\d\*/,\-]+$"
+
+    ranges = (
+        (0, 59),
+        (0, 23),
+        (1, 31),
+        (1, 12),
+        (0, 7),
+    )
+
+    def __init__(self, spec: str) -> None:
+        self.spec = spec
+        fields = spec.split()
+
+        if len(fields) != len(Cron.ranges):
+            raise CronError(spec)
+
+        values = [
+            self.parse_field(field, *Cron.ranges[i]) for i, field in enumerate(fields)
+        ]
+
+        self.minutes, self.hours, self.days, self.months, self.weekdays = values
+
+        # Both 0 and 7 mean sunday
+        if 7 in self.weekdays:
+            self.weekdays.add(0)
+
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def is_cron(text: str) -> bool:
+        fields = text.split()
+
+        if len(fields) != len(Cron.ranges):
+            return False
+
+        return all(re.match(Cron.pattern, field) for field in fields)
+
+    def parse_field(self, field: str, low: int, high: int) -> set[int]:
+        values: set[int] = set()
+
+        for part in field.split(","):
+            span = part
+            step = 1
+
+            if "/" in part:
+                span, step_str = part.split("/", 1)
+                step = int(step_str)
+
+            if span == "*":
+                start, end = low, high
+            elif "-" in span:
+                start_str, end_str = span.split("-", 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(span)
+                end = high if step > 1 else start
+
+            if (start < low) or (end > high) or (start > end) or (step < 1):
+                raise CronError(field)
+
+            values.update(range(start, end + 1, step))
+
+        return values
+
+    def day_matches(self, date: datetime) -> bool:
+        weekday = (date.weekday() + 1) % 7
+        day_ok = date.day in self.days
+        weekday_ok = weekday in self.weekdays
+
+        if self.any_day:
+            return weekday_ok
+
+        if self.any_weekday:
+            return day_ok
+
+        # Like cron, if both are restricted either one can match
+        return day_ok or weekday_ok
+
+    def next_time(self, after: float) -> float:
+        date = datetime.fromtimestamp(after).replace(second=0, microsecond=0)
+        date += timedelta(minutes=1)
+        limit = date + timedelta(days=366 * 5)
+
+        while date < limit:
+            if date.month not in self.months:
+                month = date.month % 12 + 1
+                year = date.year + (1 if month == 1 else 0)
+                date = date.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+
+            if not self.day_matches(date):
+                date = date.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+
+            if date.hour not in self.hours:
+                date = date.replace(minute=0) + timedelta(hours=1)
+                continue
+
+            if date.minute not in self.minutes:
+                date += timedelta(minutes=1)
+                continue
+
+            return date.timestamp()
+
+        # Like the 31st of february
+        raise CronError(self.spec)
+
+
 class Task:
     prefix = utils.escape_regex(args.command_prefix)
     pattern = rf"^((?P<time>\d+(?:\.\d+)?)(?P<unit>s|m|h|d)?\s+(?P<commands>.*?)(?:\s*(?P<now>{prefix}now))?$)"
+    cron_pattern = rf"^(?P<cron>(?:\S+\s+){{4}}\S+)\s+(?P<commands>{prefix}.*?)(?:\s*(?P<now>{prefix}now))?$"
 
-    def __init__(self, seconds: int, cmds: str, now: bool) -> None:
-        self.seconds = seconds
+    def __init__(
+        self, cmds: str, now: bool, seconds: float = 0, cron: Cron | None = None
+    ) -> None:
         self.cmds = cmds
         self.now = now
-        self.first = False
-        self.start()
+        self.seconds = seconds
+        self.cron = cron
+        self.spec = ""
+        self.queue: Queue | None = None
+        self.last_run = 0.0
+        self.next_run = 0.0
+        self.runs = 0
+        self.skips = 0
+        self.pending = 0
 
-    def start(self) -> None:
-        thread = threading.Thread(target=lambda: self.check())
-        thread.daemon = True
-        thread.start()
+    def get_next(self, after: float) -> float:
+        if self.cron:
+            date = self.cron.next_time(after)
+        else:
+            date = after + self.seconds
 
-    def run(self) -> None:
-        commands.exec(self.cmds)
+        if args.task_jitter > 0:
+            date += random.uniform(0, args.task_jitter)
 
-    def check(self) -> None:
-        if not args.quiet:
-            msg = f"Running a task every {self.seconds} seconds"
-            utils.msg(msg)
+        return date
 
-        utils.sleep(1)
+    def is_running(self) -> bool:
+        from .model import model
 
-        while True:
-            if not self.first:
-                if self.now:
-                    self.run()
+        if self.queue and (self.queue in commands.queues):
+            return True
 
-                self.first = True
+        if self.last_run and model.streaming:
+            return model.stream_date >= self.last_run
 
-            utils.sleep(self.seconds)
-            self.run()
+        return False
+
+    def run(self) -> None:
+        self.last_run = utils.now()
+        self.runs += 1
+        self.queue = commands.enqueue(self.cmds)
 
 
 class Tasks:
+    def __init__(self) -> None:
+        self.items: list[Task] = []
+        self.heap: list[tuple[float, int, Task]] = []
+        self.after = ""
+        self.max_delay = 60 * 60
+        self.max_catchup = 10
+        self.catchup_delay = 5
+
     def start_all(self) -> None:
-        for task in args.tasks:
+        for task_str in args.tasks:
+            if not task_str:
+                continue
+
+            task = self.parse(task_str)
+
             if not task:
                 continue
 
-            match = re.match(Task.pattern, task)
+            self.items.append(task)
+
+            if not args.quiet:
+                utils.msg(f"Task: {task.spec}")
+
+        if not self.items:
+            return
+
+        now = utils.now()
+
+        for task in self.items:
+            if task.now:
+                # Give the program a second to settle
+                self.push(task, now + 1)
+            else:
+                self.push(task, task.get_next(now))
+
+        self.schedule()
+
+    def parse(self, text: str) -> Task | None:
+        text = text.strip()
+        cron_match = re.match(Task.cron_pattern, text)
 
-            if not match:
-                return
+        if cron_match and Cron.is_cron(cron_match.group("cron")):
+            spec = cron_match.group("cron")
 
             try:
-                time = int(match.group("time"))
-            except BaseException as e:
+                cron = Cron(spec)
+            except ValueError as e:
                 utils.error(e)
-                return
+                return None
 
-            unit = match.group("unit")
+            task = Task(
+                cron_match.group("commands"),
+                bool(cron_match.group("now")),
+                cron=cron,
+            )
 
-            if unit == "m":
-                time *= 60
-            elif unit == "h":
-                time *= 60 * 60
-            elif unit == "d":
-                time *= 60 * 60 * 24
+            task.spec = f"cron {spec} {task.cmds}"
+            return task
 
-            cmds = match.group("commands")
+        match = re.match(Task.pattern, text)
 
-            if match.group("now"):
-                now = True
-            else:
-                now = False
+        if not match:
+            return None
 
-            if time < 1:
-                continue
+        try:
+            seconds = float(match.group("time"))
+        except BaseException as e:
+            utils.error(e)
+            return None
+
+        unit = match.group("unit")
+
+        if unit == "m":
+            seconds *= 60
+        elif unit == "h":
+            seconds *= 60 * 60
+        elif unit == "d":
+            seconds *= 60 * 60 * 24
+
+        if seconds < 1:
+            return None
+
+        task = Task(match.group("commands"), bool(match.group("now")), seconds=seconds)
+        task.spec = f"every {int(seconds)}s {task.cmds}"
+        return task
+
+    def push(self, task: Task, date: float) -> None:
+        task.next_run = date
+        heapq.heappush(self.heap, (date, id(task), task))
+
+    def schedule(self) -> None:
+        if self.after:
+            app.root.after_cancel(self.after)
+            self.after = ""
+
+        if not self.heap:
+            return
+
+        delay = self.heap[0][0] - utils.now()
+        delay = max(0.0, min(delay, self.max_delay))
+        self.after = app.root.after(int(delay * 1000), lambda: self.tick())
+
+    def tick(self) -> None:
+        self.after = ""
+        now = utils.now()
+
+        while self.heap and (self.heap[0][0] <= now):
+            _, _, task = heapq.heappop(self.heap)
+            self.fire(task, now)
+
+        self.schedule()
+
+    def fire(self, task: Task, now: float) -> None:
+        if task.pending:
+            self.catch_up(task, now)
+            return
+
+        missed = self.count_missed(task, now)
+
+        if args.task_skip and task.is_running():
+            task.skips += 1
+        elif args.task_missed == "all":
+            task.run()
+            task.pending = missed
+        elif (args.task_missed == "skip") and missed:
+            task.skips += 1
+        else:
+            task.run()
+
+        self.push_next(task, now)
+
+    def catch_up(self, task: Task, now: float) -> None:
+        # Missed runs go one at a time, each after the previous one is done
+        if not task.is_running():
+            task.pending -= 1
+            task.run()
+
+        self.push_next(task, now)
+
+    def push_next(self, task: Task, now: float) -> None:
+        if task.pending:
+            self.push(task, now + self.catchup_delay)
+        else:
+            self.push(task, task.get_next(now))
+
+    def count_missed(self, task: Task, now: float) -> int:
+        # Fire times that passed while the program was busy or suspended
+        missed = 0
+        date = task.next_run
+
+        while missed < self.max_catchup:
+            date = task.get_next(date)
+
+            if date > now:
+                break
+
+            missed += 1
+
+        return missed
+
+    def show(self) -> None:
+        from .dialogs import Dialog
+
+        if not self.items:
+            Dialog.show_message("No tasks")
+            return
+
+        lines = []
+        items = sorted(self.items, key=lambda t: t.next_run)
+
+        for task in items:
+            lines.append(task.spec)
+            lines.append(f"Next: {utils.to_date(task.next_run)}")
+
+            if task.last_run:
+                lines.append(f"Last: {utils.to_date(task.last_run)}")
+
+            lines.append(f"Runs: {task.runs} | Skips: {task.skips}")
+            lines.append("")
 
-            Task(time, cmds, now)
+        Dialog.show_msgbox("Tasks", "\n".join(lines).strip())
 
 
 tasks = Tasks()
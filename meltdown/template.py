@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+# Standard
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+
+
+# Returns the replacement or None to leave the placeholder as it is
+Resolver = Callable[[str], str | None]
+
+
+class Template:
+    def __init__(self, parts: list[tuple[str, str]]) -> None:
+        # Pairs of (literal, "") or (raw placeholder, name)
+        self.parts = parts
+
+    def render(self, resolve: Resolver) -> str:
+        out = []
+
+        for raw, name in self.parts:
+            if not name:
+                out.append(raw)
+                continue
+
+            value = resolve(name)
+            out.append(raw if value is None else value)
+
+        return "".join(out)
+
+
+class Templates:
+    def __init__(self) -> None:
+        self.cache: OrderedDict[tuple[str, str], Template] = OrderedDict()
+        self.max_cache = 1024
+        self.keyword_pattern = re.compile(r"\(\((\w+)\)\)")
+        self.variable_patterns: dict[str, re.Pattern[str]] = {}
+
+    def get_pattern(self, prefix: str) -> re.Pattern[str]:
+        pattern = self.variable_patterns.get(prefix)
+
+        if not pattern:
+            pattern = re.compile(rf"(?:^|(?<=\s)){re.escape(prefix)}(\w+)")
+            self.variable_patterns[prefix] = pattern
+
+        return pattern
+
+    def compile(self, text: str, pattern: re.Pattern[str]) -> Template:
+        key = (pattern.pattern, text)
+        template = self.cache.get(key)
+
+        if template:
+            self.cache.move_to_end(key)
+            return template
+
+        parts: list[tuple[str, str]] = []
+        pos = 0
+
+        for match in pattern.finditer(text):
+            if match.start() > pos:
+                parts.append((text[pos : match.start()], ""))
+
+            parts.append((match.group(0), match.group(1)))
+            pos = match.end()
+
+        if pos < len(text):
+            parts.append((text[pos:], ""))
+
+        template = Template(parts)
+        self.cache[key] = template
+
+        if len(self.cache) > self.max_cache:
+            self.cache.popitem(last=False)
+
+        return template
+
+    def keywords(self, text: str, resolve: Resolver) -> str:
+        if "((" not in text:
+            return text
+
+        return self.compile(text, self.keyword_pattern).render(resolve)
+
+    def variables(self, text: str, prefix: str, resolve: Resolver) -> str:
+        if prefix not in text:
+            return text
+
+        return self.compile(text, self.get_pattern(prefix)).render(resolve)
+
+
+templates = Templates()
@@ -64,7 +64,8 @@ tips = {
     ),
     "context": (
         "The context size is the maximum number of tokens that the model can account for"
-        " when processing a response. This includes the prompt, and the response itself"
+        " when processing a response. This includes the prompt, and the response itself."
+        " 0 means the model's own context, up to the auto context argument"
     ),
     "max_tokens": (
         "Maximum number of tokens to generate."
@@ -77,6 +78,11 @@ tips = {
         " More layers should speed up response time significantly."
         " Use enough layers to almost fill the GPU memory but no more"
     ),
+    "batch": "(Only for local models) Max number of prompt tokens processed at once",
+    "ubatch": (
+        "(Only for local models) Physical batch size, the tokens sent to"
+        " the backend at once. 0 to use the default"
+    ),
     "format": (
         "That will format the prompt according to how model expects it."
         " Auto is supposed to work with newer models that include the format in the metadata."
@@ -118,6 +124,12 @@ tips = {
     ),
     "mlock": "Keep the model in memory",
     "logits": "Enable logits for all tokens. This might make it slower but can fix some problems",
+    "draft": (
+        "(Only for local models) Speculative decoding."
+        " Use 'lookup' to draft tokens from the prompt itself,"
+        " which helps when answers repeat parts of it like when editing code."
+        " Or the path to a small gguf model with the same vocabulary"
+    ),
     "before": "Add this to the beginning of the prompt",
     "after": "Add this to the end of the prompt",
     "mode": (
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+# Standard
+import os
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any
+
+# Modules
+from .app import app
+from .args import args
+from .config import config
+from .paths import paths
+from .utils import utils
+from .files import files
+from .worker import worker
+
+
+class Tuner:
+    def __init__(self) -> None:
+        self.process: subprocess.Popen[str] | None = None
+        self.thread: threading.Thread | None = None
+        self.gen_tokens = 32
+
+        # Scored as the time for a typical exchange, lower is better
+        self.typical_prompt = 512
+        self.typical_answer = 256
+
+    def tune(self, arg: str | None = None) -> None:
+        from .model import model
+        from .display import display
+
+        if arg == "stop":
+            self.stop()
+            return
+
+        if self.thread and self.thread.is_alive():
+            display.print("Tuning is already running. Use 'tune stop' to stop it.")
+            return
+
+        if model.streaming:
+            display.print("Can't tune while streaming.")
+            return
+
+        name = model.get_model()
+        path = Path(name)
+
+        if model.model_is_gpt(name) or model.model_is_gemini(name):
+            display.print("Only local models can be tuned.")
+            return
+
+        if not utils.try_import("llama_cpp"):
+            model.no_llama_error()
+            return
+
+        if (not path.exists()) or (not path.is_file()):
+            display.print("Error: Model not found. Check the path.")
+            return
+
+        key = files.get_hash(path)
+        saved = self.load().get(key)
+
+        if saved and (arg != "force"):
+            display.print(
+                f"Using saved results from {saved['date']}."
+                " Use 'tune force' to run again."
+            )
+            self.apply(saved["best"])
+            return
+
+        grid = self.get_grid()
+        display.print(f"Tuning {path.name} with {len(grid)} runs...")
+        self.thread = threading.Thread(target=lambda: self.run(path, key, grid))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def get_grid(self) -> list[list[int]]:
+        cores = os.cpu_count() or 4
+        threads = sorted({max(1, cores // 2), max(1, cores * 3 // 4), cores})
+        sizes = [(256, 128), (512, 128), (512, 512)]
+        return [
+            [thread, batch, ubatch] for thread in threads for batch, ubatch in sizes
+        ]
+
+    def run(self, path: Path, key: str, grid: list[list[int]]) -> None:
+        from .model import model
+
+        job = {
+            "model": str(path),
+            "context": min(model.get_context(str(path)), 2048),
+            "gpu_layers": config.gpu_layers,
+            "gen_tokens": self.gen_tokens,
+            "repeat": 8,
+            "grid": grid,
+        }
+
+        results = []
+        process = None
+
+        try:
+            process = worker.start("tuneworker", job)
+            self.process = process
+            results = self.read(process, len(grid))
+            process.wait()
+        except BaseException as e:
+            utils.error(e)
+            self.show("Error: Tuning failed.")
+            return
+        finally:
+            self.process = None
+
+        stopped = process.returncode not in (0, None)
+
+        valid = [r for r in results if "error" not in r]
+
+        if stopped or (not valid):
+            self.show("Tuning stopped." if stopped else "Error: No run finished.")
+            return
+
+        best = min(valid, key=lambda r: self.get_score(r))
+
+        entry = {
+            "model": path.name,
+            "date": utils.date(),
+            "results": results,
+            "best": best,
+        }
+
+        self.save(key, entry)
+        app.root.after(0, lambda: self.apply(best))
+
+    def read(self, process: subprocess.Popen[str], total: int) -> list[dict[str, Any]]:
+        results = []
+
+        for result in worker.read(process):
+            # An error without a run means the worker couldn't start
+            if "threads" not in result:
+                self.show(f"Error: {result.get('error', 'Tuning failed.')}")
+                break
+
+            results.append(result)
+            self.show(self.describe(result, len(results), total))
+
+        return results
+
+    def show(self, text: str) -> None:
+        from .display import display
+
+        # The runs happen on a thread, Tk is only used from the main one
+        app.root.after(0, lambda: display.print(text))
+
+    def get_score(self, result: dict[str, Any]) -> float:
+        prompt = self.typical_prompt / max(result["prompt_tps"], 0.01)
+        answer = self.typical_answer / max(result["gen_tps"], 0.01)
+        return float(prompt + answer)
+
+    def describe(self, result: dict[str, Any], num: int, total: int) -> str:
+        run = (
+            f"threads {result['threads']}, batch {result['batch']},"
+            f" ubatch {result['ubatch']}"
+        )
+
+        if "error" in result:
+            return f"Tune {num}/{total}: {run}: {result['error']}"
+
+        return (
+            f"Tune {num}/{total}: {run}:"
+            f" prompt {result['prompt_tps']} t/s, gen {result['gen_tps']} t/s"
+        )
+
+    def apply(self, best: dict[str, Any]) -> None:
+        from .display import display
+
+        config.set("threads", best["threads"])
+        config.set("batch", best["batch"])
+        config.set("ubatch", best["ubatch"])
+
+        if not args.quiet:
+            display.print(
+                f"Best: {best['threads']} threads, batch {best['batch']},"
+                f" ubatch {best['ubatch']}: prompt {best['prompt_tps']} t/s,"
+                f" gen {best['gen_tps']} t/s"
+            )
+
+    def stop(self) -> None:
+        if self.process:
+            self.process.kill()
+
+    def load(self) -> dict[str, Any]:
+        if not paths.tune.exists():
+            return {}
+
+        try:
+            data: dict[str, Any] = files.load(paths.tune)
+        except BaseException as e:
+            utils.error(e)
+            return {}
+
+        return data
+
+    def save(self, key: str, entry: dict[str, Any]) -> None:
+        data = self.load()
+        data[key] = entry
+
+        try:
+            files.save(paths.tune, data)
+        except BaseException as e:
+            utils.error(e)
+
+
+tuner = Tuner()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+# Runs in a separate process so a crash or the memory of the scratch
+# model doesn't affect the program. Only the stdlib and llama_cpp are used
+# Reads the job as json from stdin and prints one json line per run
+
+# Standard
+import sys
+import json
+import time
+from typing import Any
+
+
+prompt = (
+    "You are reviewing a pull request for a text editor written in Python."
+    " The change replaces the undo stack with a rope data structure, adds"
+    " incremental syntax highlighting, and moves file loading to a thread."
+    " List the risks of each part of the change, suggest tests for them,"
+    " and explain how you would roll it out to users without breaking"
+    " their existing sessions, plugins, key bindings or saved settings. "
+)
+
+
+def load(llama_cpp: Any, job: dict[str, Any], run: list[int]) -> Any:
+    threads, batch, ubatch = run
+
+    kwargs = {
+        "model_path": job["model"],
+        "n_ctx": job["context"],
+        "n_threads": threads,
+        "n_batch": batch,
+        "n_gpu_layers": job["gpu_layers"],
+        "verbose": False,
+    }
+
+    if ubatch > 0:
+        kwargs["n_ubatch"] = ubatch
+
+    try:
+        return llama_cpp.Llama(**kwargs)
+    except TypeError:
+        # Older versions don't have n_ubatch
+        del kwargs["n_ubatch"]
+        return llama_cpp.Llama(**kwargs)
+
+
+def measure(llama_cpp: Any, job: dict[str, Any], run: list[int]) -> dict[str, Any]:
+    model = load(llama_cpp, job, run)
+    text = prompt * job["repeat"]
+    tokens = model.tokenize(text.encode("utf-8"))[: job["context"] // 2]
+
+    start = time.perf_counter()
+    model.eval(tokens)
+    prompt_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    for _ in range(job["gen_tokens"]):
+        token = model.sample(top_k=1, temp=0.0)
+        model.eval([token])
+
+    gen_time = time.perf_counter() - start
+    close = getattr(model, "close", None)
+
+    if close:
+        close()
+
+    return {
+        "threads": run[0],
+        "batch": run[1],
+        "ubatch": run[2],
+        "prompt_tps": round(len(tokens) / max(prompt_time, 0.0001), 2),
+        "gen_tps": round(job["gen_tokens"] / max(gen_time, 0.0001), 2),
+    }
+
+
+def send(data: dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(data) + "\n")
+    sys.stdout.flush()
+
+
+def main() -> None:
+    job = json.loads(sys.stdin.read())
+
+    try:
+        import llama_cpp  # type: ignore
+    except BaseException as e:
+        send({"error": str(e)})
+        return
+
+    for run in job["grid"]:
+        try:
+            result = measure(llama_cpp, job, run)
+        except BaseException as e:
+            result = {"threads": run[0], "batch": run[1], "ubatch": run[2]}
+            result["error"] = str(e)
+
+        send(result)
+
+
+if __name__ == "__main__":
+    main()
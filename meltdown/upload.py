@@ -5,7 +5,7 @@ from .app import app
 from .utils import utils
 from .config import config
 from .display import display
-from .rentry import Rentry
+from .rentry import rentry, RentryJob
 from .dialogs import Dialog, Commands
 from .args import args
 from .formats import formats
@@ -55,13 +55,32 @@ class Upload:
             commands=cmds,
         )
 
-    def after_upload(self, url: str, password: str, tab_id: str) -> None:
+    def after_upload(self, job: RentryJob) -> None:
+        if job.status == "uploading":
+            if job.tries > 1:
+                display.print(
+                    f"🌐 Retrying upload ({job.tries}/{rentry.max_tries})",
+                    tab_id=job.tab_id,
+                )
+
+            return
+
+        if job.status == "failed":
+            display.print(f"🌐 Upload failed: {job.error}", tab_id=job.tab_id)
+            return
+
+        url = job.url
+        password = job.password
+
         display.print(
             f"🌐 Uploaded: {url} ({password})",
             do_format=True,
-            tab_id=tab_id,
+            tab_id=job.tab_id,
         )
 
+        if rentry.pending() > 1:
+            return
+
         def open_url() -> None:
             app.open_url(url)
 
@@ -82,6 +101,12 @@ class Upload:
         self, tab_id: str | None = None, mode: str = "all", format_: str = "markdown"
     ) -> None:
         if not tab_id:
+            picked = display.get_picked()
+
+            if picked:
+                self.upload_picked(mode=mode, format_=format_)
+                return
+
             tab_id = display.current_tab
 
         tabconvo = display.get_tab_convo(tab_id)
@@ -104,15 +129,28 @@ class Upload:
         else:
             password = utils.random_word()
 
-        try:
-            Rentry(
-                text=text,
-                password=password,
-                tab_id=tab_id,
-                after_upload=self.after_upload,
-            )
-        except Exception as e:
-            utils.error(e)
+        job = rentry.upload(
+            text=text,
+            password=password,
+            tab_id=tab_id,
+            after_upload=self.after_upload,
+        )
+
+        num = rentry.pending()
+
+        if num > 1:
+            display.print(f"🌐 Upload queued ({num})", tab_id=job.tab_id)
+
+    def upload_picked(self, mode: str = "all", format_: str = "markdown") -> None:
+        tabs = display.get_picked()
+
+        for tab in tabs:
+            if display.is_ignored(tab.tab_id):
+                continue
+
+            self.do_upload(tab.tab_id, mode, format_=format_)
+
+        display.unpick()
 
 
 upload = Upload()
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 # Standard
 import re
+import sys
 import time
 import random
 import string
 import logging
 import inspect
 import tkinter as tk
+import importlib
 import importlib.util
 from logging.handlers import RotatingFileHandler
 from difflib import SequenceMatcher
@@ -20,6 +22,9 @@ from collections.abc import Callable
 # Libraries
 from rich.console import Console  # type: ignore
 
+# Modules
+from .template import templates
+
 if TYPE_CHECKING:
     from .menus import Menu
 
@@ -27,6 +32,7 @@ if TYPE_CHECKING:
 class Utils:
     def __init__(self) -> None:
         self.error_logger: logging.Logger | None = None
+        self.import_times: dict[str, float] = {}
         self.console = Console()
         self.nouns: list[str] = []
         self.protocols = ("https://", "http://")
@@ -222,18 +228,15 @@ class Utils:
         if not args.use_keywords:
             return content
 
-        c1 = re.escape("((")
-        c2 = re.escape("))")
-
-        def replace(what: str) -> str:
+        def replace(what: str) -> str | None:
             if what == "noun":
                 return self.random_noun()
 
-            if what == "user":
-                return config.name_user
+            if what == "name_user":
+                return config.name_user or None
 
-            if what == "ai":
-                return config.name_ai
+            if what == "name_ai":
+                return config.name_ai or None
 
             if what == "date":
                 return self.today()
@@ -247,31 +250,9 @@ class Utils:
             if words and (what == "words"):
                 return words
 
-            return ""
-
-        if config.name_user:
-            pattern = re.compile(f"{c1}name_user{c2}")
-            content = pattern.sub(lambda m: replace("user"), content)
-
-        if config.name_ai:
-            pattern = re.compile(f"{c1}name_ai{c2}")
-            content = pattern.sub(lambda m: replace("ai"), content)
-
-        pattern = re.compile(f"{c1}date{c2}")
-        content = pattern.sub(lambda m: replace("date"), content)
-
-        pattern = re.compile(f"{c1}now{c2}")
-        content = pattern.sub(lambda m: replace("now"), content)
-
-        pattern = re.compile(f"{c1}name{c2}")
-        content = pattern.sub(lambda m: replace("name"), content)
-
-        if words:
-            pattern = re.compile(f"{c1}words{c2}")
-            content = pattern.sub(lambda m: replace("words"), content)
+            return None
 
-        pattern = re.compile(f"{c1}noun{c2}")
-        return pattern.sub(lambda m: replace("noun"), content)
+        return templates.keywords(content, replace)
 
     def get_emoji(self, name: str) -> str:
         from .args import args
@@ -579,14 +560,17 @@ class Utils:
         display.format_text(mode="last")
 
     def try_import(self, name: str) -> Any:
-        spec = importlib.util.find_spec(name)
+        # Heavy optional modules are imported on first use
+        if name in sys.modules:
+            return sys.modules[name]
 
-        if spec is not None:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)  # type: ignore
-            return module
+        if importlib.util.find_spec(name) is None:
+            return None
 
-        return None
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self.import_times[name] = time.perf_counter() - start
+        return module
 
     def is_float(self, text: str) -> bool:
         try:
@@ -1,11 +1,9 @@
-# Standard
-import re
-from typing import Any
-
 # Modules
 from .dialogs import Dialog
 from .utils import utils
 from .args import args
+from .template import templates
+from .completion import completion
 
 
 class Variables:
@@ -42,6 +40,7 @@ class Variables:
         from .display import display
 
         self.variables[name] = value
+        completion.variables.add(name)
 
         if feedback:
             v = self.varname(name)
@@ -52,6 +51,7 @@ class Variables:
 
         if name in self.variables:
             del self.variables[name]
+            completion.variables.remove(name)
             display.print(f"Unset Var: {name}")
         else:
             display.print(f"Variable not found: {name}")
@@ -79,18 +79,9 @@ class Variables:
         Dialog.show_msgbox("Variables", "\n".join(items))
 
     def replace_variables(self, text: str) -> str:
-        def replace(match: Any) -> str:
-            name = str(match.group(2))
-            key = name[1:]
-
-            if key not in self.variables:
-                return name
-
-            return self.variables[key]
-
-        prefix = re.escape(args.variable_prefix)
-        pattern = re.compile(rf"(^|\s)({prefix}\w+)")
-        return pattern.sub(lambda m: m.group(1) + replace(m), text)
+        return templates.variables(
+            text, args.variable_prefix, lambda name: self.variables.get(name)
+        )
 
     def is_variable(self, word: str) -> bool:
         return word.startswith(args.variable_prefix)
@@ -71,6 +71,10 @@ class Widgets:
         self.threads: EntryBox
         self.gpu_layers_label: tk.Label
         self.gpu_layers: EntryBox
+        self.batch_label: tk.Label
+        self.batch: EntryBox
+        self.ubatch_label: tk.Label
+        self.ubatch: EntryBox
         self.format_label: tk.Label
         self.format: ttk.Combobox
         self.temperature_label: tk.Label
@@ -89,6 +93,8 @@ class Widgets:
         self.stop: EntryBox
         self.mlock_label: tk.Label
         self.mlock: ttk.Combobox
+        self.draft_label: tk.Label
+        self.draft: EntryBox
 
         self.scroller_system: tk.Frame
         self.scroller_details_1: tk.Frame
@@ -347,6 +353,9 @@ class Widgets:
         setup_entrybox("file", "Path to a remote or local file")
         setup_entrybox("threads", "Int")
         setup_entrybox("gpu_layers", "Int")
+        setup_entrybox("batch", "Int")
+        setup_entrybox("ubatch", "Int")
+        setup_entrybox("draft", "lookup or a gguf path")
 
         setup_combobox("format")
         setup_combobox("mlock")
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+# Standard
+import os
+import sys
+import json
+import subprocess
+from typing import Any
+from collections.abc import Iterator
+
+# Modules
+from .app import app
+
+
+class Worker:
+    def start(self, module: str, job: dict[str, Any]) -> subprocess.Popen[str]:
+        # Run a worker module of the package in its own process
+        # The job goes as json to stdin, results come as json lines from stdout
+        env = dict(os.environ)
+        pythonpath = [str(app.here.parent), env.get("PYTHONPATH", "")]
+        env["PYTHONPATH"] = os.pathsep.join(p for p in pythonpath if p)
+
+        process = subprocess.Popen(
+            [sys.executable, "-m", f"meltdown.{module}"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=env,
+        )
+
+        if process.stdin:
+            process.stdin.write(json.dumps(job))
+            process.stdin.close()
+
+        return process
+
+    def read(self, process: subprocess.Popen[str]) -> Iterator[dict[str, Any]]:
+        if not process.stdout:
+            return
+
+        for line in process.stdout:
+            yield json.loads(line)
+
+
+worker = Worker()
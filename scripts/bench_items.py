@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+# Compare the memory used by session items with a plain object
+# Usage: python scripts/bench_items.py [items]
+
+import sys
+import json
+import random
+import tracemalloc
+from typing import Any
+from pathlib import Path
+
+here = Path(__file__).resolve()
+parent = here.parent.parent
+sys.path.insert(0, str(parent))
+
+from meltdown.item import Item  # noqa: E402
+
+
+# How items were stored before, one __dict__ each
+class PlainItem:
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "PlainItem":
+        item = PlainItem()
+
+        for key in (
+            "date",
+            "duration",
+            "user",
+            "ai",
+            "file",
+            "model",
+            "seed",
+            "history",
+            "max_tokens",
+            "temperature",
+            "top_k",
+            "top_p",
+            "resources",
+        ):
+            setattr(item, key, data.get(key))
+
+        return item
+
+
+models = [
+    "/home/user/models/llama-3-8b-instruct.Q5_K_M.gguf",
+    "/home/user/models/mistral-7b-instruct-v0.2.Q4_K_M.gguf",
+    "gpt-4o-mini",
+]
+
+
+def make_json(total: int, texts: bool) -> str:
+    rand = random.Random(total)
+    items = []
+
+    for i in range(total):
+        items.append(
+            {
+                "date": 1700000000.0 + i,
+                "duration": round(rand.uniform(0.5, 20), 3),
+                "user": f"question {i}" if texts else "",
+                "ai": f"answer {i} " * 20 if texts else "",
+                "file": "",
+                "model": rand.choice(models),
+                "seed": None,
+                "history": 2,
+                "max_tokens": 768,
+                "temperature": rand.choice([0.7, 0.8]),
+                "top_k": 40,
+                "top_p": 0.95,
+                "resources": None,
+            }
+        )
+
+    return json.dumps(items)
+
+
+def measure(cls: Any, text: str) -> int:
+    # Count what is kept after loading, the parsed rows are dropped
+    tracemalloc.start()
+    rows = json.loads(text)
+    items = [cls.from_dict(row) for row in rows]
+    del rows
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def run(total: int, texts: bool) -> None:
+    text = make_json(total, texts)
+    plain = measure(PlainItem, text)
+    slotted = measure(Item, text)
+    label = "with texts" if texts else "without texts"
+    print(f"{total} items ({label})")
+    print(f"  plain:   {plain / 1024 / 1024:8.1f} MB")
+    print(f"  slotted: {slotted / 1024 / 1024:8.1f} MB")
+    print(f"  ratio:   {plain / slotted:8.2f}x")
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    for texts in (False, True):
+        run(total, texts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+# Compare loading a synthetic session from json and from the snapshot
+# Usage: python scripts/bench_session.py [items ...]
+
+import sys
+import json
+import time
+import random
+import tempfile
+from pathlib import Path
+
+here = Path(__file__).resolve()
+parent = here.parent.parent
+sys.path.insert(0, str(parent))
+
+from meltdown.snapshot import snapshot  # noqa: E402
+
+words = "the model said that every token has a cost and some are cheap".split()
+
+
+def make_text(rand: random.Random, num: int) -> str:
+    return " ".join(rand.choice(words) for _ in range(num))
+
+
+def make_session(total: int, per_convo: int = 100) -> list[dict]:
+    rand = random.Random(total)
+    sessions = []
+    date = 1700000000.0
+
+    for c in range((total + per_convo - 1) // per_convo):
+        items = []
+
+        for _ in range(min(per_convo, total - c * per_convo)):
+            date += 30
+            items.append(
+                {
+                    "user": make_text(rand, 12),
+                    "ai": make_text(rand, 60),
+                    "date": date,
+                    "file": "",
+                    "model": "llama-3-8b.gguf",
+                    "duration": round(rand.uniform(0.5, 20), 3),
+                    "seed": None,
+                    "history": 0,
+                    "mode": "normal",
+                }
+            )
+
+        sessions.append(
+            {
+                "id": f"convo_{c}",
+                "name": f"Tab {c}",
+                "created": date,
+                "last_modified": date,
+                "pin": False,
+                "items": items,
+            }
+        )
+
+    return sessions
+
+
+def best(func, runs: int = 3) -> float:
+    times = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def run(total: int, folder: Path) -> None:
+    path = Path(folder, f"session_{total}.json")
+    sessions = make_session(total)
+    text = json.dumps(sessions, indent=4)
+    path.write_text(text, encoding="utf-8")
+    data = path.read_bytes()
+    snapshot.save(path, data, sessions)
+
+    loaded = snapshot.load(path, data)
+    assert loaded == sessions, "Snapshot does not match the json"
+
+    size_json = path.stat().st_size / 1024 / 1024
+    size_snap = snapshot.get_path(path).stat().st_size / 1024 / 1024
+    t_json = best(lambda: json.loads(path.read_bytes()))
+    t_snap = best(lambda: snapshot.load(path, path.read_bytes()))
+    t_save = best(lambda: snapshot.save(path, data, sessions))
+
+    print(f"{total} items")
+    print(f"  json:     {t_json * 1000:8.1f} ms  {size_json:6.1f} MB")
+    print(f"  snapshot: {t_snap * 1000:8.1f} ms  {size_snap:6.1f} MB")
+    print(f"  speedup:  {t_json / t_snap:8.2f}x")
+    print(f"  save:     {t_save * 1000:8.1f} ms")
+
+
+def main() -> None:
+    totals = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+
+    with tempfile.TemporaryDirectory() as folder:
+        for total in totals:
+            run(total, Path(folder))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+# Standard
+import os
+import time
+from pathlib import Path
+from collections.abc import Callable
+
+# Libraries
+import pytest
+
+# Modules
+from meltdown.sinks import FifoSink
+
+
+def wait_for(check: Callable[[], bool], timeout: float = 5.0) -> None:
+    end = time.monotonic() + timeout
+
+    while time.monotonic() < end:
+        if check():
+            return
+
+        time.sleep(0.02)
+
+    raise TimeoutError
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs fifos")
+def test_fifo_reader_attaches_later(tmp_path: Path) -> None:
+    path = tmp_path / "tokens"
+    sink = FifoSink(str(path), 1024)
+
+    # First response, nobody is reading yet
+    sink.put("first")
+    sink.end()
+    wait_for(lambda: path.exists() and (not sink.pending))
+    time.sleep(0.1)
+    assert not sink.disabled
+    assert not sink.opened
+
+    fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+
+    try:
+        sink.put("second")
+        wait_for(lambda: sink.opened)
+        data = b""
+
+        def read() -> bool:
+            nonlocal data
+
+            try:
+                data += os.read(fd, 1024)
+            except BlockingIOError:
+                pass
+
+            return data == b"second"
+
+        wait_for(read)
+        sink.end()
+    finally:
+        os.close(fd)